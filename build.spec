@@ -47,8 +47,28 @@ exe = EXE(
     entitlements_file=None,
 )
 
+# Same program with a console, for the headless subcommands (BZ98R_ModManager-cli list --json)
+cli_exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='BZ98R_ModManager-cli',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+
 coll = COLLECT(
     exe,
+    cli_exe,
     a.binaries,
     a.zipfiles,
     a.datas,
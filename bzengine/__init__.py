@@ -0,0 +1 @@
+"""Non-GUI engine pieces shared by the Battlezone Mod Engine front ends."""
@@ -0,0 +1,121 @@
+import os
+import re
+import threading
+from datetime import datetime
+
+# One pass over the text: quoted strings (with escapes), braces, // comments
+_TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|([{}])|//[^\n]*')
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+
+
+class VdfError(ValueError):
+    pass
+
+
+def _unescape(text):
+    if "\\" not in text: return text
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def parse_vdf(text):
+    """Parses Valve KeyValues text (.acf/.vdf) into nested dicts of strings."""
+    root = {}
+    stack = [root]
+    key = None
+    for m in _TOKEN_RE.finditer(text):
+        string, brace = m.group(1), m.group(2)
+        if string is not None:
+            if key is None:
+                key = _unescape(string)
+            else:
+                stack[-1][key] = _unescape(string)
+                key = None
+        elif brace == "{":
+            if key is None: raise VdfError("block without a key")
+            child = stack[-1][key] = {}
+            stack.append(child)
+            key = None
+        elif brace == "}":
+            if len(stack) == 1: raise VdfError("unbalanced '}'")
+            stack.pop()
+    if len(stack) != 1: raise VdfError("unterminated block")
+    return root
+
+
+def _int(value):
+    try: return int(value)
+    except (TypeError, ValueError): return 0
+
+
+class WorkshopManifest:
+    """Reads SteamCMD's appworkshop_<appid>.acf for the installed state of each Workshop item.
+
+    Parsed files are cached by path and reused while their size and mtime are
+    unchanged, so repeated lookups cost one stat().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    @staticmethod
+    def path_for(workshop_dir, appid):
+        return os.path.join(workshop_dir, f"appworkshop_{appid}.acf")
+
+    def load(self, workshop_dir, appid):
+        """Returns {mod_id: {"manifest", "timeupdated", "size"}}; empty if the file is missing or unreadable."""
+        path = self.path_for(workshop_dir, appid)
+        try: st = os.stat(path)
+        except OSError: return {}
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == stamp: return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                data = parse_vdf(f.read())
+        except (OSError, VdfError):
+            return {}
+        items = self.installed_items(data)
+        with self._lock: self._cache[path] = (stamp, items)
+        return items
+
+    @staticmethod
+    def installed_items(data):
+        root = data.get("AppWorkshop") or next(iter(data.values()), {})
+        installed = root.get("WorkshopItemsInstalled") or {}
+        details = root.get("WorkshopItemDetails") or {}
+        items = {}
+        for mid, entry in installed.items():
+            if not isinstance(entry, dict): continue
+            extra = details.get(mid) if isinstance(details.get(mid), dict) else {}
+            items[mid] = {
+                "manifest": entry.get("manifest") or extra.get("manifest") or None,
+                "timeupdated": _int(entry.get("timeupdated") or extra.get("timeupdated")),
+                "size": _int(entry.get("size")),
+            }
+        return items
+
+
+def needs_update(installed, meta):
+    """Exact update check of an installed ACF entry against remote metadata.
+
+    Equal manifests are always current. Otherwise the item is out of date
+    when the remote update time is newer than the installed one, or unknown
+    while the manifests differ. Both times are UTC epochs (scraped page dates
+    are requested and parsed as UTC, see bzengine.workshop).
+    """
+    remote_manifest = meta.get("manifest")
+    if remote_manifest and installed.get("manifest") == str(remote_manifest): return False
+    remote_ts = meta.get("time_updated")
+    if remote_ts: return int(remote_ts) > installed.get("timeupdated", 0)
+    return bool(remote_manifest and installed.get("manifest"))
+
+
+def is_outdated(installed, meta, local_ts):
+    """needs_update() for mods SteamCMD lists in its ACF; others compare the remote date with the folder's."""
+    if installed: return needs_update(installed, meta)
+    remote_ts = meta.get("time_updated")
+    if not remote_ts: return False
+    try: return datetime.fromtimestamp(remote_ts).date() > datetime.fromtimestamp(local_ts).date()
+    except (OSError, OverflowError, ValueError): return False
@@ -0,0 +1,555 @@
+"""Headless subcommands: python cmd.py <install|update|enable|disable|list|verify|profile|recover> ...
+
+Only engine modules are imported here, never tkinter or Pillow, and the
+network/SteamCMD pieces are imported by the commands that need them, so a
+subcommand starts in a fraction of a second on machines without a display.
+Paths and the deploy mode come from the same bz_mod_config.json the GUI
+writes; every one of them can be overridden on the command line.
+
+Exit codes: 0 success, 1 some item failed (or verify found problems),
+2 bad arguments, 3 missing setup (game folder, cache, SteamCMD),
+4 updates available (update --check), 130 interrupted.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+from .config import (DEPLOY_MODES, load_config, save_config, current_game, game_path, cache_path, deploy_mode)
+from .deploy import content_dir, mods_dir, deploy_mod, remove_mod, deployed_kind
+from .games import GAMES, find_game
+from .journal import Journal, op_link, op_unlink
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CONFIG = 3
+EXIT_OUTDATED = 4
+EXIT_INTERRUPTED = 130
+
+SUBCOMMANDS = ("install", "update", "enable", "disable", "list", "verify", "profile", "recover")
+
+
+class CliError(Exception):
+    """A setup problem, reported on one line with EXIT_CONFIG."""
+
+
+def is_cli_args(argv):
+    """True when argv (without the program name) starts with a subcommand.
+
+    Anything else, such as a file dropped onto the exe, opens the GUI.
+    """
+    return bool(argv) and argv[0] in SUBCOMMANDS + ("-h", "--help")
+
+
+def attach_console():
+    """Gives the windowed build (console=False, so no stdout/stderr) somewhere to print.
+
+    On Windows that is the console the exe was started from; without one
+    the output is discarded rather than crashing on print().
+    """
+    if sys.stdout is not None and sys.stderr is not None: return
+    if os.name == "nt":
+        try:
+            import ctypes
+            if ctypes.windll.kernel32.AttachConsole(-1):  # ATTACH_PARENT_PROCESS
+                if sys.stdout is None: sys.stdout = open("CONOUT$", 'w', encoding='utf-8', errors='replace')
+                if sys.stderr is None: sys.stderr = open("CONOUT$", 'w', encoding='utf-8', errors='replace')
+        except (OSError, AttributeError): pass
+    if sys.stdout is None: sys.stdout = open(os.devnull, 'w')
+    if sys.stderr is None: sys.stderr = open(os.devnull, 'w')
+
+
+def default_base_dir():
+    if getattr(sys, 'frozen', False): return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Context:
+    """Settings and shared engine objects for one subcommand run."""
+
+    def __init__(self, args, base_dir):
+        self.base_dir = base_dir
+        self.config = load_config(base_dir)
+        key = find_game(args.game) if args.game else current_game(self.config)
+        if not key: raise CliError(f"unknown game {args.game!r} (choose from {', '.join(GAMES)})")
+        self.game_key = key
+        self.game = GAMES[key]
+        self.appid = self.game["appid"]
+        self.game_path = args.game_path or game_path(self.config, key)
+        self.cache_path = os.path.abspath(args.cache or cache_path(self.config, base_dir))
+        self.content_dir = content_dir(self.cache_path, self.appid)
+        self.steamcmd_path = args.steamcmd or self.config.get("steamcmd_path", "")
+        self.mode = getattr(args, "mode", None) or deploy_mode(self.config)
+        self.quiet = args.quiet
+        self.stop_event = threading.Event()
+        self._meta_store = None
+        self.journal = Journal(max_workers=int(self.config.get("sync_workers", 4)))
+
+    def log(self, message):
+        if not self.quiet: print(message, file=sys.stderr)
+
+    def error(self, message):
+        print(f"error: {message}", file=sys.stderr)
+
+    @property
+    def mods_dir(self):
+        if not self.game_path:
+            raise CliError(f"no game folder configured for {self.game['name']}; pass --game-path")
+        return mods_dir(self.game_path)
+
+    @property
+    def meta_store(self):
+        if self._meta_store is None:
+            from .metadata_store import MetadataStore, DEFAULT_TTL
+            self._meta_store = MetadataStore(ttl=self.config.get("metadata_ttl", DEFAULT_TTL))
+        return self._meta_store
+
+    def sync_options(self):
+        return {"verify_hash": bool(self.config.get("sync_verify_hash", False)),
+                "max_workers": int(self.config.get("sync_workers", 4)), "stop_event": self.stop_event}
+
+    def cached_mods(self):
+        """{mod_id: folder mtime} for every mod in the Workshop cache."""
+        from .scanner import CacheScanner
+        try: return CacheScanner().scan_content(self.content_dir)
+        except OSError: return {}
+
+    def installed_items(self):
+        from .acf import WorkshopManifest
+        return WorkshopManifest().load(os.path.dirname(os.path.dirname(self.content_dir)), self.appid)
+
+    def close(self):
+        if self._meta_store is not None: self._meta_store.flush()
+
+
+def parse_ids(ctx, texts):
+    from .workshop import parse_mod_id
+    ids, bad = [], []
+    for text in texts:
+        mid = parse_mod_id(text)
+        if mid: ids.append(mid)
+        else: bad.append(text)
+    for text in bad: ctx.error(f"not a Workshop ID or URL: {text}")
+    return list(dict.fromkeys(ids)), bool(bad)
+
+
+def fetch_meta(ctx, mod_ids):
+    """Remote metadata for mod_ids from the Steam Web API, written through to the metadata store."""
+    from .steam_api import get_published_file_details
+    found = get_published_file_details(mod_ids, timeout=ctx.config.get("http_timeout"),
+                                       on_error=lambda chunk, e: ctx.error(f"metadata request failed for {len(chunk)} item(s): {e}"))
+    for mid, meta in found.items(): ctx.meta_store.update(mid, **meta)
+    return found
+
+
+def download(ctx, mod_ids):
+    """Downloads mod_ids with one SteamCMD session; returns {mod_id: error} for the ones that failed."""
+    from .steamcmd import SteamCmdSession, SteamCmdError, install_steamcmd, force_english
+    exe = ctx.steamcmd_path or os.path.join(ctx.base_dir, "bin", "steamcmd.exe")
+    if not os.path.exists(exe):
+        ctx.log(f"SteamCMD missing. Downloading to {os.path.dirname(exe)}...")
+        from .http_client import get_client
+        try: install_steamcmd(exe, get_client())
+        except Exception as e: raise CliError(f"SteamCMD setup failed: {e}")
+    force_english(exe)
+
+    def on_event(ev):
+        if ev.kind == "item_success": ctx.log(f"Downloaded {ev.mod_id}")
+        elif ev.kind in ("item_failure", "error"): ctx.error(ev.text)
+        elif ev.kind == "login" and not ev.value: ctx.error(ev.text)
+
+    ctx.log(f"Downloading {len(mod_ids)} item(s) for {ctx.game['name']}...")
+    session = SteamCmdSession(exe, ctx.cache_path, idle_timeout=0)
+    try:
+        results = session.download_items(ctx.appid, mod_ids, on_event, ctx.stop_event)
+    except SteamCmdError as e:
+        results = {mid: str(e) for mid in mod_ids}
+    except BaseException:
+        session.kill()
+        raise
+    else:
+        session.close()
+
+    from .scanner import CacheScanner
+    CacheScanner().invalidate(ctx.content_dir)
+    done = [mid for mid in mod_ids if mid in results and not results[mid]]
+    if done and ctx.config.get("dedup_cache"):
+        from .dedup import DedupStore
+        from .sync import format_bytes
+        store = DedupStore(os.path.dirname(ctx.content_dir), max_workers=int(ctx.config.get("sync_workers", 4)))
+        stats = store.run([os.path.join(ctx.content_dir, mid) for mid in done], stop_event=ctx.stop_event)
+        if stats.linked: ctx.log(f"Dedup: {stats.linked} file(s) linked, {format_bytes(stats.reclaimed_bytes)} reclaimed")
+    return {mid: results.get(mid) or "Not downloaded" for mid in mod_ids if mid not in done}
+
+
+def deploy(ctx, mid, mode):
+    """Deploys one cached mod; returns True on success."""
+    src = os.path.join(ctx.content_dir, mid)
+    dst = os.path.join(ctx.mods_dir, mid)
+    try:
+        stats = deploy_mod(src, dst, mode, **ctx.sync_options())
+    except Exception as e:
+        ctx.error(f"could not deploy {mid}: {e}")
+        return False
+    if stats is None:
+        ctx.log(f"Enabled {mid} (link)")
+        return True
+    for err in stats.errors[:5]: ctx.error(f"sync error in {mid}: {err}")
+    if not stats.ok:
+        ctx.error(f"could not deploy {mid}: {'interrupted' if stats.stopped else f'{len(stats.errors)} file(s) failed to copy'}")
+        return False
+    ctx.log(f"Enabled {mid} ({mode}): {stats.summary()}")
+    return True
+
+
+# --- COMMANDS ---
+
+def cmd_install(ctx, args):
+    ids, bad = parse_ids(ctx, args.mods)
+    if bad: return EXIT_USAGE
+    mods_root = ctx.mods_dir
+    if not args.no_deps:
+        from .dependencies import DependencyGraph, DependencyResolver
+        from .workshop import WorkshopPages
+        pages = WorkshopPages(ctx.meta_store)
+        resolver = DependencyResolver(DependencyGraph(ctx.meta_store), lambda mid: pages.get(mid).deps,
+                                      max_workers=ctx.config.get("fetch_workers", 6))
+        closure, cycles = resolver.resolve(ids, ctx.stop_event, on_error=lambda m, e: ctx.error(f"dependency check failed for {m}: {e}"))
+        for cycle in cycles: ctx.log(f"Dependency cycle detected: {' -> '.join(cycle)}")
+        if len(closure) > len(ids): ctx.log(f"Adding {len(closure) - len(ids)} required item(s): {', '.join(closure[len(ids):])}")
+        ids = closure
+
+    failed = download(ctx, ids)
+    for mid, err in failed.items(): ctx.error(f"download failed for {mid}: {err}")
+    os.makedirs(mods_root, exist_ok=True)
+    ok = True
+    for mid in ids:
+        if mid in failed or ctx.stop_event.is_set(): continue
+        ok = deploy(ctx, mid, ctx.mode) and ok
+    return EXIT_OK if ok and not failed else EXIT_FAILED
+
+
+def cmd_update(ctx, args):
+    cached = ctx.cached_mods()
+    if args.all:
+        ids = sorted(cached)
+    else:
+        ids, bad = parse_ids(ctx, args.mods)
+        if bad: return EXIT_USAGE
+    if not ids:
+        ctx.log("No mods in the cache.")
+        return EXIT_OK
+
+    if args.force:
+        outdated = ids
+    else:
+        from .acf import is_outdated
+        meta = fetch_meta(ctx, ids)
+        installed = ctx.installed_items()
+        outdated = [mid for mid in ids if mid in meta and is_outdated(installed.get(mid), meta[mid], cached.get(mid, 0))]
+    if not outdated:
+        ctx.log(f"All {len(ids)} mod(s) are up to date.")
+        return EXIT_OK
+    if args.check:
+        for mid in outdated: print(mid)
+        return EXIT_OUTDATED
+
+    failed = download(ctx, outdated)
+    for mid, err in failed.items(): ctx.error(f"update failed for {mid}: {err}")
+
+    # Links follow the cache by themselves; physical copies are synced to the new files
+    ok = True
+    mods_root = mods_dir(ctx.game_path) if ctx.game_path else None
+    for mid in outdated:
+        if mid in failed or not mods_root: continue
+        if deployed_kind(os.path.join(mods_root, mid)) == "copy":
+            ok = deploy(ctx, mid, ctx.mode if ctx.mode != "link" else "copy") and ok
+    ctx.log(f"Updated {len(outdated) - len(failed)} of {len(outdated)} mod(s).")
+    return EXIT_OK if ok and not failed else EXIT_FAILED
+
+
+def cmd_enable(ctx, args):
+    if args.all:
+        ids = sorted(ctx.cached_mods())
+    else:
+        ids, bad = parse_ids(ctx, args.mods)
+        if bad: return EXIT_USAGE
+    mods_root = ctx.mods_dir
+    os.makedirs(mods_root, exist_ok=True)
+    ok = True
+    ops = []
+    for mid in ids:
+        if not os.path.isdir(os.path.join(ctx.content_dir, mid)):
+            ctx.error(f"{mid} is not in the cache; install it first")
+            ok = False
+        elif os.path.lexists(os.path.join(mods_root, mid)):
+            ctx.log(f"{mid} is already enabled")
+        else:
+            ops.append(op_link(mid, os.path.join(ctx.content_dir, mid), os.path.join(mods_root, mid), ctx.mode))
+    code = run_batch(ctx, ops)
+    return code if ok or code != EXIT_OK else EXIT_FAILED
+
+
+def cmd_disable(ctx, args):
+    mods_root = ctx.mods_dir
+    if args.all:
+        from .scanner import CacheScanner
+        ids = sorted(n for n in CacheScanner.scan_links(mods_root) if n.isdigit())
+    else:
+        ids, bad = parse_ids(ctx, args.mods)
+        if bad: return EXIT_USAGE
+    ops = []
+    for mid in ids:
+        if os.path.lexists(os.path.join(mods_root, mid)): ops.append(op_unlink(mid, os.path.join(mods_root, mid)))
+        else: ctx.log(f"{mid} is not enabled")
+    return run_batch(ctx, ops)
+
+
+def run_batch(ctx, ops):
+    """Runs link/unlink ops as one journaled batch (see bzengine.journal); returns the exit code."""
+    failed = []
+    def on_item(mid, op, error):
+        if error:
+            ctx.error(f"could not {'enable' if op == 'link' else 'disable'} {mid}: {error}")
+            failed.append(mid)
+        else: ctx.log(f"{'Enabled' if op == 'link' else 'Disabled'} {mid}")
+    result = ctx.journal.run(ops, on_item=on_item, **ctx.sync_options())
+    if result.cancelled:
+        ctx.log("Interrupted; the mods folder was left as it was.")
+        return EXIT_INTERRUPTED
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cmd_list(ctx, args):
+    from .acf import is_outdated
+    cached = ctx.cached_mods()
+    mods_root = mods_dir(ctx.game_path) if ctx.game_path else None
+    if args.refresh and cached: fetch_meta(ctx, list(cached))
+    installed = ctx.installed_items()
+    rows = []
+    for mid in sorted(cached, key=lambda m: (len(m), m)):
+        meta = ctx.meta_store.get(mid) or {}
+        acf = installed.get(mid) or {}
+        kind = deployed_kind(os.path.join(mods_root, mid)) if mods_root else None
+        rows.append({
+            "id": mid,
+            "title": meta.get("title"),
+            "enabled": kind is not None,
+            "deploy": kind,
+            "local_date": datetime.fromtimestamp(cached[mid]).strftime("%Y-%m-%d"),
+            "remote_date": meta.get("remote_date"),
+            "manifest": acf.get("manifest"),
+            # Unknown until metadata has been fetched (here with --refresh, or by the GUI)
+            "outdated": is_outdated(acf, meta, cached[mid]) if meta.get("time_updated") or meta.get("manifest") else None,
+        })
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return EXIT_OK
+    for r in rows:
+        state = "ENABLED" if r["enabled"] else "DISABLED"
+        flag = " (OUT OF DATE)" if r["outdated"] else ""
+        print(f"{r['id']:>12}  {state:<8}  {r['local_date']}  {r['title'] or ''}{flag}")
+    ctx.log(f"{len(rows)} mod(s) in cache, {sum(r['enabled'] for r in rows)} enabled.")
+    return EXIT_OK
+
+
+def cmd_verify(ctx, args):
+    """Checks links, physical copies and SteamCMD's manifest against the cache."""
+    from .sync import diff_tree
+    from .scanner import CacheScanner
+    cached = ctx.cached_mods()
+    problems = 0
+    for path in ctx.journal.pending():
+        ctx.error(f"unfinished mod batch {os.path.basename(path)}; run 'recover' (or 'recover --rollback')")
+        problems += 1
+    for mid in sorted(ctx.installed_items()):
+        if mid not in cached:
+            ctx.error(f"{mid}: listed in SteamCMD's manifest but missing from the cache")
+            problems += 1
+
+    mods_root = ctx.mods_dir
+    for mid in sorted(n for n in CacheScanner.scan_links(mods_root) if n.isdigit()):
+        if ctx.stop_event.is_set(): break
+        path = os.path.join(mods_root, mid)
+        src = os.path.join(ctx.content_dir, mid)
+        kind = deployed_kind(path)
+        if kind == "link":
+            if os.path.exists(path): continue
+            ctx.error(f"{mid}: broken link")
+            if args.fix:
+                remove_mod(path)
+                ctx.log(f"{mid}: removed broken link")
+                continue
+        elif kind == "copy":
+            if mid not in cached:
+                ctx.log(f"{mid}: physical copy with no cached source, skipped")
+                continue
+            changed, missing, extra = diff_tree(src, path, verify_hash=args.hash)
+            if not (changed or missing or extra): continue
+            ctx.error(f"{mid}: copy differs from the cache ({len(changed)} changed, {len(missing)} missing, {len(extra)} extra)")
+            if args.fix and deploy(ctx, mid, ctx.mode if ctx.mode != "link" else "copy"): continue
+        else:
+            continue
+        problems += 1
+
+    if problems: ctx.log(f"{problems} problem(s) found.")
+    else: ctx.log("Everything matches the cache.")
+    return EXIT_FAILED if problems else EXIT_OK
+
+
+def cmd_profile(ctx, args):
+    from .profiles import Profiles, deployed_mods, plan_profile, apply_plan
+    profiles = Profiles(ctx.config)
+    if args.action == "list":
+        names = profiles.names(ctx.game_key)
+        if args.json:
+            json.dump({name: profiles.get(ctx.game_key, name) for name in names}, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            for name in names: print(f"{name}  ({len(profiles.get(ctx.game_key, name))} mods)")
+        return EXIT_OK
+    if not args.name:
+        ctx.error(f"profile {args.action}: give a profile name")
+        return EXIT_USAGE
+
+    if args.action == "save":
+        if args.mods:
+            ids, bad = parse_ids(ctx, args.mods)
+            if bad: return EXIT_USAGE
+        else:
+            ids = deployed_mods(ctx.mods_dir)
+        profiles.save(ctx.game_key, args.name, ids)
+        save_config(ctx.config, ctx.base_dir)
+        ctx.log(f"Profile {args.name} saved with {len(ids)} mod(s).")
+        return EXIT_OK
+
+    wanted = profiles.get(ctx.game_key, args.name)
+    if wanted is None:
+        ctx.error(f"no profile named {args.name!r} for {ctx.game['name']}")
+        return EXIT_FAILED
+    if args.action == "show":
+        for mid in wanted: print(mid)
+        return EXIT_OK
+    if args.action == "delete":
+        profiles.delete(ctx.game_key, args.name)
+        save_config(ctx.config, ctx.base_dir)
+        ctx.log(f"Profile {args.name} deleted.")
+        return EXIT_OK
+
+    # apply
+    mods_root = ctx.mods_dir
+    os.makedirs(mods_root, exist_ok=True)
+    plan = plan_profile(wanted, deployed_mods(mods_root), set(ctx.cached_mods()))
+    for mid in plan.missing: ctx.error(f"{mid} is not in the cache; install it first")
+    ctx.log(f"Profile {args.name}: {len(plan.enable)} to enable, {len(plan.disable)} to disable.")
+    if args.dry_run:
+        for mid in plan.disable: print(f"-{mid}")
+        for mid in plan.enable: print(f"+{mid}")
+        return EXIT_OK
+    failed = []
+    def on_item(mid, op, error):
+        if error:
+            ctx.error(f"could not {'enable' if op == 'link' else 'disable'} {mid}: {error}")
+            failed.append(mid)
+        else: ctx.log(f"{'Enabled' if op == 'link' else 'Disabled'} {mid}")
+    result = apply_plan(plan, ctx.content_dir, mods_root, ctx.mode, journal=ctx.journal, on_item=on_item, **ctx.sync_options())
+    if result.cancelled:
+        ctx.log("Interrupted; the mods folder was left as it was.")
+        return EXIT_INTERRUPTED
+    return EXIT_OK if not (failed or plan.missing) else EXIT_FAILED
+
+
+def cmd_recover(ctx, args):
+    """Finishes (or rolls back) mod batches a crash or Ctrl+C interrupted."""
+    recovered = ctx.journal.recover(rollback=args.rollback)
+    for txid, action in recovered: ctx.log(f"Batch {txid} {action}.")
+    if not recovered: ctx.log("No unfinished mod batches.")
+    return EXIT_OK
+
+
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--game", help=f"game key, app ID or name ({', '.join(GAMES)}); defaults to the GUI's last game")
+    common.add_argument("--game-path", help="game install folder (default: from the config)")
+    common.add_argument("--cache", help="SteamCMD workshop cache folder (default: from the config)")
+    common.add_argument("--steamcmd", help="path to the SteamCMD executable (default: from the config)")
+    common.add_argument("-q", "--quiet", action="store_true", help="only print errors and results")
+
+    parser = argparse.ArgumentParser(prog="cmd.py", description="Battlezone Mod Engine without the GUI.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("install", parents=[common], help="download and enable mods")
+    p.add_argument("mods", nargs="+", metavar="ID|URL")
+    p.add_argument("--no-deps", action="store_true", help="do not add required items")
+    p.add_argument("--mode", choices=DEPLOY_MODES, help="deploy mode (default: from the config)")
+    p.set_defaults(func=cmd_install)
+
+    p = sub.add_parser("update", parents=[common], help="re-download out-of-date mods")
+    p.add_argument("mods", nargs="*", metavar="ID|URL")
+    p.add_argument("--all", action="store_true", help="check every mod in the cache")
+    p.add_argument("--check", action="store_true", help=f"only print out-of-date IDs (exit {EXIT_OUTDATED} if any)")
+    p.add_argument("--force", action="store_true", help="re-download without checking for updates")
+    p.add_argument("--mode", choices=DEPLOY_MODES, help="deploy mode for physical copies (default: from the config)")
+    p.set_defaults(func=cmd_update)
+
+    for name, func, text in (("enable", cmd_enable, "deploy cached mods to the game"),
+                             ("disable", cmd_disable, "remove mods from the game (the cache is kept)")):
+        p = sub.add_parser(name, parents=[common], help=text)
+        p.add_argument("mods", nargs="*", metavar="ID|URL")
+        p.add_argument("--all", action="store_true", help="every mod")
+        if name == "enable": p.add_argument("--mode", choices=DEPLOY_MODES, help="deploy mode (default: from the config)")
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("list", parents=[common], help="show cached mods")
+    p.add_argument("--json", action="store_true", help="machine-readable output")
+    p.add_argument("--refresh", action="store_true", help="fetch Workshop metadata first")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("verify", parents=[common], help="check deployed mods against the cache")
+    p.add_argument("--hash", action="store_true", help="compare file contents, not just sizes and dates")
+    p.add_argument("--fix", action="store_true", help="resync drifted copies and remove broken links")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("profile", parents=[common], help="named sets of enabled mods")
+    p.add_argument("action", choices=("list", "show", "save", "apply", "delete"))
+    p.add_argument("name", nargs="?")
+    p.add_argument("mods", nargs="*", metavar="ID|URL", help="save: the profile's mods (default: the ones enabled now)")
+    p.add_argument("--json", action="store_true", help="list: machine-readable output")
+    p.add_argument("--dry-run", action="store_true", help="apply: only print the changes (+enable, -disable)")
+    p.add_argument("--mode", choices=DEPLOY_MODES, help="apply: deploy mode (default: from the config)")
+    p.set_defaults(func=cmd_profile)
+
+    p = sub.add_parser("recover", parents=[common], help="finish or undo an interrupted enable/disable batch")
+    p.add_argument("--rollback", action="store_true", help="undo batches that had not committed yet")
+    p.set_defaults(func=cmd_recover)
+    return parser
+
+
+def main(argv=None, base_dir=None):
+    attach_console()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in ("update", "enable", "disable") and not (args.mods or args.all):
+        parser.error(f"{args.command}: give mod IDs or --all")
+    ctx = None
+    try:
+        ctx = Context(args, base_dir or default_base_dir())
+        return args.func(ctx, args)
+    except CliError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_CONFIG
+    except KeyboardInterrupt:
+        if ctx:
+            ctx.stop_event.set()
+            if ctx.journal.pending(): print("Interrupted mid-batch; run 'recover' to finish or undo it.", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    finally:
+        if ctx: ctx.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import json
+import os
+
+from .games import GAMES, DEFAULT_GAME
+
+CONFIG_FILE = "bz_mod_config.json"
+# Deploy strategies: link (junction/symlink), hardlink, reflink or copy
+DEPLOY_MODES = ("link", "hardlink", "reflink", "copy")
+PATH_KEYS = ["game_path", "steamcmd_path", "cache_path"] + [f"path_{key}" for key in GAMES]
+
+
+def load_config(base_dir, path=CONFIG_FILE):
+    """Reads the shared config; relative paths are resolved against base_dir."""
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        # Convert relative paths back to absolute
+        for key in PATH_KEYS:
+            if key in data and data[key] and not os.path.isabs(data[key]):
+                data[key] = os.path.normpath(os.path.join(base_dir, data[key]))
+        return data
+    except: return {}
+
+
+def save_config(config, base_dir, path=CONFIG_FILE):
+    """Writes config, storing paths on base_dir's drive relative to it so the folder stays portable."""
+    def make_rel(value):
+        if not value: return ""
+        try:
+            if os.path.splitdrive(value)[0].lower() == os.path.splitdrive(base_dir)[0].lower():
+                return os.path.relpath(value, base_dir)
+        except: pass
+        return value
+
+    storage_config = config.copy()
+    for k, v in storage_config.items():
+        if "path" in k and isinstance(v, str):
+            storage_config[k] = make_rel(v)
+
+    with open(path, 'w') as f: json.dump(storage_config, f, indent=4)
+
+
+def current_game(config):
+    key = config.get("last_game", DEFAULT_GAME)
+    return key if key in GAMES else DEFAULT_GAME
+
+
+def game_path(config, key):
+    """Game folder for key, falling back to the legacy global path for BZ98R."""
+    saved = config.get(f"path_{key}", "")
+    if not saved and key == "BZ98R": saved = config.get("game_path", "")
+    return saved
+
+
+def cache_path(config, base_dir):
+    return config.get("cache_path") or os.path.join(base_dir, "workshop_cache")
+
+
+def deploy_mode(config):
+    # Legacy configs only had use_physical
+    mode = str(config.get("deploy_mode") or ("copy" if config.get("use_physical", False) else "link")).lower()
+    return mode if mode in DEPLOY_MODES else "link"
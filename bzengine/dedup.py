@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .sync import file_hash
+
+STORE_DIRNAME = ".bzstore"
+TMP_SUFFIX = ".bzdedup"
+
+
+class DedupStats:
+    def __init__(self):
+        self.files = 0
+        self.hashed = 0
+        self.linked = 0
+        self.reclaimed_bytes = 0
+        self.gc_bytes = 0
+        self.errors = []
+
+
+class DedupStore:
+    """Content-addressed store that hardlinks identical files across Workshop mods.
+
+    Lives next to steamapps/workshop/content (so on the same filesystem) as
+    .bzstore/<xx>/<digest>. Every file of at least min_size bytes is tracked
+    in an index with its size, mtime, inode and digest; only files whose size
+    collides with another tracked file are ever hashed, and a file whose
+    size/mtime/inode are unchanged keeps its stored digest. Files with the
+    same digest are replaced by hardlinks to one store object, which frees
+    their space. Store objects nothing links to any more are collected on a
+    full pass.
+    """
+
+    def __init__(self, content_root, store_dir=None, min_size=4096, max_workers=4):
+        self.content_root = os.path.abspath(content_root)
+        self.store_dir = store_dir or os.path.join(os.path.dirname(self.content_root), STORE_DIRNAME)
+        self.index_path = os.path.join(self.store_dir, "index.json")
+        self.min_size = min_size
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._index = self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data.get("files", {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        os.makedirs(self.store_dir, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f: json.dump({"version": 1, "files": self._index}, f)
+            os.replace(tmp, self.index_path)
+        except OSError: pass
+
+    def object_path(self, digest):
+        return os.path.join(self.store_dir, digest[:2], digest)
+
+    def mod_dirs(self):
+        """Every <appid>/<mod id> folder under the content root."""
+        dirs = []
+        try:
+            with os.scandir(self.content_root) as apps:
+                for app in apps:
+                    # Skips hidden work folders such as the mod journal's .bztxn
+                    if not app.is_dir() or app.name.startswith("."): continue
+                    with os.scandir(app.path) as mods:
+                        dirs.extend(m.path for m in mods if m.is_dir(follow_symlinks=False))
+        except OSError: pass
+        return dirs
+
+    def _stat_walk(self, mod_dirs):
+        seen = {}
+        stack = list(mod_dirs)
+        while stack:
+            d = stack.pop()
+            try:
+                with os.scandir(d) as it:
+                    for e in it:
+                        try:
+                            if e.is_dir(follow_symlinks=False):
+                                stack.append(e.path)
+                            elif e.is_file(follow_symlinks=False) and not e.name.endswith(TMP_SUFFIX):
+                                st = os.stat(e.path)  # full stat: DirEntry has no inode/link count on Windows
+                                if st.st_size >= self.min_size:
+                                    seen[os.path.relpath(e.path, self.content_root)] = st
+                        except OSError: pass
+            except OSError: pass
+        return seen
+
+    def run(self, mod_dirs=None, stop_event=None):
+        """Deduplicates mod_dirs (every mod when None) against the whole index. Returns DedupStats.
+
+        A partial run only walks the given mod folders and relies on the index
+        for everything else, which is what keeps the pass after a download
+        batch cheap.
+        """
+        with self._lock:
+            full = mod_dirs is None
+            walk_dirs = self.mod_dirs() if full else [os.path.abspath(d) for d in mod_dirs if os.path.isdir(d)]
+            stats = DedupStats()
+            seen = self._stat_walk(walk_dirs)
+            stats.files = len(seen)
+
+            # Forget index entries for files that vanished from the walked folders
+            prefixes = tuple(os.path.relpath(d, self.content_root) + os.sep for d in walk_dirs)
+            for rel in list(self._index):
+                if rel not in seen and (full or rel.startswith(prefixes)): del self._index[rel]
+            for rel, st in seen.items():
+                entry = self._index.get(rel)
+                if not entry or entry[:3] != [st.st_size, st.st_mtime_ns, st.st_ino]:
+                    self._index[rel] = [st.st_size, st.st_mtime_ns, st.st_ino, None]
+
+            # Only files sharing a size with another file can be duplicates
+            by_size = {}
+            for rel, entry in self._index.items(): by_size.setdefault(entry[0], []).append(rel)
+            to_hash = [rel for rels in by_size.values() if len(rels) > 1 for rel in rels if self._index[rel][3] is None]
+
+            def digest(rel):
+                if stop_event is not None and stop_event.is_set(): return rel, None
+                try: return rel, file_hash(os.path.join(self.content_root, rel))
+                except OSError: return rel, None
+            with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+                for rel, dg in pool.map(digest, to_hash):
+                    if dg is None: continue
+                    self._index[rel][3] = dg
+                    stats.hashed += 1
+
+            if stop_event is None or not stop_event.is_set():
+                groups = {}
+                for rel, entry in self._index.items():
+                    if entry[3]: groups.setdefault(entry[3], []).append(rel)
+                for dg, rels in groups.items():
+                    if len(rels) > 1 or os.path.exists(self.object_path(dg)):
+                        self._link_group(dg, rels, stats)
+                if full: stats.gc_bytes = self.gc()
+
+            self.save()
+            return stats
+
+    def _current(self, rel, path, dg):
+        """stat of path if it is still the file that was hashed to dg, else None (and it is rehashed next time)."""
+        st = os.stat(path)
+        entry = self._index.get(rel)
+        if not entry or entry != [st.st_size, st.st_mtime_ns, st.st_ino, dg]:
+            # Changed since it was hashed (not walked this pass)
+            self._index[rel] = [st.st_size, st.st_mtime_ns, st.st_ino, None]
+            return None
+        return st
+
+    def _link_group(self, dg, rels, stats):
+        obj = self.object_path(dg)
+        paths = [os.path.join(self.content_root, rel) for rel in rels]
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            for rel, path in zip(rels, paths):
+                try:
+                    if self._current(rel, path, dg) is None: continue
+                    os.link(path, obj)
+                    break
+                except FileNotFoundError:
+                    self._index.pop(rel, None)
+                except OSError as e:
+                    stats.errors.append(f"{rel}: {e}")
+                    return
+            else: return
+        for rel, path in zip(rels, paths):
+            try:
+                if os.path.samefile(path, obj): continue
+                st = self._current(rel, path, dg)
+                if st is None: continue
+                tmp = path + TMP_SUFFIX
+                if os.path.lexists(tmp): os.remove(tmp)
+                os.link(obj, tmp)
+                os.replace(tmp, path)
+                stats.linked += 1
+                # Space only comes back when this was the file's last link
+                if st.st_nlink == 1: stats.reclaimed_bytes += st.st_size
+                new = os.stat(path)
+                self._index[rel] = [new.st_size, new.st_mtime_ns, new.st_ino, dg]
+            except FileNotFoundError:
+                # Partner from the index that was deleted since it was recorded
+                self._index.pop(rel, None)
+            except OSError as e:
+                stats.errors.append(f"{rel}: {e}")
+
+    def gc(self):
+        """Deletes store objects no mod file links to any more; returns the bytes freed."""
+        freed = 0
+        try:
+            buckets = [e.path for e in os.scandir(self.store_dir) if e.is_dir()]
+        except OSError: return 0
+        for bucket in buckets:
+            with os.scandir(bucket) as it:
+                for e in it:
+                    try:
+                        st = os.stat(e.path)
+                        if st.st_nlink <= 1:
+                            os.remove(e.path)
+                            freed += st.st_size
+                    except OSError: pass
+        return freed
+
+    def store_usage(self):
+        """(objects, bytes) currently held by the store."""
+        count = total = 0
+        try:
+            for bucket in os.scandir(self.store_dir):
+                if not bucket.is_dir(): continue
+                for e in os.scandir(bucket.path):
+                    count += 1
+                    total += e.stat().st_size
+        except OSError: pass
+        return count, total
@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_DEPS_TTL = 24 * 60 * 60
+
+
+class DependencyGraph:
+    """Dependency edges backed by the metadata store, so the graph survives restarts.
+
+    Forward edges are each entry's "deps" list; the reverse index used for
+    "what depends on X" is rebuilt only when the store has changed.
+    """
+
+    def __init__(self, store, ttl=DEFAULT_DEPS_TTL):
+        self.store = store
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._reverse = {}
+        self._reverse_gen = None
+
+    def deps_of(self, mid):
+        """Known dependencies of mid, or None if they were never resolved or have expired."""
+        entry = self.store.get(mid)
+        if not entry or entry.get("deps") is None: return None
+        if time.time() - entry.get("deps_at", 0) > self.ttl: return None
+        return list(entry["deps"])
+
+    def record(self, mid, deps):
+        self.store.update(mid, deps=list(deps), deps_at=time.time())
+
+    def dependents(self, mid):
+        """IDs of every mod whose dependency list contains mid."""
+        with self._lock:
+            if self._reverse_gen != self.store.generation:
+                reverse = {}
+                for parent, entry in self.store.items():
+                    for dep in entry.get("deps") or ():
+                        reverse.setdefault(dep, set()).add(parent)
+                self._reverse = reverse
+                self._reverse_gen = self.store.generation
+            return set(self._reverse.get(str(mid), ()))
+
+
+class DependencyResolver:
+    """Expands the full transitive dependency closure breadth-first.
+
+    Each BFS level fetches all of its unknown nodes concurrently through
+    fetch_deps(mid) -> list; nodes already in the graph cost nothing.
+    """
+
+    def __init__(self, graph, fetch_deps, max_workers=6):
+        self.graph = graph
+        self.fetch_deps = fetch_deps
+        self.max_workers = max_workers
+
+    def _lookup(self, mid):
+        deps = self.graph.deps_of(mid)
+        if deps is None:
+            deps = [str(d) for d in self.fetch_deps(mid)]
+            self.graph.record(mid, deps)
+        return deps
+
+    def resolve(self, roots, stop_event=None, on_error=None):
+        """Returns (closure, cycles): closure lists roots first then dependencies in BFS order."""
+        order = [str(r) for r in dict.fromkeys(roots)]
+        seen = set(order)
+        edges = {}
+        frontier = list(order)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while frontier:
+                if stop_event is not None and stop_event.is_set(): break
+                futures = {mid: pool.submit(self._lookup, mid) for mid in frontier}
+                frontier = []
+                for mid, fut in futures.items():
+                    try: deps = fut.result()
+                    except Exception as e:
+                        if on_error: on_error(mid, e)
+                        deps = []
+                    edges[mid] = deps
+                    for dep in deps:
+                        if dep not in seen:
+                            seen.add(dep)
+                            order.append(dep)
+                            frontier.append(dep)
+        return order, self.find_cycles(edges)
+
+    @staticmethod
+    def find_cycles(edges):
+        """Returns each dependency cycle in edges as a list of IDs, first ID repeated at the end."""
+        WHITE, GREY, BLACK = 0, 1, 2
+        color = {}
+        cycles = []
+        for start in edges:
+            if color.get(start, WHITE) != WHITE: continue
+            stack = [(start, iter(edges.get(start, ())))]
+            path = [start]
+            color[start] = GREY
+            while stack:
+                node, it = stack[-1]
+                nxt = next(it, None)
+                if nxt is None:
+                    color[node] = BLACK
+                    stack.pop()
+                    path.pop()
+                elif color.get(nxt, WHITE) == GREY:
+                    cycles.append(path[path.index(nxt):] + [nxt])
+                elif color.get(nxt, WHITE) == WHITE:
+                    color[nxt] = GREY
+                    path.append(nxt)
+                    stack.append((nxt, iter(edges.get(nxt, ()))))
+        return cycles
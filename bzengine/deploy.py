@@ -0,0 +1,71 @@
+import os
+import platform
+import shutil
+import subprocess
+
+from .sync import sync_tree, is_link
+
+IS_WINDOWS = platform.system() == "Windows"
+
+
+def content_dir(cache_path, appid):
+    return os.path.join(os.path.abspath(cache_path), "steamapps", "workshop", "content", str(appid))
+
+
+def mods_dir(game_path):
+    return os.path.join(os.path.abspath(game_path), "mods")
+
+
+def is_junction(path):
+    """True if path is a Windows junction or a symlink."""
+    if IS_WINDOWS:
+        import ctypes
+        return bool(os.path.isdir(path) and (ctypes.windll.kernel32.GetFileAttributesW(path) & 0x400))
+    return os.path.islink(path)
+
+
+def link_mod(src, dst):
+    """Links dst to the cache folder src: a junction on Windows (best engine compatibility), else a symlink."""
+    if IS_WINDOWS:
+        subprocess.run(f'mklink /J "{dst}" "{src}"', shell=True, check=True, capture_output=True, timeout=10)
+        return "junction"
+    os.symlink(src, dst, target_is_directory=True)
+    return "symlink"
+
+
+def deploy_mod(src, dst, mode="link", **sync_options):
+    """Deploys the cache folder src as dst; returns SyncStats for physical modes and None for links.
+
+    An existing link is left alone in link mode; the other modes sync the
+    folder in place (see bzengine.sync.sync_tree).
+    """
+    parent = os.path.dirname(dst)
+    if not os.path.exists(parent): os.makedirs(parent)
+    if mode != "link":
+        return sync_tree(src, dst, **dict(sync_options, method=mode))
+    if not os.path.lexists(dst): link_mod(src, dst)
+    return None
+
+
+def remove_mod(dst):
+    """Removes a deployed mod without touching the cache; returns False if nothing was there.
+
+    Links are unlinked (os.rmdir for junctions, which leaves their target
+    alone); hardlinked, reflinked or copied folders are our own files and are
+    deleted.
+    """
+    if not os.path.lexists(dst): return False
+    if os.path.isdir(dst) and not is_junction(dst):
+        shutil.rmtree(dst)
+    elif IS_WINDOWS:
+        if os.path.isdir(dst): os.rmdir(dst)
+        else: os.remove(dst)  # File symlinks
+    else:
+        os.unlink(dst)
+    return True
+
+
+def deployed_kind(path):
+    """"link", "copy" or None for an entry in the game mods folder."""
+    if is_link(path): return "link"
+    return "copy" if os.path.isdir(path) else None
@@ -0,0 +1,86 @@
+import threading
+
+
+class DownloadScheduler:
+    """Central download queue that merges requests into SteamCMD batches.
+
+    Requests arriving within `window` seconds of each other are collected and
+    handed to run_batch(mod_ids, settings) as one batch per distinct settings
+    tuple (SteamCMD path, cache, game path, ...). IDs already queued or running
+    (with any settings) are dropped, and at most `max_processes` batches run at
+    the same time. Batches cancelled before they start are handed to
+    on_cancelled(mod_ids, settings) instead, so the caller can reset its UI.
+    """
+
+    def __init__(self, run_batch, window=1.5, max_processes=1, on_cancelled=None):
+        self.run_batch = run_batch
+        self.on_cancelled = on_cancelled
+        self.window = window
+        self._slots = threading.BoundedSemaphore(max(1, int(max_processes)))
+        self._lock = threading.Lock()
+        self._queued = {}
+        # Flushed batches still waiting for a slot, and the IDs of every flushed batch not yet finished
+        self._waiting = set()
+        self._running = set()
+        self._timer = None
+
+    def request(self, mod_ids, settings):
+        """Queues mod_ids for download; returns the IDs that were not already queued or running."""
+        accepted = []
+        with self._lock:
+            busy = self._running.union(*self._queued.values())
+            batch = self._queued.setdefault(settings, [])
+            for mid in mod_ids:
+                mid = str(mid)
+                if mid in busy or mid in accepted: continue
+                batch.append(mid)
+                accepted.append(mid)
+            if not batch: del self._queued[settings]
+            if accepted and self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return accepted
+
+    def is_pending(self, mid):
+        with self._lock:
+            return str(mid) in self._running or any(str(mid) in ids for ids in self._queued.values())
+
+    def cancel_pending(self):
+        """Drops queued requests and batches still waiting for a SteamCMD slot. Returns the number of IDs dropped."""
+        with self._lock:
+            dropped = [(tuple(ids), settings) for settings, ids in self._queued.items()] + list(self._waiting)
+            self._queued = {}
+            for ids, _ in self._waiting: self._running.difference_update(ids)
+            self._waiting = set()
+            if self._timer: self._timer.cancel()
+            self._timer = None
+        for ids, settings in dropped:
+            if self.on_cancelled:
+                try: self.on_cancelled(list(ids), settings)
+                except Exception: pass
+        return sum(len(ids) for ids, _ in dropped)
+
+    def _flush(self):
+        with self._lock:
+            self._timer = None
+            batches, self._queued = self._queued, {}
+            flushed = [(tuple(ids), settings) for settings, ids in batches.items()]
+            for batch in flushed:
+                self._waiting.add(batch)
+                self._running.update(batch[0])
+        for batch in flushed:
+            threading.Thread(target=self._run, args=(batch,), daemon=True).start()
+
+    def _run(self, batch):
+        with self._slots:
+            with self._lock:
+                # Gone when cancel_pending dropped it while it waited (and already reported it)
+                if batch not in self._waiting: return
+                self._waiting.discard(batch)
+            ids, settings = batch
+            try:
+                self.run_batch(list(ids), settings)
+            finally:
+                with self._lock:
+                    self._running.difference_update(ids)
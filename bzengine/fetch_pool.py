@@ -0,0 +1,115 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class FetchPool:
+    """Fixed-size worker pool that runs keyed jobs lowest-priority-value first.
+
+    Jobs are keyed (normally by mod ID) so a later submit or promote for the
+    same key replaces the pending one instead of queueing duplicate work.
+    A job counts as failed when it raises or returns False.
+    """
+
+    def __init__(self, max_workers=6):
+        self.max_workers = max(1, int(max_workers))
+        self._heap = []
+        self._pending = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._workers = []
+        self._active = 0
+        self.completed = 0
+        self.failed = 0
+        self._batch_start = None
+        self._batch_done = 0
+        self._batch_failed = 0
+        self._last_batch = None
+
+    def submit(self, key, fn, *args, priority=100):
+        with self._cond:
+            old = self._pending.get(key)
+            if old: old[3] = None
+            entry = [priority, next(self._seq), key, (fn, args)]
+            self._pending[key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._batch_start is None:
+                self._batch_start = time.monotonic()
+                self._batch_done = 0
+                self._batch_failed = 0
+            if len(self._workers) < self.max_workers and len(self._workers) < len(self._pending) + self._active:
+                t = threading.Thread(target=self._worker, daemon=True)
+                self._workers.append(t)
+                t.start()
+            self._cond.notify()
+
+    def promote(self, keys, priority=0):
+        """Moves still-pending jobs for the given keys to the front of the queue."""
+        with self._cond:
+            for key in keys:
+                old = self._pending.get(key)
+                if not old or old[0] <= priority: continue
+                entry = [priority, next(self._seq), key, old[3]]
+                old[3] = None
+                self._pending[key] = entry
+                heapq.heappush(self._heap, entry)
+
+    def cancel_pending(self):
+        """Drops every job that has not started yet. Returns how many were dropped."""
+        with self._cond:
+            dropped = len(self._pending)
+            for entry in self._pending.values(): entry[3] = None
+            self._pending.clear()
+            self._heap.clear()
+            if not self._active: self._batch_start = None
+            return dropped
+
+    def is_busy(self):
+        with self._cond:
+            return bool(self._pending or self._active)
+
+    def stats(self):
+        """Queue depth and throughput of the current batch."""
+        with self._cond:
+            elapsed = time.monotonic() - self._batch_start if self._batch_start else 0.0
+            return {
+                "pending": len(self._pending),
+                "active": self._active,
+                "done": self._batch_done,
+                "failed": self._batch_failed,
+                "elapsed": elapsed,
+                "rate": self._batch_done / elapsed if elapsed > 0 else 0.0,
+            }
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                entry = heapq.heappop(self._heap)
+                job = entry[3]
+                if job is None: continue
+                if self._pending.get(entry[2]) is entry: del self._pending[entry[2]]
+                self._active += 1
+
+            fn, args = job
+            try: ok = fn(*args) is not False
+            except Exception: ok = False
+
+            with self._cond:
+                self._active -= 1
+                self.completed += 1
+                self._batch_done += 1
+                if not ok:
+                    self.failed += 1
+                    self._batch_failed += 1
+                if not self._pending and not self._active and self._batch_start is not None:
+                    self._last_batch = (self._batch_done, self._batch_failed, time.monotonic() - self._batch_start)
+                    self._batch_start = None
+
+    def pop_last_batch(self):
+        """(items, failed, seconds) of the most recently drained batch, reported only once."""
+        with self._cond:
+            last, self._last_batch = self._last_batch, None
+            return last
@@ -0,0 +1,40 @@
+"""Games the engine manages mods for, keyed by the short name stored in the config."""
+
+DEFAULT_GAME = "BZ98R"
+
+GAMES = {
+    "BZ98R": {
+        "name": "Battlezone 98 Redux",
+        "appid": "301650",
+        "gog_ids": ["1454067812", "1459427445"],
+        "exe": "battlezone98redux.exe",
+        "font_file": "BZONE.ttf",
+        "font_name": "BZONE",
+        "icon_file": "bz98.png",
+        "colors": {
+            "bg": "#0a0a0a", "fg": "#d4d4d4",
+            "highlight": "#00ff00", "dark_highlight": "#004400", "accent": "#00ffff"
+        }
+    },
+    "BZCC": {
+        "name": "Battlezone Combat Commander",
+        "appid": "624970",
+        "gog_ids": ["1193046833"],
+        "exe": "battlezone2.exe",
+        "font_file": "BGM.ttf",
+        "font_name": "BankGothic",
+        "icon_file": "bz2.png",
+        "colors": {
+            "bg": "#0a0a0a", "fg": "#d4d4d4",
+            "highlight": "#00aaff", "dark_highlight": "#002244", "accent": "#88ccff"
+        }
+    }
+}
+
+
+def find_game(key_or_appid):
+    """Game key for a config key, Steam app ID or (case-insensitive) name; None if unknown."""
+    text = str(key_or_appid or "").strip()
+    for key, g in GAMES.items():
+        if text.upper() == key or text == g["appid"] or text.casefold() == g["name"].casefold(): return key
+    return None
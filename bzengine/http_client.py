@@ -0,0 +1,173 @@
+import gzip
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+import zlib
+
+DEFAULT_TIMEOUT = 20
+USER_AGENT = "Mozilla/5.0"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class HttpError(Exception):
+    def __init__(self, status, url, reason=None):
+        super().__init__(f"HTTP {status} for {url}" + (f" ({reason})" if reason else ""))
+        self.status = status
+        self.url = url
+
+
+class Response:
+    def __init__(self, status, headers, body, url):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+
+    @property
+    def ok(self):
+        return 200 <= self.status < 300
+
+    def raise_for_status(self):
+        if self.status >= 400: raise HttpError(self.status, self.url)
+        return self
+
+    def text(self, encoding='utf-8'):
+        return self.body.decode(encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.text())
+
+
+class HttpClient:
+    """Thread-safe HTTP client that keeps idle keep-alive connections per host.
+
+    Every request asks for gzip, has a socket timeout, follows redirects and
+    retries 429/5xx responses and dropped connections with exponential backoff.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=3, backoff=1.0, max_idle_per_host=6):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_idle_per_host = max_idle_per_host
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            pool = self._idle.get(key)
+            if pool:
+                conn = pool.pop()
+                conn.timeout = timeout
+                if conn.sock: conn.sock.settimeout(timeout)
+                return conn, True
+        scheme, host, port = key
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def _release(self, key, conn):
+        with self._lock:
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self.max_idle_per_host:
+                pool.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for pool in pools.values():
+            for conn in pool: conn.close()
+
+    def request(self, method, url, data=None, headers=None, timeout=None, max_redirects=5):
+        """Performs a request and returns the final Response (any status; see raise_for_status)."""
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            parts = urllib.parse.urlsplit(url)
+            key = (parts.scheme, parts.hostname, parts.port)
+            path = parts.path or "/"
+            if parts.query: path += "?" + parts.query
+
+            h = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+            if headers: h.update(headers)
+
+            conn, reused = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body=data, headers=h)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                # A pooled connection the server already closed: retry straight away on a fresh one
+                if reused: continue
+                if attempt >= self.retries: raise
+                attempt += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+                continue
+
+            if resp.will_close: conn.close()
+            else: self._release(key, conn)
+
+            try:
+                body = _decode(body, (resp.getheader("Content-Encoding") or "").lower())
+            except (OSError, EOFError, zlib.error) as e:
+                # Truncated or corrupt body: retried like a dropped connection, then reported as an HttpError
+                if attempt >= self.retries: raise HttpError(resp.status, url, f"bad response body: {e}") from e
+                attempt += 1
+                time.sleep(self.backoff * (2 ** (attempt - 1)))
+                continue
+
+            if resp.status in REDIRECT_STATUSES and resp.getheader("Location") and max_redirects > 0:
+                url = urllib.parse.urljoin(url, resp.getheader("Location"))
+                max_redirects -= 1
+                if resp.status == 303: method, data = "GET", None
+                continue
+
+            if resp.status in RETRY_STATUSES and attempt < self.retries:
+                attempt += 1
+                delay = self.backoff * (2 ** (attempt - 1))
+                try: delay = max(delay, float(resp.getheader("Retry-After")))
+                except (TypeError, ValueError): pass
+                time.sleep(min(delay, 60))
+                continue
+
+            return Response(resp.status, resp.headers, body, url)
+
+    def get(self, url, headers=None, timeout=None):
+        return self.request("GET", url, headers=headers, timeout=timeout)
+
+    def post_form(self, url, form, headers=None, timeout=None):
+        h = {"Content-Type": "application/x-www-form-urlencoded"}
+        if headers: h.update(headers)
+        return self.request("POST", url, data=urllib.parse.urlencode(form).encode(), headers=h, timeout=timeout)
+
+    def download(self, url, path, timeout=None):
+        """Fetches url into path, raising HttpError on a non-2xx response."""
+        resp = self.get(url, timeout=timeout).raise_for_status()
+        with open(path, "wb") as f: f.write(resp.body)
+        return len(resp.body)
+
+
+def _decode(body, encoding):
+    if encoding == "gzip": return gzip.decompress(body)
+    if encoding == "deflate":
+        # Meant to be zlib-wrapped, but some servers send raw deflate
+        try: return zlib.decompress(body)
+        except zlib.error: return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide client shared by every Steam request."""
+    global _shared
+    with _shared_lock:
+        if _shared is None: _shared = HttpClient()
+        return _shared
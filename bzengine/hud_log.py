@@ -0,0 +1,61 @@
+import logging
+import logging.handlers
+import os
+import threading
+from collections import deque
+
+HUD_LOG_FILE = "bz_mod_hud.log"
+
+
+class HudLog:
+    """HUD history: the last max_lines entries in memory plus every entry in a rotating file.
+
+    Entries are (timestamp, message, tag) tuples. The widget only ever shows
+    what the ring buffer holds; export() stitches the rotated files back
+    together for the full session history.
+    """
+
+    def __init__(self, max_lines=1000, path=HUD_LOG_FILE, max_bytes=1024 * 1024, backups=5):
+        self.lines = deque(maxlen=max(1, int(max_lines)))
+        self.path = path
+        self._lock = threading.Lock()
+        self._handler = None
+        try:
+            self._handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True)
+            self._handler.setFormatter(logging.Formatter("%(message)s"))
+        except OSError:
+            pass
+        self._logger = logging.getLogger(f"bzengine.hud.{id(self)}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        if self._handler: self._logger.addHandler(self._handler)
+
+    def append(self, entries):
+        with self._lock:
+            for ts, message, tag in entries:
+                self._logger.info(f"{ts}{'[' + tag.upper() + '] ' if tag else ''}{message}")
+                self.lines.append((ts, message, tag))
+
+    def clear(self):
+        with self._lock: self.lines.clear()
+
+    def export(self, dest):
+        """Writes the full on-disk history (oldest rotation first) to dest. Returns lines written."""
+        with self._lock:
+            if self._handler: self._handler.flush()
+            backups = self._handler.backupCount if self._handler else 0
+            sources = [f"{self.path}.{i}" for i in range(backups, 0, -1)] + [self.path]
+            count = 0
+            with open(dest, 'w', encoding='utf-8') as out:
+                for src in sources:
+                    if not os.path.exists(src): continue
+                    with open(src, 'r', encoding='utf-8', errors='replace') as f:
+                        for line in f:
+                            out.write(line)
+                            count += 1
+            return count
+
+    def close(self):
+        if self._handler:
+            self._logger.removeHandler(self._handler)
+            self._handler.close()
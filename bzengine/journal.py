@@ -0,0 +1,285 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .deploy import link_mod, remove_mod
+from .sync import sync_tree
+
+JOURNAL_DIR = "bz_journal"
+# Hidden work folder created next to the folder being changed (same filesystem, so renames are atomic)
+WORK_DIRNAME = ".bztxn"
+
+
+def op_link(mid, src, dst, mode="link"):
+    """Deploys the cache folder src as dst (link, hardlink, reflink or copy)."""
+    return {"op": "link", "mid": str(mid), "src": os.path.abspath(src), "dst": os.path.abspath(dst), "mode": mode}
+
+
+def op_unlink(mid, dst):
+    """Removes a deployed mod from the game folder; the cache is untouched."""
+    return {"op": "unlink", "mid": str(mid), "dst": os.path.abspath(dst)}
+
+
+def op_delete(mid, path):
+    """Deletes a mod folder from the Workshop cache."""
+    return {"op": "delete", "mid": str(mid), "dst": os.path.abspath(path)}
+
+
+class BatchResult:
+    def __init__(self):
+        self.done = []
+        self.failed = {}
+        self.cancelled = False
+
+
+class _Transaction:
+    """One journal file: a header with every operation, then one line per state change.
+
+    States: pending -> staged (link built in the work folder) or moved (entry
+    renamed into the work folder) -> done, or failed. A "commit" line marks
+    the point after which the batch is only ever rolled forward.
+    """
+
+    def __init__(self, path, txid, ops, states=None, committed=False):
+        self.path = path
+        self.txid = txid
+        self.ops = ops
+        self.states = states or ["pending"] * len(ops)
+        self.committed = committed
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, root, ops):
+        os.makedirs(root, exist_ok=True)
+        txid = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        ops = [dict(op) for op in ops]
+        for i, op in enumerate(ops):
+            op["work"] = os.path.join(os.path.dirname(os.path.dirname(op["dst"])), WORK_DIRNAME, txid, f"{i}-{op['mid']}")
+        tx = cls(os.path.join(root, f"{txid}.jsonl"), txid, ops)
+        tmp = tx.path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"tx": txid, "created": time.time(), "ops": ops}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, tx.path)
+        return tx
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        header = json.loads(lines[0])
+        tx = cls(path, header["tx"], header["ops"])
+        for line in lines[1:]:
+            try: rec = json.loads(line)
+            except ValueError: break  # Torn last line from a crash
+            if rec.get("commit"): tx.committed = True
+            elif "i" in rec: tx.states[rec["i"]] = rec["state"]
+        return tx
+
+    def _append(self, rec):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(rec) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, i, state, error=None):
+        with self._lock:
+            self.states[i] = state
+            rec = {"i": i, "state": state}
+            if error: rec["error"] = error
+            self._append(rec)
+
+    def commit(self):
+        with self._lock:
+            self.committed = True
+            self._append({"commit": True})
+
+    def close(self):
+        """Deletes the journal and the work folders, which are empty by now.
+
+        Anything still in a work folder (a rename back that failed) is left
+        there rather than deleted, so no mod data is ever lost.
+        """
+        for work_root in {os.path.dirname(op["work"]) for op in self.ops}:
+            for path in (work_root, os.path.dirname(work_root)):
+                try: os.rmdir(path)
+                except OSError: break
+        try: os.remove(self.path)
+        except OSError: pass
+
+
+class Journal:
+    """Write-ahead journal for batches of link / unlink / delete operations on mod folders.
+
+    A batch first prepares every operation where nobody looks: removals are
+    renamed into a hidden .bztxn folder next to their target (one atomic
+    rename, so the game never sees a half-deleted mod) and links or copies are
+    built there, in parallel. Cancelling during that phase renames everything
+    back. Once all items are prepared a commit record is written, staged
+    items are renamed into place and the renamed-away folders are deleted, in
+    parallel. Every step is logged before the next one starts, so after a
+    crash recover() can finish the batch or undo it.
+    """
+
+    def __init__(self, root=JOURNAL_DIR, max_workers=4):
+        self.root = root
+        self.max_workers = max(1, max_workers)
+
+    def pending(self):
+        """Journal files of batches that never finished."""
+        try:
+            return sorted(os.path.join(self.root, n) for n in os.listdir(self.root) if n.endswith(".jsonl"))
+        except OSError:
+            return []
+
+    def run(self, ops, stop_event=None, on_item=None, **sync_options):
+        """Applies ops as one batch; on_item(mid, op, error) after each item that changed or failed.
+
+        Items already in the wanted state are skipped silently. Returns BatchResult.
+        """
+        result = BatchResult()
+        if not ops: return result
+        tx = _Transaction.create(self.root, ops)
+        sync_options["stop_event"] = stop_event
+
+        def report(i, error=None):
+            op = tx.ops[i]
+            if error: result.failed[op["mid"]] = error
+            else: result.done.append(op["mid"])
+            if on_item: on_item(op["mid"], op["op"], error)
+
+        # Phase 1: removals are quick renames; builds run on the pool
+        for i, op in enumerate(tx.ops):
+            if op["op"] == "link" or (stop_event is not None and stop_event.is_set()): continue
+            self._prepare(tx, i, sync_options, report)
+        builds = [i for i, op in enumerate(tx.ops) if op["op"] == "link"]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(lambda i: None if stop_event is not None and stop_event.is_set()
+                          else self._prepare(tx, i, sync_options, report), builds))
+
+        if stop_event is not None and stop_event.is_set():
+            self._rollback(tx)
+            tx.close()
+            result.cancelled = True
+            result.done = []
+            return result
+
+        tx.commit()
+        self._finish(tx, report)
+        tx.close()
+        return result
+
+    def _prepare(self, tx, i, sync_options, report):
+        op = tx.ops[i]
+        work, dst = op["work"], op["dst"]
+        try:
+            os.makedirs(os.path.dirname(work), exist_ok=True)
+            if op["op"] == "link":
+                if os.path.lexists(dst):
+                    tx.record(i, "done")
+                    return
+                if op["mode"] == "link":
+                    link_mod(op["src"], work)
+                else:
+                    stats = sync_tree(op["src"], work, method=op["mode"], **sync_options)
+                    if stats.errors: raise OSError(stats.errors[0])
+                    stop_event = sync_options.get("stop_event")
+                    if stop_event is not None and stop_event.is_set(): return
+                tx.record(i, "staged")
+            else:
+                if not os.path.lexists(dst):
+                    tx.record(i, "done")
+                    return
+                os.rename(dst, work)
+                tx.record(i, "moved")
+        except Exception as e:
+            self._discard(work)
+            tx.record(i, "failed", str(e))
+            report(i, str(e))
+
+    def _finish(self, tx, report=None):
+        """Roll-forward half of a committed batch: renames staged items in, deletes moved ones."""
+        for i, op in enumerate(tx.ops):
+            if tx.states[i] != "staged": continue
+            try:
+                if os.path.lexists(op["dst"]): raise OSError(f"{op['dst']} appeared during the batch")
+                os.makedirs(os.path.dirname(op["dst"]), exist_ok=True)
+                os.rename(op["work"], op["dst"])
+                tx.record(i, "done")
+                if report: report(i)
+            except OSError as e:
+                self._discard(op["work"])
+                tx.record(i, "failed", str(e))
+                if report: report(i, str(e))
+
+        def delete(i):
+            self._discard(tx.ops[i]["work"])
+            tx.record(i, "done")
+            if report: report(i)
+        moved = [i for i, state in enumerate(tx.states) if state == "moved"]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            list(pool.map(delete, moved))
+
+    def _rollback(self, tx):
+        """Undoes an uncommitted batch: moved items are renamed back and anything built is dropped.
+
+        Nothing is live before the commit, so this restores the folders exactly.
+        """
+        for op in reversed(tx.ops):
+            try:
+                if op["op"] == "link":
+                    self._discard(op["work"])
+                elif os.path.lexists(op["work"]) and not os.path.lexists(op["dst"]):
+                    os.rename(op["work"], op["dst"])
+            except OSError: pass
+
+    @staticmethod
+    def _discard(path):
+        try:
+            if os.path.lexists(path): remove_mod(path)
+        except OSError:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def recover(self, rollback=False):
+        """Finishes (or with rollback=True undoes) every interrupted batch; returns [(txid, action)].
+
+        Batches that had already committed are always finished, since some of
+        their items may be live and their removed folders half deleted.
+        """
+        recovered = []
+        for path in self.pending():
+            try: tx = _Transaction.load(path)
+            except (OSError, ValueError, IndexError, KeyError):
+                os.remove(path)
+                continue
+            self._reconcile(tx)
+            if rollback and not tx.committed:
+                self._rollback(tx)
+                recovered.append((tx.txid, "rolled back"))
+            else:
+                # Replay: prepare whatever never started, then commit and finish
+                for i, op in enumerate(tx.ops):
+                    if tx.states[i] == "pending": self._prepare(tx, i, {}, lambda i, e=None: None)
+                if not tx.committed: tx.commit()
+                self._finish(tx)
+                recovered.append((tx.txid, "replayed"))
+            tx.close()
+        return recovered
+
+    @staticmethod
+    def _reconcile(tx):
+        """Fixes states for steps that happened on disk after the last journal write."""
+        for i, op in enumerate(tx.ops):
+            state = tx.states[i]
+            if op["op"] == "link":
+                if state == "staged" and not os.path.lexists(op["work"]) and os.path.lexists(op["dst"]):
+                    tx.states[i] = "done"
+                elif state == "pending" and os.path.lexists(op["work"]):
+                    Journal._discard(op["work"])  # Build interrupted half-way; redo it
+            elif state == "pending" and os.path.lexists(op["work"]) and not os.path.lexists(op["dst"]):
+                tx.states[i] = "moved"
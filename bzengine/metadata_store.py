@@ -0,0 +1,119 @@
+import json
+import os
+import threading
+import time
+
+METADATA_FILE = "bz_mod_metadata.json"
+DEFAULT_TTL = 6 * 60 * 60
+
+
+class MetadataStore:
+    """Persistent Workshop metadata keyed by mod ID.
+
+    Each entry holds the title, remote update time, thumbnail URL, app ID and
+    dependencies, plus the HTTP validators (ETag / Last-Modified) from the last
+    fetch so stale entries can be revalidated with a conditional request.
+    """
+
+    FIELDS = ("title", "remote_date", "time_updated", "time_source", "thumb_url", "appid", "deps", "manifest")
+
+    def __init__(self, path=METADATA_FILE, ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._save_timer = None
+        self._dirty = False
+        self._data = self._load()
+        self.generation = 0
+
+    def _load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict): return data.get("mods", {})
+            except: pass
+        return {}
+
+    def get(self, mid):
+        with self._lock:
+            entry = self._data.get(str(mid))
+            return dict(entry) if entry else None
+
+    def items(self):
+        """Snapshot of (mod_id, entry) pairs."""
+        with self._lock:
+            return [(mid, dict(entry)) for mid, entry in self._data.items()]
+
+    def is_fresh(self, mid):
+        entry = self.get(mid)
+        return bool(entry) and time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def validators(self, mid):
+        """Request headers for a conditional re-fetch of a cached item."""
+        entry = self.get(mid) or {}
+        headers = {}
+        if entry.get("etag"): headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"): headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def update(self, mid, **fields):
+        with self._lock:
+            entry = self._data.setdefault(str(mid), {})
+            entry.update(fields)
+            entry["fetched_at"] = time.time()
+            self.generation += 1
+            self._dirty = True
+        self.schedule_save()
+
+    def touch(self, mid, **stamps):
+        """Marks a cached entry as revalidated (HTTP 304): refreshes fetched_at and the given timestamps.
+
+        The contents are unchanged, so unlike update() this does not bump
+        generation and derived indexes (reverse dependencies) stay valid.
+        """
+        with self._lock:
+            entry = self._data.get(str(mid))
+            if entry is None: return
+            entry.update(stamps)
+            entry["fetched_at"] = time.time()
+            self._dirty = True
+        self.schedule_save()
+
+    def remove(self, mid):
+        with self._lock:
+            if self._data.pop(str(mid), None) is None: return
+            self.generation += 1
+            self._dirty = True
+        self.schedule_save()
+
+    def schedule_save(self, delay=2.0):
+        # Coalesce the burst of updates from a metadata refresh into one write
+        with self._lock:
+            if self._save_timer: return
+            self._save_timer = threading.Timer(delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Writes pending changes now instead of waiting for the debounce timer; call at exit."""
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty: return
+        self.save()
+
+    def save(self):
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._dirty = False
+            payload = json.dumps({"version": 1, "mods": self._data}, indent=1)
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f: f.write(payload)
+            os.replace(tmp, self.path)
+        except OSError:
+            with self._lock: self._dirty = True
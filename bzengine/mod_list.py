@@ -0,0 +1,169 @@
+class ModRow:
+    __slots__ = ("mid", "seq", "values", "tags", "enabled", "m_time", "sort_keys", "search")
+
+    def __init__(self, mid, seq, values, tags, enabled, m_time):
+        self.mid = mid
+        self.seq = seq
+        self.values = values
+        self.tags = tags
+        self.enabled = enabled
+        self.m_time = m_time
+        self.sort_keys = None
+        self.search = ""
+
+
+def _sort_key(value):
+    # Numbers sort numerically, everything else case-insensitively after them
+    text = str(value)
+    return (0, int(text), "") if text.isdigit() else (1, 0, text.casefold())
+
+
+class ModListModel:
+    """In-memory model behind the Manage list: rows keyed by mod ID plus the current view.
+
+    Every row keeps precomputed sort keys and a lower-cased search string, and
+    rows are indexed by tag ("active", "inactive", "update_needed") so the
+    category filters never scan the whole list. view() returns the filtered,
+    sorted mod IDs and is rebuilt lazily, at most once per change batch;
+    index_of() is an O(1) lookup into it. The selection is kept here rather
+    than in the widget, which only ever holds the visible window.
+    """
+
+    CATEGORIES = {"all": None, "enabled": "active", "disabled": "inactive", "outdated": "update_needed"}
+    SEARCH_COLUMNS = ("Name", "ID", "Status")
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        self._search_idx = [self._col_index[c] for c in self.SEARCH_COLUMNS if c in self._col_index]
+        self.rows = {}
+        self.by_tag = {}
+        self.selection = set()
+        self.sort = None
+        self.query = ()
+        self.category = "all"
+        self._view = []
+        self._pos = {}
+        self._dirty = True
+        self._seq = 0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, mid):
+        return mid in self.rows
+
+    def get(self, mid):
+        return self.rows.get(mid)
+
+    # --- row changes ---
+
+    def insert(self, mid, values, tags=(), enabled=False, m_time=0):
+        row = self.rows.get(mid)
+        if row: self._untag(row)
+        self._seq += 1
+        row = self.rows[mid] = ModRow(mid, self._seq, list(values), list(tags), enabled, m_time)
+        self._index(row)
+        self._tag(row)
+        self._dirty = True
+        return row
+
+    def remove(self, mid):
+        row = self.rows.pop(mid, None)
+        if not row: return False
+        self._untag(row)
+        self.selection.discard(mid)
+        self._dirty = True
+        return True
+
+    def set_cells(self, mid, cells):
+        """Updates cells by column name; returns True if anything changed."""
+        row = self.rows.get(mid)
+        if not row: return False
+        changed = False
+        for col, value in cells.items():
+            i = self._col_index[col]
+            if row.values[i] != value:
+                row.values[i] = value
+                changed = True
+        if changed:
+            self._index(row)
+            # Only a change to the sort column or a searched column can move the row
+            if self.query or (self.sort and self.sort[0] in cells): self._dirty = True
+        return changed
+
+    def set_tags(self, mid, tags):
+        row = self.rows.get(mid)
+        if not row or list(tags) == row.tags: return False
+        self._untag(row)
+        row.tags = list(tags)
+        self._tag(row)
+        if self.category != "all": self._dirty = True
+        return True
+
+    def add_tags(self, mid, tags):
+        row = self.rows.get(mid)
+        if not row: return False
+        return self.set_tags(mid, row.tags + [t for t in tags if t not in row.tags])
+
+    def tagged(self, tag):
+        return set(self.by_tag.get(tag, ()))
+
+    def _index(self, row):
+        row.sort_keys = tuple(_sort_key(v) for v in row.values)
+        row.search = "\0".join(str(row.values[i]) for i in self._search_idx).casefold()
+
+    def _tag(self, row):
+        for t in row.tags: self.by_tag.setdefault(t, set()).add(row.mid)
+
+    def _untag(self, row):
+        for t in row.tags: self.by_tag.get(t, set()).discard(row.mid)
+
+    # --- view ---
+
+    def set_sort(self, col, reverse=False):
+        self.sort = (col, reverse)
+        self._dirty = True
+
+    def set_filter(self, text="", category="all"):
+        query = tuple(text.casefold().split())
+        if query == self.query and category == self.category: return False
+        self.query, self.category = query, category
+        self._dirty = True
+        return True
+
+    def view(self):
+        if self._dirty:
+            tag = self.CATEGORIES.get(self.category)
+            mids = self.by_tag.get(tag, set()) if tag else self.rows.keys()
+            rows = [self.rows[m] for m in mids]
+            if self.query:
+                rows = [r for r in rows if all(q in r.search for q in self.query)]
+            if self.sort:
+                i = self._col_index[self.sort[0]]
+                rows.sort(key=lambda r: r.sort_keys[i], reverse=self.sort[1])
+            elif tag:
+                rows.sort(key=lambda r: r.seq)
+            self._view = [r.mid for r in rows]
+            self._pos = {mid: n for n, mid in enumerate(self._view)}
+            self._dirty = False
+        return self._view
+
+    def index_of(self, mid):
+        self.view()
+        return self._pos.get(mid)
+
+    def select_range(self, a, b):
+        """Selects the view rows between mod IDs a and b (inclusive)."""
+        view = self.view()
+        i, j = self._pos.get(a), self._pos.get(b)
+        if i is None or j is None: return
+        if i > j: i, j = j, i
+        self.selection = set(view[i:j + 1])
+
+    def selected(self):
+        """Selected mod IDs in view order (selected rows hidden by the filter come last)."""
+        self.view()
+        shown = sorted((m for m in self.selection if m in self._pos), key=self._pos.get)
+        hidden = sorted(m for m in self.selection if m not in self._pos)
+        return shown + hidden
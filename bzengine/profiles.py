@@ -0,0 +1,64 @@
+import os
+from collections import namedtuple
+
+from .journal import Journal, op_link, op_unlink
+from .scanner import CacheScanner
+
+# enable: cached mods to link; disable: deployed mods to remove; missing: wanted but not in the cache
+ProfilePlan = namedtuple("ProfilePlan", "enable disable missing")
+
+
+class Profiles:
+    """Named sets of enabled mod IDs per game, stored in the config as
+    {"profiles": {<game key>: {<name>: [mod ids]}}} so they can also be edited by hand."""
+
+    def __init__(self, config):
+        self.config = config
+
+    def _game(self, game_key, create=False):
+        profiles = self.config.get("profiles")
+        if not isinstance(profiles, dict):
+            if not create: return {}
+            profiles = self.config["profiles"] = {}
+        game = profiles.get(game_key)
+        if not isinstance(game, dict):
+            if not create: return {}
+            game = profiles[game_key] = {}
+        return game
+
+    def names(self, game_key):
+        return sorted(self._game(game_key), key=str.casefold)
+
+    def get(self, game_key, name):
+        """The profile's mod IDs, or None if there is no such profile."""
+        ids = self._game(game_key).get(name)
+        return None if ids is None else [str(m) for m in ids]
+
+    def save(self, game_key, name, mod_ids):
+        self._game(game_key, create=True)[name] = sorted({str(m) for m in mod_ids}, key=lambda m: (len(m), m))
+
+    def delete(self, game_key, name):
+        return self._game(game_key).pop(name, None) is not None
+
+
+def deployed_mods(mods_dir):
+    """Mod IDs currently present in the game mods folder (links or copies)."""
+    return {name for name in CacheScanner.scan_links(mods_dir) if name.isdigit()}
+
+
+def plan_profile(wanted, deployed, cached):
+    """Minimal set of operations that turns the deployed set into wanted; mods in both are left alone."""
+    wanted = {str(m) for m in wanted}
+    enable = wanted - deployed
+    return ProfilePlan(enable=sorted(enable & cached), disable=sorted(deployed - wanted),
+                       missing=sorted(enable - cached))
+
+
+def apply_plan(plan, content_dir, mods_dir, mode="link", journal=None, on_item=None, **sync_options):
+    """Runs a ProfilePlan as one journaled batch, removals first; on_item(mod_id, op, error) after each.
+
+    sync_options go to deploy for physical modes. Returns the journal's BatchResult.
+    """
+    ops = [op_unlink(mid, os.path.join(mods_dir, mid)) for mid in plan.disable]
+    ops += [op_link(mid, os.path.join(content_dir, mid), os.path.join(mods_dir, mid), mode) for mid in plan.enable]
+    return (journal or Journal()).run(ops, on_item=on_item, **sync_options)
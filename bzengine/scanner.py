@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+
+SCAN_INDEX_FILE = "bz_scan_index.json"
+
+
+class CacheScanner:
+    """Scans the workshop content folder and the game mods folder with os.scandir.
+
+    The per-mod folder mtimes of each content directory are persisted together
+    with that directory's own mtime; while the directory is unchanged (no mod
+    added or removed) the stored listing is reused without touching the disk.
+    """
+
+    def __init__(self, index_path=SCAN_INDEX_FILE):
+        self.index_path = index_path
+        self._lock = threading.Lock()
+        self._index = {}
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except: self._index = {}
+
+    def scan(self, content_dir, game_mods_dir):
+        """Returns [(mod_id, is_enabled, folder_mtime)]; raises OSError if content_dir is unreadable."""
+        mods = self.scan_content(content_dir)
+        linked = self.scan_links(game_mods_dir)
+        return [(mid, mid in linked, m_time) for mid, m_time in mods.items()]
+
+    def scan_content(self, content_dir):
+        key = os.path.normcase(os.path.abspath(content_dir))
+        dir_mtime = os.stat(content_dir).st_mtime_ns
+        with self._lock:
+            cached = self._index.get(key)
+            if cached and cached.get("dir_mtime_ns") == dir_mtime:
+                return dict(cached["mods"])
+
+        # DirEntry caches is_dir(); stat() reuses the directory listing on Windows
+        mods = {}
+        with os.scandir(content_dir) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(): mods[entry.name] = entry.stat().st_mtime
+                except OSError: pass
+
+        with self._lock:
+            self._index[key] = {"dir_mtime_ns": dir_mtime, "mods": mods}
+        self.save()
+        return dict(mods)
+
+    @staticmethod
+    def scan_links(game_mods_dir):
+        """Names present in the game mods folder, including dangling links (like os.path.lexists)."""
+        try:
+            with os.scandir(game_mods_dir) as it:
+                return {entry.name for entry in it}
+        except OSError:
+            return set()
+
+    def invalidate(self, content_dir=None):
+        """Forgets the stored listing for one content directory (or all of them)."""
+        with self._lock:
+            if content_dir is None: self._index.clear()
+            else: self._index.pop(os.path.normcase(os.path.abspath(content_dir)), None)
+        self.save()
+
+    def save(self):
+        with self._lock:
+            payload = json.dumps(self._index)
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f: f.write(payload)
+            os.replace(tmp, self.index_path)
+        except OSError: pass
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import time
+
+# Set in the environment of a benchmark run: the GUI prints its milestones as JSON and quits
+BENCH_ENV = "BZ_STARTUP_BENCH"
+BASELINE_FILE = "bz_startup_baseline.json"
+MILESTONES = ("imports", "ui_built", "first_paint", "interactive")
+# Marked when each piece of deferred startup work begins; all of them must come after first_paint
+DEFERRED = ("detection", "icons", "engine_check")
+
+
+class StartupTimer:
+    """Milestones of one GUI start in milliseconds since t0 (taken as cmd.py starts executing).
+
+    imports: modules loaded; ui_built: widgets created; first_paint: the
+    window is mapped and drawn; interactive: path detection and engine
+    checks have finished and their results are on screen. The DEFERRED
+    marks record when path detection, icon loading and the engine checks
+    began.
+    """
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = {}
+
+    def mark(self, name):
+        """Records name once and returns its time."""
+        if name not in self.marks: self.marks[name] = round((time.perf_counter() - self.t0) * 1000, 1)
+        return self.marks[name]
+
+    def summary(self):
+        return ", ".join(f"{name.replace('_', ' ')} {ms:.0f} ms" for name, ms in self.marks.items())
+
+
+def painted_first(marks):
+    """Deferred steps that started before the window was painted (or that have no first_paint to compare with)."""
+    paint = marks.get("first_paint")
+    return [name for name in DEFERRED if name in marks and (paint is None or marks[name] < paint)]
+
+
+def run_once(script, timeout=60, cwd=None):
+    """Starts the GUI in benchmark mode and returns its milestones (cwd holds the config and caches it uses)."""
+    import subprocess
+    env = dict(os.environ, **{BENCH_ENV: "1"})
+    proc = subprocess.run([sys.executable, os.path.abspath(script)], env=env, capture_output=True, text=True,
+                          timeout=timeout, cwd=cwd)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"): return json.loads(line)
+    raise RuntimeError(f"no startup timings reported (exit {proc.returncode}): {proc.stderr.strip()[-500:]}")
+
+
+def benchmark(script, runs=5, timeout=60, cwd=None):
+    """Median of each milestone over runs starts."""
+    import statistics
+    samples = [run_once(script, timeout, cwd) for _ in range(runs)]
+    return {name: round(statistics.median(s[name] for s in samples if name in s), 1)
+            for name in MILESTONES if any(name in s for s in samples)}
+
+
+# Executes the GUI script's module body (its imports) without starting Tk, so it needs no display
+_IMPORT_PROBE = """import json, runpy, sys, time
+sys.path.append({root!r})
+g = runpy.run_path({script!r}, run_name="bz_import_probe")
+print(json.dumps({{"module_import": (time.perf_counter() - g["STARTUP_T0"]) * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+
+def import_probe(script, timeout=60):
+    """Time (ms) from STARTUP_T0 to the end of the script's imports, and the modules loaded by then."""
+    import subprocess
+    script = os.path.abspath(script)
+    code = _IMPORT_PROBE.format(root=os.path.dirname(script), script=script)
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=timeout)
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"): return json.loads(line)
+    raise RuntimeError(f"import probe failed (exit {proc.returncode}): {proc.stderr.strip()[-500:]}")
+
+
+def benchmark_imports(script, runs=5, timeout=60):
+    """Median module_import time over runs fresh interpreters; headless."""
+    import statistics
+    return {"module_import": round(statistics.median(import_probe(script, timeout)["module_import"] for _ in range(runs)), 1)}
+
+
+def regressions(result, baseline, tolerance=0.2, min_ms=50):
+    """Milestones slower than baseline by more than tolerance (fraction) and min_ms: {name: (baseline, now)}."""
+    slow = {}
+    for name, base in baseline.items():
+        now = result.get(name)
+        if now is not None and now > base * (1 + tolerance) and now - base > min_ms: slow[name] = (base, now)
+    return slow
+
+
+if __name__ == "__main__":
+    # Startup regression benchmark: python -m bzengine.startup [cmd.py] [--runs N] [--save]
+    import argparse
+    ap = argparse.ArgumentParser(description="Measure GUI time-to-first-paint and time-to-interactive.")
+    ap.add_argument("script", nargs="?", default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cmd.py"))
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--baseline", default=BASELINE_FILE, help="JSON file with the reference timings")
+    ap.add_argument("--save", action="store_true", help="store this result as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown as a fraction (default 0.2)")
+    ap.add_argument("--imports-only", action="store_true", help="only time the module imports (no display needed)")
+    args = ap.parse_args()
+
+    result = benchmark_imports(args.script, args.runs)
+    if not args.imports_only: result.update(benchmark(args.script, args.runs))
+    for name, ms in result.items(): print(f"{name:>12}: {ms:8.1f} ms")
+    if args.save:
+        try:
+            with open(args.baseline, 'r') as f: saved = json.load(f)
+        except (OSError, ValueError): saved = {}
+        # --imports-only refreshes module_import and keeps the GUI milestones recorded earlier
+        saved.update(result)
+        with open(args.baseline, 'w') as f: json.dump(saved, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        sys.exit(0)
+    try:
+        with open(args.baseline, 'r') as f: baseline = json.load(f)
+    except (OSError, ValueError):
+        print("No baseline yet; run with --save to record one.")
+        sys.exit(0)
+    slow = regressions(result, baseline, args.tolerance)
+    for name, (base, now) in slow.items(): print(f"REGRESSION {name}: {base:.1f} ms -> {now:.1f} ms")
+    sys.exit(1 if slow else 0)
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from .http_client import get_client
+
+PUBLISHED_FILE_DETAILS_URL = "https://api.steampowered.com/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+BATCH_SIZE = 100
+
+
+def details_to_meta(d):
+    """Maps one publishedfiledetails record onto the metadata store fields."""
+    ts = d.get("time_updated") or None
+    return {
+        "title": d.get("title") or None,
+        "time_updated": ts,
+        "time_source": "api",
+        "remote_date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "Unknown",
+        "thumb_url": d.get("preview_url") or None,
+        "appid": str(d["consumer_app_id"]) if d.get("consumer_app_id") else None,
+        "file_size": int(d.get("file_size") or 0),
+        "manifest": str(d["hcontent_file"]) if d.get("hcontent_file") else None,
+    }
+
+
+def get_published_file_details(mod_ids, url=PUBLISHED_FILE_DETAILS_URL, batch_size=BATCH_SIZE, timeout=None, on_error=None, client=None):
+    """Resolves Workshop metadata for many mods with one POST per batch_size IDs.
+
+    Returns {mod_id: meta} for every item the API answered with result 1.
+    IDs that are missing, hidden or in a failed chunk are left out so the
+    caller can fall back to scraping the Workshop page for them.
+    """
+    client = client or get_client()
+    ids = [str(m) for m in dict.fromkeys(mod_ids)]
+    results = {}
+    for i in range(0, len(ids), batch_size):
+        chunk = ids[i:i + batch_size]
+        form = {"itemcount": len(chunk)}
+        for n, mid in enumerate(chunk):
+            form[f"publishedfileids[{n}]"] = mid
+        try:
+            payload = client.post_form(url, form, timeout=timeout).raise_for_status().json()
+        except Exception as e:
+            if on_error: on_error(chunk, e)
+            continue
+
+        for d in payload.get("response", {}).get("publishedfiledetails", []):
+            if d.get("result") != 1 or not d.get("publishedfileid"): continue
+            results[str(d["publishedfileid"])] = details_to_meta(d)
+    return results
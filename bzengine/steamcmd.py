@@ -0,0 +1,329 @@
+import codecs
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from collections import namedtuple
+
+PROMPT = "Steam>"
+STEAMCMD_URL = "https://steamcdn-a.akamaihd.net/client/installer/steamcmd.zip"
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+class SteamCmdError(Exception):
+    pass
+
+
+class _Prompt:
+    pass
+
+
+# --- OUTPUT PARSING ---
+
+# kind: progress | item_success | item_failure | verify | login | activity | error | state | line
+SteamCmdEvent = namedtuple("SteamCmdEvent", "kind text mod_id value")
+
+_PROGRESS_RE = re.compile(r'progress:\s*(\d+\.\d+)')
+_SUCCESS_RE = re.compile(r'Success\. Downloaded item (\d+)')
+_FAILURE_RE = re.compile(r'ERROR! Download item (\d+) failed \((.*)\)')
+_LOGIN_RE = re.compile(r"Logging in user '([^']*)'.*?(OK|FAILED)|Waiting for user info\.\.\.(OK|FAILED)|FAILED (?:login|to log ?in)")
+
+
+class SteamCmdParser:
+    """Turns SteamCMD output lines into SteamCmdEvents.
+
+    Cheap substring checks gate every precompiled regex so the common
+    progress/noise lines cost one or two `in` tests each.
+    """
+
+    def feed(self, line):
+        """Returns the event for one line, or None for blank lines."""
+        clean = line.strip()
+        if not clean: return None
+        if "progress:" in clean:
+            m = _PROGRESS_RE.search(clean)
+            if m: return SteamCmdEvent("progress", clean, None, float(m.group(1)))
+        if "Success." in clean:
+            m = _SUCCESS_RE.search(clean)
+            if m: return SteamCmdEvent("item_success", clean, m.group(1), None)
+        if "ERROR!" in clean:
+            m = _FAILURE_RE.search(clean)
+            if m: return SteamCmdEvent("item_failure", clean, m.group(1), m.group(2))
+        if "Logging in" in clean or "user info" in clean or "FAILED" in clean:
+            m = _LOGIN_RE.search(clean)
+            if m:
+                ok = "FAILED" not in clean
+                return SteamCmdEvent("login", clean, None, ok)
+        if "Verifying" in clean:
+            return SteamCmdEvent("verify", clean, None, None)
+        if "Error" in clean or "Failed" in clean:
+            return SteamCmdEvent("error", clean, None, None)
+        if "Update state" in clean:
+            return SteamCmdEvent("state", clean, None, None)
+        if "Downloading" in clean or "Extracting" in clean:
+            return SteamCmdEvent("activity", clean, None, None)
+        return SteamCmdEvent("line", clean, None, None)
+
+    def parse(self, lines):
+        for line in lines:
+            ev = self.feed(line)
+            if ev: yield ev
+
+
+class LineReader:
+    """Background reader that splits a pipe into lines for a queue.
+
+    Raw reads mean the Steam> prompt, which has no trailing newline, is
+    reported immediately as PROMPT. get(timeout) lets the consumer poll for
+    cancellation instead of blocking on readline().
+    """
+
+    PROMPT = _Prompt
+    EOF = None
+
+    def __init__(self, stream):
+        self._lines = queue.Queue()
+        self._stream = stream
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        fd = self._stream.fileno()
+        buf = ""
+        while True:
+            try: chunk = os.read(fd, 4096)
+            except OSError: chunk = b""
+            if not chunk: break
+            buf += decoder.decode(chunk)
+            buf = buf.replace("\r\n", "\n").replace("\r", "\n")
+            *complete, buf = buf.split("\n")
+            for line in complete: self._lines.put(line)
+            if buf.rstrip().endswith(PROMPT):
+                self._lines.put(_Prompt)
+                buf = ""
+        if buf: self._lines.put(buf)
+        self._lines.put(None)
+
+    def get(self, timeout=None):
+        """Next line, PROMPT or EOF; raises queue.Empty when nothing arrives within timeout."""
+        return self._lines.get(timeout=timeout)
+
+
+def replay(path, parser=None):
+    """Runs a recorded SteamCMD log through the parser, yielding its events."""
+    parser = parser or SteamCmdParser()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from parser.parse(f)
+
+
+def benchmark_replay(path, repeat=20):
+    """Parses a recorded log `repeat` times; returns (lines, seconds, lines_per_second)."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = f.read().splitlines()
+    parser = SteamCmdParser()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for line in lines: parser.feed(line)
+    secs = time.perf_counter() - start
+    total = len(lines) * repeat
+    return total, secs, total / secs if secs else 0.0
+
+
+class SteamCmdSession:
+    """A SteamCMD process that logs in once and then idles at its Steam> prompt.
+
+    Commands are written to stdin one at a time; a command is complete when
+    the prompt comes back. The process is shut down after idle_timeout
+    seconds without work and relaunched transparently on the next command,
+    including after a crash.
+    """
+
+    def __init__(self, exe, install_dir, idle_timeout=300, login_timeout=180):
+        self.exe = exe
+        self.install_dir = install_dir
+        self.idle_timeout = idle_timeout
+        self.login_timeout = login_timeout
+        self.proc = None
+        self._reader = None
+        self.parser = SteamCmdParser()
+        self._lock = threading.RLock()
+        self._idle_timer = None
+
+    def is_alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self, on_event=None, stop_event=None):
+        with self._lock:
+            if self.is_alive(): return
+            # force_install_dir has to come before login, so it is fixed for the life of the process
+            cmd = [self.exe, "+@ShutdownOnFailedCommand", "0", "+@NoPromptForPassword", "1",
+                   "+force_install_dir", self.install_dir, "+login", "anonymous"]
+            self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                         bufsize=0, creationflags=CREATE_NO_WINDOW)
+            self._reader = LineReader(self.proc.stdout)
+            events = self._wait_for_prompt(on_event, stop_event, self.login_timeout)
+            if any(ev.kind == "login" and not ev.value for ev in events):
+                self.kill()
+                raise SteamCmdError("SteamCMD anonymous login failed")
+
+    def _wait_for_prompt(self, on_event, stop_event, timeout=None):
+        collected = []
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            if stop_event is not None and stop_event.is_set():
+                self.kill()
+                raise SteamCmdError("Cancelled")
+            if deadline and time.monotonic() > deadline:
+                self.kill()
+                raise SteamCmdError("Timed out waiting for SteamCMD")
+            try: line = self._reader.get(timeout=0.1)
+            except queue.Empty: continue
+            if line is LineReader.PROMPT: return collected
+            if line is LineReader.EOF:
+                raise SteamCmdError(f"SteamCMD exited (code {self.proc.wait()})")
+            ev = self.parser.feed(line)
+            if ev is None: continue
+            collected.append(ev)
+            if on_event: on_event(ev)
+
+    def run(self, command, on_event=None, stop_event=None, timeout=None):
+        """Sends one command and returns its output events once the prompt reappears."""
+        with self._lock:
+            self._cancel_idle()
+            try:
+                self.start(on_event, stop_event)
+                self.proc.stdin.write((command + "\n").encode("utf-8"))
+                self.proc.stdin.flush()
+            except OSError as e:
+                self.kill()
+                raise SteamCmdError(f"SteamCMD pipe closed: {e}")
+            try:
+                return self._wait_for_prompt(on_event, stop_event, timeout)
+            finally:
+                self._arm_idle()
+
+    def download_items(self, appid, mod_ids, on_event=None, stop_event=None):
+        """Runs workshop_download_item for each ID; returns {mod_id: error or None}.
+
+        An item whose SteamCMD process died underneath it is retried once in a
+        fresh process.
+        """
+        results = {}
+        for mid in mod_ids:
+            if stop_event is not None and stop_event.is_set(): break
+            for attempt in (1, 2):
+                try:
+                    events = self.run(f"workshop_download_item {appid} {mid}", on_event, stop_event)
+                except SteamCmdError as e:
+                    if attempt == 2 or (stop_event is not None and stop_event.is_set()):
+                        results[mid] = str(e)
+                        break
+                    continue
+                results[mid] = self._item_error(mid, events)
+                break
+        return results
+
+    @staticmethod
+    def _item_error(mid, events):
+        for ev in events:
+            if ev.kind == "item_success" and ev.mod_id == str(mid): return None
+        for ev in events:
+            if ev.kind == "item_failure": return ev.value
+        return "No completion reported"
+
+    def _arm_idle(self):
+        if self.idle_timeout and self.is_alive():
+            self._idle_timer = threading.Timer(self.idle_timeout, self.close)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _cancel_idle(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def close(self):
+        """Asks SteamCMD to quit, killing it if it does not exit promptly."""
+        with self._lock:
+            self._cancel_idle()
+            if not self.is_alive(): return
+            try:
+                self.proc.stdin.write(b"quit\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=15)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+
+    def kill(self):
+        if self.proc is not None and self.proc.poll() is None:
+            try: self.proc.kill()
+            except OSError: pass
+
+    terminate = kill
+
+
+def force_english(exe):
+    """Pins SteamCMD's console language so the output parser's English patterns match."""
+    console_cfg = os.path.join(os.path.dirname(exe), "SteamConsole.txt")
+    if not os.path.exists(console_cfg):
+        with open(console_cfg, "w") as f:
+            f.write('@Language "english"\n')
+
+
+def install_steamcmd(target, client):
+    """Downloads and unpacks the SteamCMD bootstrapper into target's folder."""
+    target_dir = os.path.dirname(target)
+    os.makedirs(target_dir, exist_ok=True)
+    zip_p = os.path.join(target_dir, "sc.zip")
+    client.download(STEAMCMD_URL, zip_p, timeout=120)
+    with zipfile.ZipFile(zip_p, 'r') as z: z.extractall(target_dir)
+    os.remove(zip_p)
+    return target
+
+
+class SteamCmdSessions:
+    """Idle SteamCMD sessions kept for reuse, keyed by executable and install dir."""
+
+    def __init__(self, idle_timeout=300):
+        self.idle_timeout = idle_timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, exe, install_dir):
+        key = (os.path.normcase(os.path.abspath(exe)), os.path.normcase(os.path.abspath(install_dir)))
+        with self._lock:
+            # A pooled session that idled out simply relaunches on its next command
+            pool = self._idle.get(key)
+            if pool: return pool.pop()
+        return SteamCmdSession(exe, install_dir, idle_timeout=self.idle_timeout)
+
+    def release(self, session):
+        key = (os.path.normcase(os.path.abspath(session.exe)), os.path.normcase(os.path.abspath(session.install_dir)))
+        with self._lock:
+            self._idle.setdefault(key, []).append(session)
+
+    def close_all(self):
+        with self._lock:
+            sessions = [s for pool in self._idle.values() for s in pool]
+            self._idle.clear()
+        for s in sessions: s.close()
+
+
+if __name__ == "__main__":
+    # Replay / benchmark a recorded SteamCMD log: python -m bzengine.steamcmd <log> [--bench N]
+    import argparse
+    ap = argparse.ArgumentParser(description="Replay a recorded SteamCMD log through the output parser.")
+    ap.add_argument("log")
+    ap.add_argument("--bench", type=int, metavar="N", help="parse the log N times and report throughput")
+    args = ap.parse_args()
+    if args.bench:
+        total, secs, rate = benchmark_replay(args.log, args.bench)
+        print(f"{total} lines in {secs:.3f}s ({rate:,.0f} lines/s)")
+    else:
+        for ev in replay(args.log):
+            if ev.kind != "line": print(f"{ev.kind:<13} {ev.mod_id or '':<12} {'' if ev.value is None else ev.value}")
+    sys.exit(0)
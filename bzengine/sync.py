@@ -0,0 +1,263 @@
+import hashlib
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+TMP_SUFFIX = ".bzsync"
+# Ways to place a file: a real copy, a hardlink, or a copy-on-write clone (Linux FICLONE)
+METHODS = ("copy", "hardlink", "reflink")
+FICLONE = 0x40049409
+# FAT/exFAT store mtimes with 2 second resolution
+MTIME_TOLERANCE_NS = 2_000_000_000
+
+
+class SyncStats:
+    """Counters for one or more sync_tree runs."""
+
+    def __init__(self):
+        self.copied = 0
+        self.copied_bytes = 0
+        self.linked_bytes = 0
+        self.fallbacks = 0
+        self.cross_device = False
+        self.skipped = 0
+        self.skipped_bytes = 0
+        self.deleted = 0
+        self.errors = []
+        # Set when stop_event cut the run short; dst was then not (fully) updated
+        self.stopped = False
+        self._lock = threading.Lock()
+
+    def add(self, other):
+        with self._lock:
+            self.copied += other.copied
+            self.copied_bytes += other.copied_bytes
+            self.linked_bytes += other.linked_bytes
+            self.fallbacks += other.fallbacks
+            self.cross_device = self.cross_device or other.cross_device
+            self.skipped += other.skipped
+            self.skipped_bytes += other.skipped_bytes
+            self.deleted += other.deleted
+            self.errors.extend(other.errors)
+            self.stopped = self.stopped or other.stopped
+
+    @property
+    def ok(self):
+        return not self.errors and not self.stopped
+
+    def summary(self):
+        text = f"{self.copied} file(s) updated ({format_bytes(self.copied_bytes)} copied"
+        if self.linked_bytes: text += f", {format_bytes(self.linked_bytes)} linked"
+        text += f"), {self.deleted} removed, {format_bytes(self.skipped_bytes)} unchanged"
+        if self.cross_device: text += ", copied because the cache is on another drive"
+        elif self.fallbacks: text += f", {self.fallbacks} fell back to copying"
+        return text
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB": return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def is_link(path):
+    """True for symlinks and (on Windows) directory junctions."""
+    from .deploy import is_junction  # deploy imports this module
+    return os.path.islink(path) or is_junction(path)
+
+
+def _walk(root):
+    """Returns ({relpath: (size, mtime_ns, inode)}, {dir relpaths}) for everything under root."""
+    files, dirs = {}, set()
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        try:
+            with os.scandir(os.path.join(root, rel) if rel else root) as it:
+                for e in it:
+                    path = os.path.join(rel, e.name) if rel else e.name
+                    try:
+                        if e.is_dir(follow_symlinks=False):
+                            dirs.add(path)
+                            stack.append(path)
+                        else:
+                            st = e.stat(follow_symlinks=False)
+                            files[path] = (st.st_size, st.st_mtime_ns, e.inode())
+                    except OSError: pass
+        except OSError: pass
+    return files, dirs
+
+
+def file_hash(path, chunk=1024 * 1024):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b""): h.update(block)
+    return h.hexdigest()
+
+
+def _unchanged(src, dst, src_info, dst_info, verify_hash, method="copy"):
+    """True if dst needs no update; method None just compares contents (diff_tree)."""
+    if dst_info is None or src_info[0] != dst_info[0]: return False
+    same_inode = src_info[2] == dst_info[2]
+    # A hardlinked file is current only while it is still the cache's own inode (hardlink
+    # mode never crosses devices); a copy or reflink must not be one, e.g. after a mode switch
+    if method == "hardlink": return same_inode
+    if method is not None and same_inode and os.path.samefile(src, dst): return False
+    if abs(src_info[1] - dst_info[1]) > MTIME_TOLERANCE_NS: return False
+    return not verify_hash or file_hash(src) == file_hash(dst)
+
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
+
+
+def _place_file(src, dst, method="copy"):
+    """Writes src to dst via a temporary name and an atomic rename; returns the method that worked.
+
+    Hardlinks and reflinks fall back to a plain copy when the filesystem
+    refuses them (different device, unsupported, FAT, ...).
+    """
+    tmp = dst + TMP_SUFFIX
+    if os.path.lexists(tmp): os.remove(tmp)
+    if method in ("hardlink", "reflink"):
+        try:
+            if method == "hardlink": os.link(src, tmp)
+            else: _reflink(src, tmp)
+            os.replace(tmp, dst)
+            return method
+        except (OSError, ImportError):
+            if os.path.lexists(tmp): os.remove(tmp)
+    shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return "copy"
+
+
+def same_device(src, dst):
+    """True if dst (or its nearest existing parent) is on the same device as src."""
+    path = os.path.abspath(dst)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path: return False
+        path = parent
+    try: return os.stat(src).st_dev == os.stat(path).st_dev
+    except OSError: return False
+
+
+def sync_tree(src, dst, verify_hash=False, max_workers=4, stop_event=None, method="copy"):
+    """Makes dst an exact copy of src, copying only files whose size/mtime (or hash) differ.
+
+    Changed files are placed on a thread pool through a temporary name and an
+    atomic rename, as copies, hardlinks or reflinks (see METHODS); files and
+    folders missing from src are deleted. A dst that does not exist yet is
+    built in a staging folder and renamed into place (the staging folder is
+    removed instead on errors or a stop), and a dst that is a link
+    (from link mode) is replaced by a real folder without touching its target.
+    Link methods drop to copying up front when src and dst are on different
+    devices. Returns SyncStats.
+    """
+    stats = SyncStats()
+    if method != "copy" and not same_device(src, dst):
+        method = "copy"
+        stats.cross_device = True
+    if is_link(dst):
+        try: os.unlink(dst)
+        except OSError: os.rmdir(dst)
+    staging = None
+    if not os.path.exists(dst):
+        staging = dst + TMP_SUFFIX
+        if os.path.exists(staging): shutil.rmtree(staging, ignore_errors=True)
+        target = staging
+    else:
+        target = dst
+
+    src_files, src_dirs = _walk(src)
+    dst_files, dst_dirs = _walk(target) if os.path.exists(target) else ({}, set())
+
+    for rel in sorted(src_dirs - dst_dirs):
+        path = os.path.join(target, rel)
+        if rel in dst_files:
+            os.remove(path)
+            dst_files.pop(rel)
+        os.makedirs(path, exist_ok=True)
+    os.makedirs(target, exist_ok=True)
+
+    def work(rel):
+        if stop_event is not None and stop_event.is_set(): return
+        s, d = os.path.join(src, rel), os.path.join(target, rel)
+        info = src_files[rel]
+        try:
+            if _unchanged(s, d, info, dst_files.get(rel), verify_hash, method):
+                with stats._lock:
+                    stats.skipped += 1
+                    stats.skipped_bytes += info[0]
+                return
+            if rel in dst_dirs: shutil.rmtree(d)
+            used = _place_file(s, d, method)
+            with stats._lock:
+                stats.copied += 1
+                if used == "copy": stats.copied_bytes += info[0]
+                else: stats.linked_bytes += info[0]
+                if used != method: stats.fallbacks += 1
+        except OSError as e:
+            with stats._lock: stats.errors.append(f"{rel}: {e}")
+            try: os.remove(d + TMP_SUFFIX)
+            except OSError: pass
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        list(pool.map(work, src_files))
+
+    if stop_event is not None and stop_event.is_set():
+        stats.stopped = True
+        if staging: shutil.rmtree(staging, ignore_errors=True)
+        return stats
+
+    for rel in dst_files.keys() - src_files.keys():
+        try:
+            os.remove(os.path.join(target, rel))
+            stats.deleted += 1
+        except OSError as e: stats.errors.append(f"{rel}: {e}")
+    # Deepest first so parents are empty by the time they are removed
+    for rel in sorted(dst_dirs - src_dirs, key=len, reverse=True):
+        path = os.path.join(target, rel)
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            stats.deleted += 1
+
+    if staging:
+        if stats.errors: shutil.rmtree(staging, ignore_errors=True)
+        else: os.replace(staging, dst)
+    return stats
+
+
+def diff_tree(src, dst, verify_hash=False):
+    """Compares a deployed copy with its source without changing anything.
+
+    Returns (changed, missing, extra) lists of relative file paths; sizes and
+    mtimes are compared as sync_tree does, or contents with verify_hash.
+    """
+    src_files, _ = _walk(src)
+    dst_files, _ = _walk(dst)
+    changed, missing = [], []
+    for rel, info in src_files.items():
+        if rel not in dst_files: missing.append(rel)
+        else:
+            try: same = _unchanged(os.path.join(src, rel), os.path.join(dst, rel), info, dst_files[rel], verify_hash, None)
+            except OSError: same = False
+            if not same: changed.append(rel)
+    extra = sorted(dst_files.keys() - src_files.keys())
+    return sorted(changed), sorted(missing), extra
+
+
+def resync_all(pairs, verify_hash=False, max_workers=4, stop_event=None, on_item=None, method="copy"):
+    """Runs sync_tree over (mod_id, src, dst) pairs; on_item(mod_id, stats) after each. Returns total SyncStats."""
+    total = SyncStats()
+    for mid, src, dst in pairs:
+        if stop_event is not None and stop_event.is_set(): break
+        item = sync_tree(src, dst, verify_hash=verify_hash, max_workers=max_workers, stop_event=stop_event, method=method)
+        total.add(item)
+        if on_item: on_item(mid, item)
+    return total
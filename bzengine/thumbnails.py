@@ -0,0 +1,185 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+THUMB_DIR = "bz_thumb_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# name -> (box, exact): exact resizes to the box, otherwise the aspect ratio is kept
+SIZES = {"icon": ((36, 36), False), "preview": ((150, 150), True)}
+
+
+class ThumbnailCache:
+    """On-disk cache of ready-to-display Workshop preview thumbnails.
+
+    Each preview is downloaded once and written as one PNG per entry in
+    SIZES, named <mod id>_<url hash>_<size>.png, so a changed preview URL
+    simply misses and the old files age out. Tk can load the PNGs directly
+    (tk.PhotoImage(file=...)), so the main thread never decodes or resizes.
+    Files are evicted oldest-first once the folder exceeds max_bytes.
+    Pillow is only imported when a new preview has to be resized. get()
+    blocks on the download, so callers run it on their own worker threads
+    (the Manage tab's fetch pool, the preview lookup thread).
+    """
+
+    def __init__(self, root=THUMB_DIR, client=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.client = client
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._total = None
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, mid, url, size):
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.root, f"{mid}_{digest}_{size}.png")
+
+    def lookup(self, mid, url, size="icon"):
+        """Path of the cached PNG, or None. Never touches the network."""
+        path = self.path_for(mid, url, size)
+        return path if os.path.exists(path) else None
+
+    def get(self, mid, url, size="icon"):
+        """Returns the cached PNG path, downloading and resizing the preview first if needed.
+
+        Concurrent calls for the same preview share one download. Returns None
+        when the preview cannot be fetched or Pillow is unavailable.
+        """
+        path = self.lookup(mid, url, size)
+        if path:
+            try: os.utime(path)
+            except OSError: pass
+            return path
+        key = (mid, url)
+        with self._lock:
+            done = self._inflight.get(key)
+            owner = done is None
+            if owner: done = self._inflight[key] = threading.Event()
+        if not owner:
+            done.wait(60)
+            return self.lookup(mid, url, size)
+        try:
+            self._build(mid, url)
+        except Exception:
+            pass
+        finally:
+            with self._lock: self._inflight.pop(key, None)
+            done.set()
+        return self.lookup(mid, url, size)
+
+    def _build(self, mid, url):
+        from PIL import Image
+        raw = self.client.get(url).raise_for_status().body
+        src = Image.open(BytesIO(raw))
+        src.load()
+        if src.mode not in ("RGB", "RGBA"): src = src.convert("RGBA")
+        written = 0
+        for size, (box, exact) in SIZES.items():
+            if exact:
+                img = src.resize(box, Image.Resampling.LANCZOS)
+            else:
+                img = src.copy()
+                img.thumbnail(box, Image.Resampling.LANCZOS)
+            dest = self.path_for(mid, url, size)
+            tmp = dest + ".tmp"
+            img.save(tmp, "PNG", optimize=True)
+            os.replace(tmp, dest)
+            written += os.path.getsize(dest)
+        self._account(written)
+
+    def _account(self, added):
+        with self._lock:
+            if self._total is None: self._total = self.disk_usage()
+            else: self._total += added
+            over = self._total > self.max_bytes
+        if over: self.evict()
+
+    def disk_usage(self):
+        total = 0
+        try:
+            with os.scandir(self.root) as it:
+                for e in it:
+                    try: total += e.stat().st_size
+                    except OSError: pass
+        except OSError: pass
+        return total
+
+    def evict(self, target=None):
+        """Deletes least recently used files until the folder is below target (90% of max_bytes by default)."""
+        target = int(self.max_bytes * 0.9) if target is None else target
+        files = []
+        try:
+            with os.scandir(self.root) as it:
+                for e in it:
+                    try:
+                        st = e.stat()
+                        files.append((st.st_mtime, st.st_size, e.path))
+                    except OSError: pass
+        except OSError: return 0
+        total = sum(f[1] for f in files)
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= target: break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError: pass
+        with self._lock: self._total = total
+        return removed
+
+
+class ImageLRU:
+    """Size-capped LRU of loaded images (Tk PhotoImages) keyed by mod ID.
+
+    Only rows in or near the viewport ask for their image, so the least
+    recently used entries are always off-screen ones and dropping them
+    releases the Tk image memory.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = max(1, int(capacity))
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, loader=None):
+        """Cached image for key; on a miss loader() is called and a non-None result is cached."""
+        image = self._items.get(key)
+        if image is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return image
+        if loader is None: return None
+        image = loader()
+        if image is not None:
+            self.misses += 1
+            self.put(key, image)
+        return image
+
+    def put(self, key, image):
+        self._items[key] = image
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key):
+        self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"size": len(self._items), "capacity": self.capacity, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "hit_rate": self.hits / lookups if lookups else 0.0}
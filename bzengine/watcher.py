@@ -0,0 +1,126 @@
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import struct
+import threading
+
+# inotify(7) constants
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class FolderWatcher:
+    """Watches the workshop content folder and the game mods folder for per-mod changes.
+
+    callback(events) is called from the watcher thread with a list of
+    (kind, mod_id) tuples, kind being "added"/"removed" for the content
+    folder and "linked"/"unlinked" for the mods folder, or [("rescan", None)]
+    when the kernel queue overflowed or a watched folder itself went away.
+    Uses inotify on Linux and falls back to polling with os.scandir elsewhere.
+    """
+
+    def __init__(self, content_dir, mods_dir, callback, poll_interval=2.0):
+        self.content_dir = content_dir
+        self.mods_dir = mods_dir
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.backend = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        fd = self._init_inotify() if platform.system() == "Linux" else None
+        if fd is not None:
+            self.backend = "inotify"
+            self._thread = threading.Thread(target=self._inotify_loop, args=(fd,), daemon=True)
+        else:
+            self.backend = "polling"
+            # First listing taken here, so changes made right after start() are not folded into it
+            snapshot = (self._list(self.content_dir, True), self._list(self.mods_dir, False))
+            self._thread = threading.Thread(target=self._poll_loop, args=snapshot, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _emit(self, events):
+        if events and not self._stop.is_set():
+            try: self.callback(events)
+            except Exception: pass
+
+    # --- inotify backend ---
+
+    def _init_inotify(self):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0: return None
+            mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+            self._wds = {}
+            for kinds, path in ((("added", "removed"), self.content_dir), (("linked", "unlinked"), self.mods_dir)):
+                wd = libc.inotify_add_watch(fd, os.fsencode(path), mask)
+                if wd < 0:
+                    os.close(fd)
+                    return None
+                self._wds[wd] = kinds
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _inotify_loop(self, fd):
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready: continue
+                try: data = os.read(fd, 64 * 1024)
+                except BlockingIOError: continue
+                events = []
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(data):
+                    wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                    name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b"\0")
+                    offset += _EVENT_HEADER.size + length
+                    if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                        events = [("rescan", None)]
+                        break
+                    kinds = self._wds.get(wd)
+                    if not kinds or not name: continue
+                    kind = kinds[0] if mask & (IN_CREATE | IN_MOVED_TO) else kinds[1]
+                    events.append((kind, os.fsdecode(name)))
+                self._emit(events)
+        finally:
+            os.close(fd)
+
+    # --- polling backend ---
+
+    @staticmethod
+    def _list(path, dirs_only):
+        try:
+            with os.scandir(path) as it:
+                return {e.name for e in it if not dirs_only or e.is_dir()}
+        except OSError:
+            return set()
+
+    def _poll_loop(self, content, mods):
+        while not self._stop.wait(self.poll_interval):
+            new_content = self._list(self.content_dir, True)
+            new_mods = self._list(self.mods_dir, False)
+            events = [("added", m) for m in sorted(new_content - content)]
+            events += [("removed", m) for m in sorted(content - new_content)]
+            events += [("linked", m) for m in sorted(new_mods - mods)]
+            events += [("unlinked", m) for m in sorted(mods - new_mods)]
+            content, mods = new_content, new_mods
+            self._emit(events)
@@ -0,0 +1,193 @@
+import calendar
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from .http_client import HttpError, get_client
+
+FILEDETAILS_URL = "https://steamcommunity.com/sharedfiles/filedetails/?id={}&l=english"
+# Steam renders page dates in the zone this cookie names (seconds east of UTC); 0 asks for UTC
+PAGE_HEADERS = {"Cookie": "timezoneOffset=0,0"}
+
+# One alternation so a single scan of the page picks up every field we need
+_PAGE_RE = re.compile(
+    r'<div class="workshopItemTitle">(?P<title>.*?)</div>'
+    r'|steamcommunity\.com/app/(?P<appid>\d+)'
+    r'|id="ActualImage"\s+src="(?P<thumb>[^"]+)"'
+    r'|<link rel="image_src" href="(?P<image_src>[^"]+)">'
+    r'|<(?:div|span) class="detailsStatRight">(?P<stat>[^<]+)</(?:div|span)>'
+    r'|(?P<required><div[^>]*class="requiredItemsContainer"[^>]*>)'
+)
+_DIV_RE = re.compile(r'<div|</div>')
+_ID_RE = re.compile(r'id=(\d+)')
+
+# Manual English Month Map to bypass OS Locale issues
+_MONTHS = {"Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+           "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12}
+
+
+def parse_workshop_date(text):
+    """Parses a Workshop date such as '23 Oct, 2016 @ 3:47pm' (year optional) into a naive UTC datetime."""
+    try:
+        parts = text.replace("@", "").replace(",", "").split()
+        day = int(parts[0])
+        month = _MONTHS[parts[1][:3]]
+        if ":" in parts[2]:  # Format: 23 Oct 3:47pm (current year)
+            year, time_str = datetime.now(timezone.utc).year, parts[2]
+        else:
+            year, time_str = int(parts[2]), parts[3]
+        return datetime.strptime(f"{year}-{month:02d}-{day:02d} {time_str}", "%Y-%m-%d %I:%M%p")
+    except (IndexError, KeyError, ValueError):
+        return None
+
+
+def workshop_timestamp(text):
+    """Epoch seconds for a Workshop page date, which is UTC like ACF timeupdated; None if it does not parse."""
+    dt = parse_workshop_date(text)
+    return calendar.timegm(dt.timetuple()) if dt else None
+
+
+def parse_mod_id(text):
+    """Mod ID from a bare ID or a Workshop URL (?id=...); None if there is none."""
+    match = _ID_RE.search(text)
+    return match.group(1) if match else (text.strip() if text.strip().isdigit() else None)
+
+
+def _required_block_ids(html, start_idx):
+    # Walk nested divs until the container closes
+    balance = 1
+    idx = start_idx
+    for m in _DIV_RE.finditer(html, start_idx):
+        balance += 1 if m.group() == '<div' else -1
+        idx = m.end()
+        if balance == 0: break
+    return list(dict.fromkeys(_ID_RE.findall(html, start_idx, idx)))
+
+
+class WorkshopItem:
+    """Everything the app reads from one Workshop filedetails page."""
+
+    def __init__(self, mid, title=None, appid=None, thumb_url=None, remote_date="Unknown",
+                 time_updated=None, deps=None, etag=None, last_modified=None, time_source="page"):
+        self.mid = str(mid)
+        self.title = title
+        self.appid = appid
+        self.thumb_url = thumb_url
+        self.remote_date = remote_date
+        self.time_updated = time_updated
+        # "page" (scraped, UTC) or "api" (GetPublishedFileDetails)
+        self.time_source = time_source
+        self.deps = deps or []
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched = time.monotonic()
+
+    @classmethod
+    def from_html(cls, mid, html, etag=None, last_modified=None):
+        found = {}
+        stats = []
+        deps = None
+        for m in _PAGE_RE.finditer(html):
+            kind = m.lastgroup
+            if kind == "stat":
+                stats.append(m.group("stat").strip())
+            elif kind == "required":
+                if deps is None: deps = _required_block_ids(html, m.end())
+            elif kind not in found:
+                found[kind] = m.group(kind)
+
+        # Stats read [size, posted, updated]; the last one that parses as a date is the newest
+        remote_date, r_ts = "Unknown", None
+        for stat in reversed(stats):
+            r_ts = workshop_timestamp(stat)
+            if r_ts:
+                remote_date = stat
+                break
+
+        title = found.get("title")
+        return cls(mid,
+                   title=title.strip() if title else None,
+                   appid=found.get("appid"),
+                   thumb_url=found.get("thumb") or found.get("image_src"),
+                   remote_date=remote_date,
+                   time_updated=r_ts,
+                   deps=[d for d in (deps or []) if d != str(mid)],
+                   etag=etag, last_modified=last_modified)
+
+    @classmethod
+    def from_meta(cls, mid, meta):
+        return cls(mid, **{k: meta.get(k) for k in ("title", "appid", "thumb_url", "time_updated", "deps", "etag", "last_modified")},
+                   remote_date=meta.get("remote_date") or "Unknown", time_source=meta.get("time_source"))
+
+    def to_meta(self):
+        return {"title": self.title, "appid": self.appid, "thumb_url": self.thumb_url,
+                "remote_date": self.remote_date, "time_updated": self.time_updated, "time_source": self.time_source,
+                "deps": list(self.deps)}
+
+
+class WorkshopPages:
+    """Fetches and parses filedetails pages at most once per mod ID.
+
+    Results are memoized in-process for max_age seconds and concurrent callers
+    asking for the same ID wait on the fetch already in flight. Each fetch is
+    written through to the metadata store, and a stored ETag/Last-Modified is
+    used to turn repeat downloads into conditional requests.
+    """
+
+    def __init__(self, store=None, client=None, max_age=600):
+        self.store = store
+        self.client = client
+        self.max_age = max_age
+        self._items = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def peek(self, mid):
+        with self._lock:
+            item = self._items.get(str(mid))
+        if item and time.monotonic() - item.fetched < self.max_age: return item
+        return None
+
+    def get(self, mid, refresh=False):
+        mid = str(mid)
+        while True:
+            if not refresh:
+                item = self.peek(mid)
+                if item: return item
+            with self._lock:
+                waiter = self._inflight.get(mid)
+                if waiter is None:
+                    done = self._inflight[mid] = threading.Event()
+                    break
+            waiter.wait()
+            refresh = False
+
+        try:
+            item = self._fetch(mid)
+            with self._lock: self._items[mid] = item
+            return item
+        finally:
+            with self._lock: self._inflight.pop(mid, None)
+            done.set()
+
+    def _fetch(self, mid):
+        client = self.client or get_client()
+        headers = dict(PAGE_HEADERS)
+        stored = self.store.get(mid) if self.store else None
+        # Entries without time_source were scraped when page dates were read as local time; re-parse those
+        if stored and stored.get("time_source"): headers.update(self.store.validators(mid))
+        r = client.get(FILEDETAILS_URL.format(mid), headers=headers)
+        if r.status == 304:
+            stored = self.store.get(mid) if self.store else None
+            if stored:
+                self.store.touch(mid, deps_at=time.time())
+                return WorkshopItem.from_meta(mid, self.store.get(mid))
+            # The entry went away after the validators were sent (removed meanwhile); ask for the whole page
+            r = client.get(FILEDETAILS_URL.format(mid), headers=PAGE_HEADERS)
+            if r.status == 304: raise HttpError(r.status, r.url, "not modified without validators")
+        html = r.raise_for_status().text()
+        item = WorkshopItem.from_html(mid, html, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        if self.store:
+            self.store.update(mid, etag=item.etag, last_modified=item.last_modified, deps_at=time.time(), **item.to_meta())
+        return item
@@ -1,20 +1,51 @@
 import os
 import sys
-import re
-import json
+import time
+
+# Reference point for the startup timer (bzengine.startup)
+STARTUP_T0 = time.perf_counter()
+
+# Subcommands run headless: dispatch before tkinter (or anything GUI-only) is imported
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from bzengine.cli import is_cli_args, main
+    if is_cli_args(sys.argv[1:]): sys.exit(main(sys.argv[1:]))
+
 import shutil
-import zipfile
 import subprocess
 import threading
-import urllib.request
 import platform
+import atexit
+import json
+import importlib.util
 from datetime import datetime
-from io import BytesIO
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import webbrowser
 from pathlib import Path
 
+from bzengine.fetch_pool import FetchPool
+from bzengine.metadata_store import MetadataStore, DEFAULT_TTL
+from bzengine import steam_api
+from bzengine.http_client import get_client
+from bzengine.workshop import WorkshopPages, parse_mod_id
+from bzengine.dependencies import DependencyGraph, DependencyResolver
+from bzengine.downloads import DownloadScheduler
+from bzengine.steamcmd import SteamCmdSessions, install_steamcmd, force_english
+from bzengine.hud_log import HudLog
+from bzengine.scanner import CacheScanner
+from bzengine.acf import WorkshopManifest, is_outdated
+from bzengine.sync import SyncStats, resync_all, format_bytes, is_link
+from bzengine.dedup import DedupStore
+from bzengine.watcher import FolderWatcher
+from bzengine.mod_list import ModListModel
+from bzengine.thumbnails import ThumbnailCache, ImageLRU
+from bzengine.games import GAMES, DEFAULT_GAME
+from bzengine.config import (DEPLOY_MODES, load_config, save_config, game_path as game_path_for,
+                             cache_path as config_cache_path, deploy_mode as config_deploy_mode)
+from bzengine.deploy import deploy_mod
+from bzengine.startup import StartupTimer, BENCH_ENV
+from bzengine.profiles import Profiles, deployed_mods, plan_profile, apply_plan
+from bzengine.journal import Journal, op_link, op_unlink, op_delete
+
 # Platform-specific imports
 IS_WINDOWS = platform.system() == "Windows"
 IS_LINUX = platform.system() == "Linux"
@@ -27,11 +58,8 @@ else:
     ctypes = None
 
 # --- EXTERNAL LIBRARIES ---
-try:
-    from PIL import Image, ImageTk
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
+# Pillow is only imported where an image has to be resized, never at startup
+HAS_PIL = importlib.util.find_spec("PIL") is not None
 
 try:
     # Requires: pip install tkinterdnd2
@@ -41,8 +69,8 @@ except ImportError:
     HAS_DND = False
 
 # --- CONFIGURATION ---
-STEAMCMD_URL = "https://steamcdn-a.akamaihd.net/client/installer/steamcmd.zip"
-CONFIG_FILE = "bz_mod_config.json"
+TREE_ROW_HEIGHT = 40
+TREE_HEADING_HEIGHT = 25
 
 class ToolTip:
     def __init__(self, widget, text, bg="#1a1a1a", fg="#00ffff"):
@@ -70,9 +98,71 @@ class ToolTip:
             self.tip_window.destroy()
             self.tip_window = None
 
+class UiEventBus:
+    """Single queue of UI updates posted by worker threads and applied on a fixed main-loop tick.
+
+    Superseded values (progress, button text) keep only the newest update, all
+    pending cell/tag changes for one tree row are applied together, and log
+    lines are flushed in one chunk per tick.
+    """
+    def __init__(self, root, apply_logs, apply_row, interval_ms=33):
+        self.root = root
+        self.apply_logs = apply_logs
+        self.apply_row = apply_row
+        self.interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self._calls = []
+        self._latest = {}
+        self._rows = {}
+        self._logs = []
+        self.root.after(self.interval_ms, self._tick)
+
+    def post(self, fn, delay_ms=0):
+        """Runs fn on the UI thread at the next tick, or delay_ms after it."""
+        with self._lock: self._calls.append((fn, delay_ms))
+
+    def post_latest(self, key, fn):
+        with self._lock: self._latest[key] = fn
+
+    def post_log(self, message, tag=None):
+        ts = datetime.now().strftime("[%H:%M:%S] ")
+        with self._lock: self._logs.append((ts, message, tag))
+
+    def set_cells(self, item, **cells):
+        with self._lock:
+            self._rows.setdefault(item, ({}, set()))[0].update(cells)
+
+    def add_tag(self, item, tag):
+        with self._lock:
+            self._rows.setdefault(item, ({}, set()))[1].add(tag)
+
+    def _tick(self):
+        with self._lock:
+            calls, self._calls = self._calls, []
+            latest, self._latest = self._latest, {}
+            rows, self._rows = self._rows, {}
+            logs, self._logs = self._logs, []
+        try:
+            for fn, delay_ms in calls:
+                if delay_ms: self.root.after(delay_ms, fn)
+                else: self._call(fn)
+            for item, (cells, tags) in rows.items(): self._call(self.apply_row, item, cells, tags)
+            for fn in latest.values(): self._call(fn)
+            if logs: self._call(self.apply_logs, logs)
+        finally:
+            self.root.after(self.interval_ms, self._tick)
+
+    def _call(self, fn, *args):
+        # One failing update (e.g. a row deleted meanwhile) must not drop the rest of the tick
+        try: fn(*args)
+        except Exception: self.root.report_callback_exception(*sys.exc_info())
+
+
 class BZModMaster:
     def __init__(self, root):
         self.root = root
+        self.startup = StartupTimer(STARTUP_T0)
+        self.startup.mark("imports")
         self.root.title("Battlezone Mod Engine")
         self.root.geometry("1150x850")
         
@@ -83,38 +173,10 @@ class BZModMaster:
             self.base_dir = os.path.dirname(os.path.abspath(__file__))
             self.resource_dir = self.base_dir
 
-        # --- GAME DEFINITIONS ---
-        self.games = {
-            "BZ98R": {
-                "name": "Battlezone 98 Redux",
-                "appid": "301650",
-                "gog_ids": ["1454067812", "1459427445"],
-                "exe": "battlezone98redux.exe",
-                "font_file": "BZONE.ttf",
-                "font_name": "BZONE",
-                "icon_file": "bz98.png",
-                "colors": {
-                    "bg": "#0a0a0a", "fg": "#d4d4d4",
-                    "highlight": "#00ff00", "dark_highlight": "#004400", "accent": "#00ffff"
-                }
-            },
-            "BZCC": {
-                "name": "Battlezone Combat Commander",
-                "appid": "624970",
-                "gog_ids": ["1193046833"],
-                "exe": "battlezone2.exe",
-                "font_file": "BGM.ttf",
-                "font_name": "BankGothic",
-                "icon_file": "bz2.png",
-                "colors": {
-                    "bg": "#0a0a0a", "fg": "#d4d4d4",
-                    "highlight": "#00aaff", "dark_highlight": "#002244", "accent": "#88ccff"
-                }
-            }
-        }
+        self.games = GAMES
 
         self.load_custom_fonts()
-        self.load_game_icons()
+        self.game_icons = {}
 
         icon_path = os.path.join(self.resource_dir, "modman.ico")
         if os.path.exists(icon_path):
@@ -123,42 +185,120 @@ class BZModMaster:
 
         self.bin_dir = os.path.join(self.base_dir, "bin")
         self.config = self.load_config()
+        self.hud_log = HudLog(max_lines=self.config.get("hud_log_lines", 1000))
+        self.log_line_count = 0
+        self.ui = UiEventBus(self.root, self._write_log_entries, self.apply_row_update,
+                             interval_ms=self.config.get("ui_tick_ms", 33))
         
         # Determine active game
         self.current_game_key = self.config.get("last_game", "BZ98R")
-        if self.current_game_key not in self.games: self.current_game_key = "BZ98R"
+        if self.current_game_key not in self.games: self.current_game_key = DEFAULT_GAME
         
         self.apply_theme_vars()
         self.root.configure(bg=self.colors["bg"])
 
-        self.use_physical_var = tk.BooleanVar(value=self.config.get("use_physical", False))
+        # Deploy strategy: link (junction/symlink), hardlink, reflink or copy; legacy configs only had use_physical
+        self.deploy_mode_var = tk.StringVar(value=config_deploy_mode(self.config).upper())
         self.advanced_mode_var = tk.BooleanVar(value=self.config.get("advanced_mode", False))
         
         # Load game-specific path or fallback to legacy global path
-        saved_path = self.config.get(f"path_{self.current_game_key}", "")
-        if not saved_path and self.current_game_key == "BZ98R":
-            saved_path = self.config.get("game_path", "")
-            
+        saved_path = game_path_for(self.config, self.current_game_key)
         self.path_var = tk.StringVar(value=saved_path)
         self.steamcmd_var = tk.StringVar(value=self.config.get("steamcmd_path", ""))
-        self.cache_var = tk.StringVar(value=self.config.get("cache_path", os.path.join(self.base_dir, "workshop_cache")))
+        self.cache_var = tk.StringVar(value=config_cache_path(self.config, self.base_dir))
         
         self.mod_id_var = tk.StringVar()
-        self.image_cache = {}
+        # PhotoImages for rows in or near the viewport only
+        self.image_cache = ImageLRU(self.config.get("thumb_memory_items", 256))
+        
+        # Bounded pool for Manage-tab metadata fetches (visible rows are served first)
+        self.fetch_pool = FetchPool(self.config.get("fetch_workers", 6))
+        self.meta_store = MetadataStore(ttl=self.config.get("metadata_ttl", DEFAULT_TTL))
+        # Saves are debounced; write whatever the last couple of seconds changed when the window closes
+        atexit.register(self.meta_store.flush)
+        self.http = get_client()
+        self.http.timeout = self.config.get("http_timeout", self.http.timeout)
+        atexit.register(self.http.close)
+        self.thumbs = ThumbnailCache(client=self.http, max_bytes=int(self.config.get("thumb_cache_mb", 64)) * 1024 * 1024)
+        self.workshop = WorkshopPages(self.meta_store, self.http)
+        self.dep_graph = DependencyGraph(self.meta_store)
+        self.dep_resolver = DependencyResolver(self.dep_graph, lambda mid: self.workshop.get(mid).deps,
+                                               max_workers=self.config.get("fetch_workers", 6))
+        self.fetch_report_job = None
+        self.tree_generation = 0
+        self.visible_prio_job = None
+        self.scanner = CacheScanner()
+        self.workshop_manifest = WorkshopManifest()
+        self.dedup_stores = {}
+        self.profiles = Profiles(self.config)
+        # Enable/disable/delete batches go through a write-ahead journal (see bzengine.journal),
+        # kept next to the config like the other state files
+        self.journal = Journal(max_workers=int(self.config.get("sync_workers", 4)))
+        self.workshop_dir = None
+        self.installed_items = {}
+        self.watcher = None
+        # A new game or cache path makes the watched folders stale; the next refresh_list watches the new ones
+        for var in (self.path_var, self.cache_var): var.trace_add("write", lambda *args: self.stop_watcher())
+        atexit.register(self.stop_watcher)
         
         # Threading & Process Control
         self.stop_event = threading.Event()
         self.active_processes = []
         self.task_count = 0
         self.task_lock = threading.Lock()
+        self.downloads = DownloadScheduler(self._run_download_batch,
+                                           window=self.config.get("download_window", 1.5),
+                                           max_processes=self.config.get("max_steamcmd_processes", 1),
+                                           on_cancelled=self._download_batch_cancelled)
+        # Logged-in SteamCMD processes reused across batches
+        self.steamcmd_sessions = SteamCmdSessions(idle_timeout=self.config.get("steamcmd_idle_timeout", 300))
+        atexit.register(self.steamcmd_sessions.close_all)
 
         self.setup_ui()
-        self.check_admin()
-        
-        if not self.path_var.get(): self.auto_detect_gog()
-        if not self.steamcmd_var.get(): self.auto_detect_steamcmd()
         self.toggle_ui_mode()
-        threading.Thread(target=self.initialize_engine, daemon=True).start()
+        self.startup.mark("ui_built")
+        # Detection, icons and engine checks touch the disk, the registry or Pillow; they wait for the window
+        self.root.after(0, self.on_window_shown)
+
+    # --- DEFERRED STARTUP ---
+
+    def on_window_shown(self):
+        self.root.update_idletasks()
+        self.startup.mark("first_paint")
+        self.check_admin()
+        if self.journal.pending(): self.recover_journal()
+        threading.Thread(target=self._startup_worker, args=(self.current_game_key, not self.path_var.get(),
+                         not self.steamcmd_var.get()), daemon=True).start()
+
+    def _startup_worker(self, game_key, need_game, need_steamcmd):
+        self.startup.mark("detection")
+        found = {}
+        try:
+            if need_game: found["game"] = self.find_game_install(game_key)
+            if need_steamcmd: found["steamcmd"] = self.find_steamcmd()
+        except Exception: pass
+        self.ui.post(lambda: self.apply_detected_paths(found))
+        self.load_game_icons()
+
+    def apply_detected_paths(self, found):
+        """Fills in auto-detected paths that are still empty, saving the config once."""
+        changed = False
+        if found.get("game") and not self.path_var.get():
+            self.path_var.set(found["game"])
+            changed = True
+        if found.get("steamcmd") and not self.steamcmd_var.get():
+            self.steamcmd_var.set(os.path.normpath(found["steamcmd"]))
+            changed = True
+        if changed: self.save_config()
+        self.initialize_engine(on_done=self.on_startup_complete)
+
+    def on_startup_complete(self):
+        self.startup.mark("interactive")
+        if os.environ.get(BENCH_ENV):
+            print(json.dumps(self.startup.marks), flush=True)
+            self.root.after(0, self.root.destroy)
+        elif self.advanced_mode_var.get():
+            self.log(f"Startup: {self.startup.summary()}", "info")
 
     def load_custom_fonts(self):
         self.available_fonts = []
@@ -174,16 +314,31 @@ class BZModMaster:
                 except: pass
 
     def load_game_icons(self):
-        self.game_icons = {}
-        if not HAS_PIL: return
+        """Runs off the UI thread: resizes each game icon with Pillow once into the thumbnail folder.
+
+        Later starts find the 48px PNG there and Tk loads it directly, so
+        Pillow is not imported at all.
+        """
+        self.startup.mark("icons")
         for key, g in self.games.items():
+            src = os.path.join(self.resource_dir, g["icon_file"])
+            dest = os.path.join(self.thumbs.root, f"game_{key}_48.png")
             try:
-                p = os.path.join(self.resource_dir, g["icon_file"])
-                if os.path.exists(p):
-                    img = Image.open(p).resize((48, 48), Image.Resampling.LANCZOS)
-                    self.game_icons[key] = ImageTk.PhotoImage(img)
+                if not os.path.exists(src): continue
+                if not os.path.exists(dest) or os.path.getmtime(dest) < os.path.getmtime(src):
+                    if not HAS_PIL: continue
+                    from PIL import Image
+                    img = Image.open(src).resize((48, 48), Image.Resampling.LANCZOS)
+                    img.save(dest + ".tmp", "PNG")
+                    os.replace(dest + ".tmp", dest)
+                self.ui.post(lambda k=key, p=dest: self.set_game_icon(k, p))
             except: pass
 
+    def set_game_icon(self, key, path):
+        try: self.game_icons[key] = tk.PhotoImage(file=path)
+        except tk.TclError: return
+        if key == self.current_game_key: self.update_game_icon()
+
     def apply_theme_vars(self):
         g = self.games[self.current_game_key]
         self.colors = g["colors"]
@@ -191,42 +346,18 @@ class BZModMaster:
         self.current_font = g["font_name"] if g["font_name"] in self.available_fonts else "Consolas"
 
     def load_config(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f: 
-                    data = json.load(f)
-                    # Convert relative paths back to absolute
-                    for key in ["game_path", "steamcmd_path", "cache_path", "path_BZ98R", "path_BZCC"]:
-                        if key in data and data[key] and not os.path.isabs(data[key]):
-                            data[key] = os.path.normpath(os.path.join(self.base_dir, data[key]))
-                    return data
-            except: return {}
-        return {}
+        return load_config(self.base_dir)
 
     def save_config(self, *args):
-        def make_rel(path):
-            if not path: return ""
-            try:
-                if os.path.splitdrive(path)[0].lower() == os.path.splitdrive(self.base_dir)[0].lower():
-                    return os.path.relpath(path, self.base_dir)
-            except: pass
-            return path
-
         # Update current game path in config before saving
         self.config[f"path_{self.current_game_key}"] = self.path_var.get()
         self.config["last_game"] = self.current_game_key
         self.config["steamcmd_path"] = self.steamcmd_var.get()
         self.config["cache_path"] = self.cache_var.get()
-        self.config["use_physical"] = self.use_physical_var.get()
+        self.config["deploy_mode"] = self.deploy_mode()
+        self.config["use_physical"] = self.deploy_mode() != "link"
         self.config["advanced_mode"] = self.advanced_mode_var.get()
-
-        # Convert paths to relative for storage
-        storage_config = self.config.copy()
-        for k, v in storage_config.items():
-            if "path" in k and isinstance(v, str):
-                storage_config[k] = make_rel(v)
-
-        with open(CONFIG_FILE, 'w') as f: json.dump(storage_config, f, indent=4)
+        save_config(self.config, self.base_dir)
 
     def setup_ui(self):
         style = ttk.Style()
@@ -272,6 +403,12 @@ class BZModMaster:
         ttk.Checkbutton(game_row, text="Advanced Mode", variable=self.advanced_mode_var, 
                        command=self.toggle_ui_mode).pack(side="right", padx=10)
 
+        deploy_box = ttk.Combobox(game_row, textvariable=self.deploy_mode_var, values=[m.upper() for m in DEPLOY_MODES], state="readonly", width=10)
+        deploy_box.pack(side="right")
+        deploy_box.bind("<<ComboboxSelected>>", self.save_config)
+        ToolTip(deploy_box, "LINK: junction/symlink to the cache (fastest)\nHARDLINK: per-file hardlinks, for setups that do not follow links\nREFLINK: copy-on-write clones (Btrfs/XFS)\nCOPY: full physical copy\n\nHardlink/reflink fall back to copying across drives.", bg="#1a1a1a", fg=self.colors['accent'])
+        ttk.Label(game_row, text="DEPLOY:").pack(side="right", padx=5)
+
         self.icon_label = tk.Label(game_row, bg=self.colors["bg"])
         self.icon_label.pack(side="left", padx=5)
         self.update_game_icon()
@@ -386,6 +523,7 @@ class BZModMaster:
         self.hud_log_label = ttk.Label(log_header, text=" HUD LOG ", foreground=self.colors['highlight'], font=(self.current_font, 11, "bold"))
         self.hud_log_label.pack(side="left")
         ttk.Button(log_header, text="CLEAR", width=8, command=self.clear_hud_log).pack(side="right")
+        ttk.Button(log_header, text="EXPORT", width=8, command=self.export_hud_log).pack(side="right", padx=5)
         
         self.log_box = tk.Text(self.dl_tab, state="disabled", font=("Consolas", 10), bg="#050505", fg=self.colors['fg'], height=12)
         self.log_box.pack(fill="both", expand=True, padx=10, pady=5)
@@ -407,7 +545,39 @@ class BZModMaster:
         # TAB 2: MANAGE MODS
         # ==========================================
         
-        self.tree = ttk.Treeview(self.manage_tab, columns=("Name", "ID", "Status", "Version", "Date"), show="tree headings")
+        self.tree_columns = ("Name", "ID", "Status", "Version", "Date")
+        # The model holds every row; the Treeview only ever holds the visible window
+        self.mod_list = ModListModel(self.tree_columns)
+        self.tree_first = 0
+        self.tree_rendered = {}
+        self.tree_render_job = None
+        self.selection_start = None
+
+        filter_bar = ttk.Frame(self.manage_tab)
+        filter_bar.pack(fill="x", padx=10, pady=(10, 0))
+        ttk.Label(filter_bar, text="SEARCH:").pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self.on_filter_change)
+        ttk.Entry(filter_bar, textvariable=self.search_var, width=30).pack(side="left", padx=5)
+        self.filter_var = tk.StringVar(value="ALL")
+        filter_box = ttk.Combobox(filter_bar, textvariable=self.filter_var, values=["ALL", "ENABLED", "DISABLED", "OUTDATED"], state="readonly", width=10)
+        filter_box.pack(side="left", padx=5)
+        filter_box.bind("<<ComboboxSelected>>", self.on_filter_change)
+        # Profiles: type a name and SAVE to store the enabled set, pick one and APPLY to switch to it
+        ttk.Label(filter_bar, text="PROFILE:").pack(side="left", padx=(20, 0))
+        self.profile_var = tk.StringVar()
+        self.profile_box = ttk.Combobox(filter_bar, textvariable=self.profile_var, width=18)
+        self.profile_box.pack(side="left", padx=5)
+        ttk.Button(filter_bar, text="APPLY", width=7, command=self.apply_profile).pack(side="left")
+        ttk.Button(filter_bar, text="SAVE", width=6, command=self.save_profile).pack(side="left", padx=5)
+        ttk.Button(filter_bar, text="DELETE", width=7, command=self.delete_profile).pack(side="left")
+        self.refresh_profile_choices()
+        self.list_count_lbl = ttk.Label(filter_bar, text="")
+        self.list_count_lbl.pack(side="right")
+
+        tree_frame = ttk.Frame(self.manage_tab)
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tree = ttk.Treeview(tree_frame, columns=self.tree_columns, show="tree headings")
         self.tree.column("#0", width=45, anchor="center", stretch=False)
         self.tree.heading("#0", text="")
         for col in ["Name", "ID", "Status", "Version", "Date"]: 
@@ -415,15 +585,26 @@ class BZModMaster:
             self.tree.column(col, anchor="center", width=100)
         self.tree.column("Name", width=250) 
         
-        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.tree_scroll = ttk.Scrollbar(tree_frame, orient="vertical", command=self.on_tree_yview)
+        self.tree_scroll.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.tree.bind("<Configure>", self.schedule_tree_render)
+        self.tree.bind("<MouseWheel>", self.on_tree_wheel)
+        self.tree.bind("<Button-4>", self.on_tree_wheel)
+        self.tree.bind("<Button-5>", self.on_tree_wheel)
+        self.tree.bind("<Up>", self.on_tree_key)
+        self.tree.bind("<Down>", self.on_tree_key)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
         self.tree.bind("<Button-3>", self.show_mod_menu)
         self.tree.bind("<ButtonPress-1>", self.on_tree_press)
         self.tree.bind("<B1-Motion>", self.on_tree_motion)
         manage_ctrl = ttk.Frame(self.manage_tab)
         manage_ctrl.pack(fill="x", padx=10, pady=5)
         
-        ttk.Button(manage_ctrl, text="CHECK FOR UPDATES", command=self.refresh_list).pack(side="left")
+        ttk.Button(manage_ctrl, text="CHECK FOR UPDATES", command=lambda: self.refresh_list(force=True)).pack(side="left")
         ttk.Button(manage_ctrl, text="SELECT ALL", command=self.select_all_mods).pack(side="left", padx=5)
+        ttk.Button(manage_ctrl, text="RESYNC COPIES", command=self.resync_physical_mods).pack(side="left", padx=5)
+        ttk.Button(manage_ctrl, text="DEDUP CACHE", command=self.dedup_cache).pack(side="left", padx=5)
         
         self.manage_help_lbl = tk.Label(manage_ctrl, text="?", width=2, bg="#222", fg=self.colors['accent'], font=("Consolas", 8, "bold"), cursor="hand2")
         self.manage_help_lbl.pack(side="left", padx=10)
@@ -444,6 +625,7 @@ class BZModMaster:
 
     def toggle_ui_mode(self):
         advanced = self.advanced_mode_var.get()
+        self.redraw_hud_log()
         
         # 0: Game Path, 1: SteamCMD, 2: Cache
         self.set_row_visibility(0, show_row=advanced, simple=not advanced)
@@ -516,7 +698,7 @@ class BZModMaster:
         style.map("TButton", background=[("active", c["dark_highlight"])], foreground=[("active", c["highlight"])])
         style.configure("Success.TButton", foreground=c["highlight"], font=bold_font)
         
-        style.configure("Treeview", background="#0a0a0a", foreground=c["fg"], fieldbackground="#0a0a0a", rowheight=40)
+        style.configure("Treeview", background="#0a0a0a", foreground=c["fg"], fieldbackground="#0a0a0a", rowheight=TREE_ROW_HEIGHT)
         style.map("Treeview", background=[("selected", c["accent"])], foreground=[("selected", "#000000")])
 
     def update_game_icon(self):
@@ -580,6 +762,8 @@ class BZModMaster:
         
         self.update_tree_tags()
         self.update_game_icon()
+        self.profile_var.set("")
+        self.refresh_profile_choices()
         
         self.log(f"Switched to {self.games[new_key]['name']}", "info")
         self.initialize_engine()
@@ -592,27 +776,59 @@ class BZModMaster:
             self.on_input_change()
 
     def clear_hud_log(self):
+        self.hud_log.clear()
+        self.log_line_count = 0
+        self.log_box.config(state="normal")
+        self.log_box.delete("1.0", "end")
+        self.log_box.config(state="disabled")
+
+    def export_hud_log(self):
+        p = filedialog.asksaveasfilename(defaultextension=".log", initialfile="bz_mod_hud_export.log",
+                                         filetypes=[("Log Files", "*.log"), ("Text Files", "*.txt")])
+        if not p: return
+        try:
+            count = self.hud_log.export(p)
+            self.log(f"Exported {count} log lines to {p}", "success")
+        except Exception as e:
+            self.log(f"Log export failed: {e}", "error")
+
+    def redraw_hud_log(self):
+        """Re-renders the widget from the ring buffer (e.g. after switching Simple/Advanced mode)."""
+        self.log_line_count = 0
         self.log_box.config(state="normal")
         self.log_box.delete("1.0", "end")
         self.log_box.config(state="disabled")
+        self._show_log_entries(list(self.hud_log.lines))
 
     def log(self, message, tag=None):
-        self.root.after(0, lambda: self._log_impl(message, tag))
+        self.ui.post_log(message, tag)
 
-    def _log_impl(self, message, tag=None):
-        # Simple Mode Filter: Only show tagged messages (Success, Warning, Error, Info)
-        if not self.advanced_mode_var.get() and tag is None:
-            return
+    def _write_log_entries(self, entries):
+        self.hud_log.append(entries)
+        self._show_log_entries(entries)
 
+    def _show_log_entries(self, entries):
+        # Simple Mode Filter: Only show tagged messages (Success, Warning, Error, Info)
+        advanced = self.advanced_mode_var.get()
+        chunk = []
+        added = 0
+        for ts, message, tag in entries:
+            if not advanced and tag is None: continue
+            chunk.extend((ts, "timestamp", f"{message}\n", tag or ()))
+            added += message.count("\n") + 1
+        if not chunk: return
+
+        # One insert per tick: Text.insert takes alternating text/tag arguments
         self.log_box.config(state="normal")
-        ts = datetime.now().strftime("[%H:%M:%S] ")
-        self.log_box.insert("end", ts, "timestamp")
+        self.log_box.insert("end", *chunk)
+        
+        # Keep the widget bounded to the ring buffer size by trimming from the top
+        self.log_line_count += added
+        excess = self.log_line_count - self.hud_log.lines.maxlen
+        if excess > 0:
+            self.log_box.delete("1.0", f"{excess + 1}.0")
+            self.log_line_count -= excess
         
-        if tag:
-            self.log_box.insert("end", f"{message}\n", tag)
-        else:
-            self.log_box.insert("end", f"{message}\n")
-            
         self.log_box.see("end")
         self.log_box.config(state="disabled")
 
@@ -620,7 +836,7 @@ class BZModMaster:
         with self.task_lock:
             if self.task_count == 0:
                 self.stop_event.clear()
-                self.root.after(0, lambda: self.stop_btn.config(state="normal"))
+                self.ui.post_latest("stop_btn", lambda: self.stop_btn.config(state="normal"))
             self.task_count += 1
 
     def end_task(self, callback=None):
@@ -628,53 +844,21 @@ class BZModMaster:
             self.task_count -= 1
             if self.task_count <= 0:
                 self.task_count = 0
-                self.root.after(0, lambda: self.stop_btn.config(state="disabled"))
-                self.root.after(0, self.reset_progress)
+                self.ui.post_latest("stop_btn", lambda: self.stop_btn.config(state="disabled"))
+                self.ui.post_latest("progress", self.reset_progress)
                 if callback:
-                    self.root.after(1000, callback)
+                    self.ui.post(callback, 1000)
 
     def stop_operation(self):
         self.stop_event.set()
+        self.fetch_pool.cancel_pending()
+        dropped = self.downloads.cancel_pending()
+        if dropped: self.log(f"Dropped {dropped} queued downloads.", "warning")
         self.log("Stopping operations...", "warning")
         for p in list(self.active_processes):
             try: p.terminate()
             except: pass
 
-    def get_dependencies(self, mid):
-        """Scrapes the Steam Workshop page for required items."""
-        url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={mid}&l=english"
-        try:
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req) as r:
-                html = r.read().decode('utf-8')
-                
-                # Robustly find the requiredItemsContainer block by counting divs
-                start_match = re.search(r'<div[^>]*class="requiredItemsContainer"[^>]*>', html)
-                if start_match:
-                    start_idx = start_match.end()
-                    balance = 1
-                    idx = start_idx
-                    
-                    while balance > 0 and idx < len(html):
-                        next_open = html.find('<div', idx)
-                        next_close = html.find('</div>', idx)
-                        
-                        if next_close == -1: break
-                        
-                        if next_open != -1 and next_open < next_close:
-                            balance += 1
-                            idx = next_open + 4
-                        else:
-                            balance -= 1
-                            idx = next_close + 6
-                            
-                    block = html[start_idx:idx]
-                    return list(set(re.findall(r'id=(\d+)', block)))
-        except Exception as e:
-            self.log(f"Dependency Check Failed: {e}", "warning")
-            pass
-        return []
-
     def update_batch_progress(self, item_percent, completed_count, total_items):
         if total_items == 0: return
         item_percent = min(100.0, max(0.0, item_percent))
@@ -702,131 +886,161 @@ class BZModMaster:
             messagebox.showerror("Validation Error", f"Target Mod ID does not belong to {current_game_name}.\nDownload Aborted.")
             return
 
-        # Dependency Check (Main Thread to allow MessageBox)
-        queue = [mid]
+        # Dependency Check: resolve the full closure off the UI thread, then ask on the main thread
+        self.dl_btn.config(state="disabled", text="CHECKING DEPS...")
+        threading.Thread(target=self._resolve_dependencies, args=(mid,), daemon=True).start()
+
+    def _resolve_dependencies(self, mid):
+        closure = [mid]
         try:
-            self.dl_btn.config(text="CHECKING DEPS...")
-            self.root.update()
-            deps = self.get_dependencies(mid)
-            if deps:
-                if messagebox.askyesno("Dependencies Found", f"This mod requires {len(deps)} other items.\nDownload them as well?"):
-                    queue.extend(deps)
-        except: pass
+            closure, cycles = self.dep_resolver.resolve(
+                [mid], on_error=lambda m, e: self.log(f"Dependency Check Failed for {m}: {e}", "warning"))
+            for cycle in cycles:
+                self.log(f"Dependency cycle detected: {' -> '.join(cycle)}", "warning")
+        except Exception as e:
+            self.log(f"Dependency Check Failed: {e}", "warning")
+        self.ui.post(lambda: self._confirm_download(closure))
+
+    def _confirm_download(self, closure):
+        queue = [closure[0]]
+        deps = closure[1:]
+        if deps:
+            if messagebox.askyesno("Dependencies Found", f"This mod requires {len(deps)} other items.\nDownload them as well?"):
+                queue.extend(deps)
 
         self.dl_btn.config(state="disabled", text="ENGINE ACTIVE")
         self.progress.config(mode="indeterminate")
         self.progress.start(10)
         self.progress_label.config(text="INITIALIZING...", fg=self.colors['accent'])
-        self.start_task()
         
-        sc_path = self.steamcmd_var.get()
-        cache_path = self.cache_var.get()
-        game_path = self.path_var.get()
-        use_physical = self.use_physical_var.get()
-        
-        threading.Thread(target=self.download_logic, args=(queue, sc_path, cache_path, game_path, use_physical), daemon=True).start()
+        if not self.queue_download(queue):
+            self.reset_progress()
+            self.dl_btn.config(state="normal", text="INSTALL MOD")
+
+    def queue_download(self, mod_ids):
+        """Hands mod IDs to the download scheduler, which merges them into one SteamCMD batch."""
+        settings = (self.steamcmd_var.get(), self.cache_var.get(), self.path_var.get(),
+                    self.deploy_mode(), self.games[self.current_game_key]["appid"])
+        accepted = self.downloads.request(mod_ids, settings)
+        skipped = len(set(map(str, mod_ids))) - len(accepted)
+        if skipped: self.log(f"{skipped} item(s) already queued or downloading.", "info")
+        return accepted
+
+    def _run_download_batch(self, mod_ids, settings):
+        self.start_task()
+        self.download_logic(mod_ids, *settings)
+
+    def _download_batch_cancelled(self, mod_ids, settings):
+        # STOP dropped the batch before it got a SteamCMD slot, so download_logic never resets the button
+        def reset():
+            if self.task_count: return  # a batch still running resets it when it ends
+            self.reset_progress()
+            self.dl_btn.config(state="normal", text="INSTALL MOD")
+        self.ui.post(reset)
 
-    def download_logic(self, mod_ids, sc_path, cache_path, game_path, use_physical):
+    def download_logic(self, mod_ids, sc_path, cache_path, game_path, deploy_mode="link", appid=None):
         if isinstance(mod_ids, str): mod_ids = [mod_ids]
         try:
-            current_appid = self.games[self.current_game_key]["appid"]
+            current_appid = appid or self.games[self.current_game_key]["appid"]
             final_sc_path = self.ensure_steamcmd(sc_path)
             cache = os.path.abspath(cache_path)
             
             # Force SteamCMD to use English to ensure regex matching works
-            sc_dir = os.path.dirname(final_sc_path)
-            console_cfg = os.path.join(sc_dir, "SteamConsole.txt")
-            if not os.path.exists(console_cfg):
-                with open(console_cfg, "w") as f:
-                    f.write('@Language "english"\n')
+            force_english(final_sc_path)
 
             total_items = len(mod_ids)
             self.log(f"Batch processing {total_items} items...", "info")
 
-            # Build Batch Command
-            cmd = [final_sc_path, "+force_install_dir", cache, "+login", "anonymous"]
-            
             for mid in mod_ids:
                 mod_path = os.path.join(cache, "steamapps/workshop/content", current_appid, mid)
                 if os.path.exists(mod_path):
                     self.log(f"Queueing update: {mid}", "warning")
                 else:
                     self.log(f"Queueing download: {mid}", "info")
-                cmd.extend(["+workshop_download_item", current_appid, mid])
             
-            cmd.append("+quit")
+            state = {"completed": 0, "last_log_time": 0.0}
             
-            p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, creationflags=subprocess.CREATE_NO_WINDOW)
-            self.active_processes.append(p)
-            
-            completed_count = 0
+            def on_event(ev):
+                completed_count = state["completed"]
+                
+                if ev.kind == "item_success":
+                    completed_count = state["completed"] = completed_count + 1
+                    self.log(f"Success: {ev.mod_id} ({completed_count}/{total_items})", "success")
+                    self.ui.post_latest("progress", lambda c=completed_count, t=total_items: self.update_batch_progress(0, c, t))
+                elif ev.kind in ("item_failure", "error"):
+                    self.log(ev.text, "error")
+                elif ev.kind == "progress":
+                    self.ui.post_latest("progress", lambda v=ev.value, c=completed_count, t=total_items: self.update_batch_progress(v, c, t))
+                elif ev.kind == "verify":
+                    self.ui.post_latest("dl_btn", lambda c=completed_count, t=total_items: self.dl_btn.config(text=f"VERIFYING {c+1}/{t}..."))
+                elif ev.kind == "login":
+                    self.log(ev.text, None if ev.value else "error")
+                elif ev.kind == "activity":
+                    # Throttle "Downloading" and "Extracting" spam
+                    now = time.monotonic()
+                    if now - state["last_log_time"] > 1.0: # Log at most once per second
+                        self.log(ev.text)
+                        state["last_log_time"] = now
+                elif ev.kind == "line":
+                    self.log(ev.text)
+
+            # Reuse a SteamCMD process that is already logged in and waiting at its prompt
+            session = self.steamcmd_sessions.acquire(final_sc_path, cache)
+            self.active_processes.append(session)
+            try:
+                results = session.download_items(current_appid, mod_ids, on_event, self.stop_event)
+            finally:
+                if session in self.active_processes: self.active_processes.remove(session)
+                self.steamcmd_sessions.release(session)
             
-            last_log_time = 0
+            for mid, err in results.items():
+                if err and not self.stop_event.is_set():
+                    self.log(f"Download failed for {mid}: {err}", "error")
             
-            while True:
-                if self.stop_event.is_set():
-                    p.terminate()
-                    break
-                line = p.stdout.readline()
-                if not line:
-                    break
-                
-                clean = line.strip()
-                if clean:
-                    # Regex for SteamCMD progress: "progress: 23.45"
-                    progress_match = re.search(r'progress:\s*(\d+\.\d+)', clean)
-                    
-                    current_time = datetime.now().timestamp()
-                    
-                    if "Success. Downloaded item" in clean:
-                        completed_count += 1
-                        self.log(f"Success: {clean.split('item')[-1].strip()} ({completed_count}/{total_items})", "success")
-                        self.root.after(0, lambda c=completed_count, t=total_items: self.update_batch_progress(0, c, t))
-                    elif "Error" in clean or "Failed" in clean:
-                        self.log(clean, "error")
-                    elif progress_match:
-                        val = float(progress_match.group(1))
-                        self.root.after(0, lambda v=val, c=completed_count, t=total_items: self.update_batch_progress(v, c, t))
-                    elif "Verifying" in clean:
-                        self.root.after(0, lambda c=completed_count, t=total_items: self.dl_btn.config(text=f"VERIFYING {c+1}/{t}..."))
-                    elif "Update state" not in clean:
-                        # Throttle "Downloading" and "Extracting" spam
-                        if "Downloading" in clean or "Extracting" in clean:
-                            if current_time - last_log_time > 1.0: # Log at most once per second
-                                self.log(clean)
-                                last_log_time = current_time
-                        else:
-                            self.log(clean)
-
-            p.wait()
-            if p in self.active_processes: self.active_processes.remove(p)
+            # Updated mods keep their folder (and so the parent mtime); drop the stored listing
+            self.scanner.invalidate(os.path.join(cache, "steamapps", "workshop", "content", current_appid))
+
+            # Once deduplication is in use, fold the new files into the store before deploying them
+            if self.config.get("dedup_cache") and not self.stop_event.is_set():
+                content_dir = os.path.join(cache, "steamapps", "workshop", "content", current_appid)
+                try: self.run_dedup(cache, [os.path.join(content_dir, mid) for mid in mod_ids])
+                except Exception as e: self.log(f"Dedup failed: {e}", "warning")
 
             # Process Links for all items
+            sync_total = SyncStats()
             for mid in mod_ids:
                 src = os.path.normpath(os.path.join(cache, "steamapps/workshop/content", current_appid, mid))
                 dst = os.path.normpath(os.path.join(game_path, "mods", mid))
                 
                 if os.path.exists(src):
-                    if not os.path.exists(os.path.dirname(dst)): os.makedirs(os.path.dirname(dst))
-                    if use_physical:
-                        if os.path.exists(dst): shutil.rmtree(dst)
-                        shutil.copytree(src, dst)
-                    else:
-                        if not os.path.lexists(dst): 
-                            try:
-                                subprocess.run(f'mklink /J "{dst}" "{src}"', shell=True, timeout=10)
-                            except subprocess.TimeoutExpired:
-                                self.log(f"Link creation timed out for {mid}", "error")
-                            except Exception as e:
-                                self.log(f"Link creation failed for {mid}: {e}", "error")
+                    try:
+                        # Only files that changed are placed (copied, hardlinked or cloned); see bzengine.sync
+                        stats = deploy_mod(src, dst, deploy_mode, **self.sync_options())
+                    except subprocess.TimeoutExpired:
+                        self.log(f"Link creation timed out for {mid}", "error")
+                        continue
+                    except Exception as e:
+                        self.log(f"Link creation failed for {mid}: {e}", "error")
+                        continue
+                    if stats:
+                        for err in stats.errors[:5]: self.log(f"Sync error in {mid}: {err}", "error")
+                        sync_total.add(stats)
+                        if not stats.ok:
+                            reason = "stopped" if stats.stopped else f"{len(stats.errors)} file(s) could not be placed"
+                            self.log(f"Deployment failed for {mid} ({reason}).", "error")
+                            continue
+                        self.log(f"Synced {mid}: {stats.summary()}")
                     self.log(f"Deployment complete: {mid}", "success")
+            if sync_total.skipped_bytes:
+                self.log(f"Incremental copy skipped {format_bytes(sync_total.skipped_bytes)} of unchanged files.", "info")
             
-            self.root.after(0, lambda: self.dl_btn.config(text="DEPLOYED"))
-            self.root.after(3000, lambda: self.dl_btn.config(text="INSTALL MOD", state="normal"))
+            deployed = "DEPLOY FAILED" if not sync_total.ok else "DEPLOYED"
+            self.ui.post_latest("dl_btn", lambda: self.dl_btn.config(text=deployed))
+            self.ui.post(lambda: self.dl_btn.config(text="INSTALL MOD", state="normal"), 3000)
             
         except Exception as e: self.log(f"CRITICAL: {e}", "error")
         finally:
-            self.end_task(self.refresh_list if not self.stop_event.is_set() else None)
+            self.end_task(self.after_fs_change(mod_ids) if not self.stop_event.is_set() else None)
 
     def update_progress(self, value):
         self.progress.stop()
@@ -844,37 +1058,31 @@ class BZModMaster:
         if mid and len(mid) >= 8:
             threading.Thread(target=self.fetch_preview, args=(mid,), daemon=True).start()
     def open_workshop(self):
+        import webbrowser
         appid = self.games[self.current_game_key]["appid"]
         webbrowser.open(f"https://steamcommunity.com/app/{appid}/workshop/")
     def fetch_preview(self, mid):
         try:
-            url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={mid}&l=english"
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req) as r:
-                html = r.read().decode('utf-8')
-                
-                # VALIDATION: Check for Current Game App ID
-                target_appid = self.games[self.current_game_key]["appid"]
-                app_match = re.search(r'steamcommunity\.com/app/(\d+)', html)
-                current_app = app_match.group(1) if app_match else None
-                
-                if current_app and current_app != target_appid:
-                    self.is_valid_mod = False
-                    self.root.after(0, lambda: self.mod_name_label.config(text="INVALID GAME DETECTED", foreground="#ff0000"))
-                    return
-                
-                self.is_valid_mod = True
-                name = re.search(r'<div class="workshopItemTitle">(.*?)</div>', html)
-                thumb = re.search(r'id="ActualImage"\s+src="([^"]+)"', html)
-                if not thumb: thumb = re.search(r'<link rel="image_src" href="([^"]+)">', html)
-                title = name.group(1).strip() if name else f"ID: {mid}"
-                
-                self.root.after(0, lambda: self.mod_name_label.config(text=title, foreground=self.colors['accent']))
-                if HAS_PIL and thumb:
-                    with urllib.request.urlopen(thumb.group(1)) as i:
-                        img = Image.open(BytesIO(i.read())).resize((150, 150), Image.Resampling.LANCZOS)
-                        photo = ImageTk.PhotoImage(img)
-                        self.root.after(0, lambda p=photo: self.update_thumb(p))
+            # One page fetch covers validation, preview and the dependency check in start_download
+            page = self.workshop.get(mid)
+            
+            # VALIDATION: Check for Current Game App ID
+            target_appid = self.games[self.current_game_key]["appid"]
+            current_app = page.appid
+            
+            if current_app and current_app != target_appid:
+                self.is_valid_mod = False
+                self.ui.post(lambda: self.mod_name_label.config(text="INVALID GAME DETECTED", foreground="#ff0000"))
+                return
+            
+            self.is_valid_mod = True
+            title = page.title or f"ID: {mid}"
+            
+            self.ui.post(lambda: self.mod_name_label.config(text=title, foreground=self.colors['accent']))
+            if page.thumb_url:
+                # Pre-resized PNG from the thumbnail cache; Tk loads it without decoding work on the main thread
+                path = self.thumbs.get(mid, page.thumb_url, "preview")
+                if path: self.ui.post(lambda: self.update_thumb(tk.PhotoImage(file=path)))
         except Exception as e:
             self.log(f"Metadata Fetch Error: {e}", "error")
 
@@ -891,45 +1099,46 @@ class BZModMaster:
         except: pass
 
     def sanitize_id(self, input_str):
-        match = re.search(r'id=(\d+)', input_str)
-        return match.group(1) if match else (input_str.strip() if input_str.strip().isdigit() else None)
+        return parse_mod_id(input_str)
+
+    def initialize_engine(self, on_done=None):
+        """Checks the game and SteamCMD paths off the UI thread; on_done then runs on the UI thread."""
+        g = self.games[self.current_game_key]
+        game_exe = os.path.join(self.path_var.get(), g["exe"])
+        threading.Thread(target=self._check_engine, args=(g["name"], game_exe, self.steamcmd_var.get(), on_done),
+                         daemon=True).start()
 
-    def initialize_engine(self):
-        game_name = self.games[self.current_game_key]["name"]
+    def _check_engine(self, game_name, game_exe, steamcmd_path, on_done=None):
+        self.startup.mark("engine_check")
         self.log(f"{game_name} Engine Initializing...", "info")
         
         # Check Game Path - Logic adjusted for your test environment
-        game_exe = os.path.join(self.path_var.get(), self.games[self.current_game_key]["exe"])
         if not os.path.exists(game_exe):
             self.log("NOTICE: Executable not found. Running in Virtual/Test mode.", "warning")
-            self.path_entry.configure(foreground="#ffff44") # Yellow for "Mock Mode"
+            self.ui.post(lambda: self.path_entry.configure(foreground="#ffff44")) # Yellow for "Mock Mode"
         else:
             self.log(f"System Link Established: {game_exe}", "success")
-            self.path_entry.configure(foreground=self.colors['accent'])
+            self.ui.post(lambda: self.path_entry.configure(foreground=self.colors['accent']))
         
         # Check SteamCMD
-        if not os.path.exists(self.steamcmd_var.get()):
+        if not os.path.exists(steamcmd_path):
             self.log("WARNING: SteamCMD missing. Downloads disabled.", "warning")
-            self.steamcmd_entry.configure(foreground="#ffff44")
+            self.ui.post(lambda: self.steamcmd_entry.configure(foreground="#ffff44"))
         else:
             self.log("SteamCMD Binary: Verified.", "success")
 
         self.log("Ready for mod deployment.", "info")
+        if on_done: self.ui.post(on_done)
 
     def ensure_steamcmd(self, target):
         if not target:
             target = os.path.join(self.bin_dir, "steamcmd.exe")
-            self.root.after(0, lambda: self.steamcmd_var.set(target))
+            self.ui.post(lambda: self.steamcmd_var.set(target))
             
         if not os.path.exists(target):
-            target_dir = os.path.dirname(target)
-            self.log(f"SteamCMD missing. Downloading to {target_dir}...", "warning")
-            os.makedirs(target_dir, exist_ok=True)
-            zip_p = os.path.join(target_dir, "sc.zip")
+            self.log(f"SteamCMD missing. Downloading to {os.path.dirname(target)}...", "warning")
             try:
-                urllib.request.urlretrieve(STEAMCMD_URL, zip_p)
-                with zipfile.ZipFile(zip_p, 'r') as z: z.extractall(target_dir)
-                os.remove(zip_p)
+                install_steamcmd(target, self.http)
                 self.log("SteamCMD installed successfully.", "success")
             except Exception as e:
                 self.log(f"SteamCMD Setup Error: {e}", "error")
@@ -1058,11 +1267,21 @@ class BZModMaster:
             self.launch_btn.config(text="EXE MISSING")
             self.root.after(2000, lambda: self.launch_btn.config(text="LAUNCH GAME"))
     def auto_detect_gog(self, verbose=False):
+        found_path = self.find_game_install(self.current_game_key)
+        if found_path:
+            self.path_var.set(found_path)
+            self.save_config()
+            if verbose: messagebox.showinfo("Success", f"Game found at:\n{found_path}")
+        elif verbose:
+            messagebox.showwarning("Not Found", "Could not automatically locate GOG/Heroic installation.")
+
+    def find_game_install(self, game_key):
+        """Probes the registry (Windows) or the usual install folders (Linux); safe off the UI thread."""
         found_path = None
         
         if IS_WINDOWS and winreg:
             # Windows: Check registry
-            gog_ids = self.games[self.current_game_key].get("gog_ids", [])
+            gog_ids = self.games[game_key].get("gog_ids", [])
             for g_id in gog_ids:
                 for arch in ["SOFTWARE\\WOW6432Node", "SOFTWARE"]:
                     try:
@@ -1076,7 +1295,7 @@ class BZModMaster:
         elif IS_LINUX:
             # Linux: Check Heroic, Steam, and common GOG paths
             home = Path.home()
-            game_exe = self.games[self.current_game_key]["exe"]
+            game_exe = self.games[game_key]["exe"]
             
             candidates = [
                 # Heroic GOG installations
@@ -1095,15 +1314,18 @@ class BZModMaster:
                 if exe_path.exists():
                     found_path = str(path)
                     break
-        
-        if found_path:
-            self.path_var.set(found_path)
-            self.save_config()
-            if verbose: messagebox.showinfo("Success", f"Game found at:\n{found_path}")
-        elif verbose:
-            messagebox.showwarning("Not Found", "Could not automatically locate GOG/Heroic installation.")
+        return found_path
 
     def auto_detect_steamcmd(self, verbose=False):
+        p = self.find_steamcmd()
+        if p:
+            self.steamcmd_var.set(os.path.normpath(p))
+            self.save_config()
+            if verbose: messagebox.showinfo("Success", f"SteamCMD found at:\n{p}")
+            return
+        if verbose: messagebox.showwarning("Not Found", "Could not locate steamcmd.exe.\nPlease browse manually.")
+
+    def find_steamcmd(self):
         candidates = [
             os.path.join(self.bin_dir, "steamcmd.exe"),
             r"C:\steamcmd\steamcmd.exe",
@@ -1111,13 +1333,7 @@ class BZModMaster:
             os.path.expandvars(r"%ProgramFiles%\SteamCMD\steamcmd.exe"),
             os.path.join(os.getcwd(), "steamcmd.exe")
         ]
-        for p in candidates:
-            if os.path.exists(p):
-                self.steamcmd_var.set(os.path.normpath(p))
-                self.save_config()
-                if verbose: messagebox.showinfo("Success", f"SteamCMD found at:\n{p}")
-                return
-        if verbose: messagebox.showwarning("Not Found", "Could not locate steamcmd.exe.\nPlease browse manually.")
+        return next((p for p in candidates if os.path.exists(p)), None)
                 
     def on_tab_change(self, event):
         """Auto-refreshes the list when the user clicks the Manage tab."""
@@ -1125,47 +1341,159 @@ class BZModMaster:
             self.refresh_list()
 
     def sort_tree(self, col, reverse):
-        l = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
-        try:
-            l.sort(key=lambda t: int(t[0]) if t[0].isdigit() else t[0], reverse=reverse)
-        except ValueError:
-            l.sort(reverse=reverse)
-
-        for index, (val, k) in enumerate(l):
-            self.tree.move(k, '', index)
-
+        self.mod_list.set_sort(col, reverse)
         self.tree.heading(col, command=lambda: self.sort_tree(col, not reverse))
+        self.render_tree()
+
+    def on_filter_change(self, *args):
+        category = self.filter_var.get().lower()
+        if self.mod_list.set_filter(self.search_var.get(), category):
+            # Actions only ever apply to rows the user can see
+            self.mod_list.selection &= set(self.mod_list.view())
+            self.tree_first = 0
+            self.render_tree()
+
+    # --- VIRTUALIZED TREE ---
+
+    def tree_page_size(self):
+        # Rows that fit below the heading; 1 until the widget has been laid out
+        return max(1, (self.tree.winfo_height() - TREE_HEADING_HEIGHT) // TREE_ROW_HEIGHT)
+
+    def schedule_tree_render(self, event=None):
+        if self.tree_render_job is None:
+            self.tree_render_job = self.root.after_idle(self.render_tree)
+
+    def render_tree(self):
+        """Materializes the visible window of the mod list model into the Treeview.
+
+        Rows scrolled out of the window are deleted, rows scrolled in are
+        inserted and rows that stayed only get rewritten when their values,
+        tags or thumbnail changed since the last render.
+        """
+        if self.tree_render_job:
+            self.root.after_cancel(self.tree_render_job)
+            self.tree_render_job = None
+        view = self.mod_list.view()
+        page = self.tree_page_size()
+        self.tree_first = max(0, min(self.tree_first, len(view) - page))
+        window = view[self.tree_first:self.tree_first + page]
+        # Warm the rows one page above and below first, so the visible rows stay the most recently used
+        for mid in view[max(0, self.tree_first - page):self.tree_first] + view[self.tree_first + page:self.tree_first + 2 * page]:
+            self.row_image(mid)
+
+        wanted = set(window)
+        gone = [mid for mid in self.tree_rendered if mid not in wanted]
+        if gone:
+            self.tree.delete(*gone)
+            for mid in gone: del self.tree_rendered[mid]
+        for index, mid in enumerate(window):
+            row = self.mod_list.get(mid)
+            image = self.row_image(mid)
+            state = (tuple(row.values), tuple(row.tags), image)
+            prev = self.tree_rendered.get(mid)
+            if prev is None:
+                self.tree.insert("", index, iid=mid, values=row.values, tags=row.tags, image=image)
+            else:
+                if prev != state: self.tree.item(mid, values=row.values, tags=row.tags, image=image)
+                self.tree.move(mid, "", index)
+            self.tree_rendered[mid] = state
+
+        shown = [mid for mid in window if mid in self.mod_list.selection]
+        if set(self.tree.selection()) != set(shown): self.tree.selection_set(shown)
+        total = len(view)
+        if total: self.tree_scroll.set(self.tree_first / total, min(1.0, (self.tree_first + page) / total))
+        else: self.tree_scroll.set(0, 1)
+        count_text = f"{total} / {len(self.mod_list)} MODS"
+        if self.advanced_mode_var.get():
+            st = self.image_cache.stats()
+            count_text += f"  |  THUMBS {st['size']}/{st['capacity']}  HIT {st['hits']}  MISS {st['misses']}  EVICT {st['evictions']}"
+        self.list_count_lbl.config(text=count_text)
+        self.on_tree_scroll()
+
+    def scroll_tree_to(self, first):
+        if first == self.tree_first: return
+        self.tree_first = max(0, first)
+        self.render_tree()
+
+    def on_tree_yview(self, *args):
+        total = len(self.mod_list.view())
+        if args[0] == "moveto":
+            self.scroll_tree_to(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.scroll_tree_to(self.tree_first + (step * self.tree_page_size() if args[2] == "pages" else step))
+
+    def on_tree_wheel(self, event):
+        if event.num == 4: step = -3
+        elif event.num == 5: step = 3
+        else: step = -3 if event.delta > 0 else 3
+        self.scroll_tree_to(self.tree_first + step)
+        return "break"
+
+    def on_tree_key(self, event):
+        # Arrowing past the window edge scrolls the model; the class binding then moves the focus
+        window = self.tree.get_children()
+        focus = self.tree.focus()
+        if not window or focus not in window: return
+        if not event.state & 0x0001: self.mod_list.selection = {focus}
+        if event.keysym == "Up" and focus == window[0]: self.scroll_tree_to(self.tree_first - 1)
+        elif event.keysym == "Down" and focus == window[-1]: self.scroll_tree_to(self.tree_first + 1)
+
+    def on_tree_select(self, event=None):
+        # Off-screen rows keep their selection; the window reflects the widget's
+        shown = set(self.tree_rendered)
+        self.mod_list.selection = (self.mod_list.selection - shown) | set(self.tree.selection())
+
+    def selected_mods(self):
+        return self.mod_list.selected()
 
     def on_tree_press(self, event):
         item = self.tree.identify_row(event.y)
-        if item: self.selection_start = item
+        if not item: return
+        if event.state & 0x0001 and self.selection_start:
+            # Shift+Click: select through the model so the range can span off-screen rows
+            self.mod_list.select_range(self.selection_start, item)
+            self.render_tree()
+            return "break"
+        if not event.state & 0x0004: self.mod_list.selection = {item}
+        self.selection_start = item
 
     def on_tree_motion(self, event):
-        item = self.tree.identify_row(event.y)
-        if item and hasattr(self, 'selection_start') and self.selection_start:
-            if self.tree.identify_region(event.x, event.y) == "cell":
-                children = self.tree.get_children()
-                try:
-                    start_idx = children.index(self.selection_start)
-                    end_idx = children.index(item)
-                    if start_idx > end_idx: start_idx, end_idx = end_idx, start_idx
-                    self.tree.selection_set(children[start_idx : end_idx + 1])
-                except ValueError: pass
+        if not self.selection_start: return
+        # Dragging past the top/bottom edge scrolls and extends the selection to the edge row
+        above = event.y < TREE_HEADING_HEIGHT
+        if above or event.y > self.tree.winfo_height():
+            self.scroll_tree_to(self.tree_first + (-1 if above else 1))
+            window = self.tree.get_children()
+            item = (window[0] if above else window[-1]) if window else None
+        else:
+            item = self.tree.identify_row(event.y)
+            if self.tree.identify_region(event.x, event.y) != "cell": return
+        if item:
+            self.mod_list.select_range(self.selection_start, item)
+            self.render_tree()
 
     def show_mod_menu(self, event):
         item = self.tree.identify_row(event.y)
         if item:
-            if item not in self.tree.selection():
-                self.tree.selection_set(item)
+            if item not in self.mod_list.selection:
+                self.mod_list.selection = {item}
+                self.render_tree()
             self.mod_menu.post(event.x_root, event.y_root)
 
     def select_all_mods(self):
-        self.tree.selection_set(self.tree.get_children())
+        self.mod_list.selection = set(self.mod_list.view())
+        self.render_tree()
+
+    def refresh_list(self, force=False):
+        """Scans SteamCMD cache and determines if mods are 'enabled' in the test folder.
 
-    def refresh_list(self):
-        """Scans SteamCMD cache and determines if mods are 'enabled' in the test folder."""
+        Rows are drawn from the metadata store first; force=True revalidates every
+        entry against the Workshop instead of only the ones past their TTL.
+        """
         self.progress_label.config(text="SCANNING...", fg=self.colors['accent'])
-        self.image_cache.clear()
+        dropped = self.fetch_pool.cancel_pending()
+        if dropped: self.log(f"Cancelled {dropped} pending metadata fetches.")
         self.progress.config(mode="indeterminate"); self.progress.start(10)
         
         # Offload file system scanning to a background thread
@@ -1173,9 +1501,9 @@ class BZModMaster:
         game_path = self.path_var.get()
         
         self.start_task()
-        threading.Thread(target=self._refresh_scan_logic, args=(cache_path, game_path), daemon=True).start()
+        threading.Thread(target=self._refresh_scan_logic, args=(cache_path, game_path, force), daemon=True).start()
 
-    def _refresh_scan_logic(self, cache_path, game_path):
+    def _refresh_scan_logic(self, cache_path, game_path, force=False):
         try:
             base_cache = os.path.abspath(cache_path)
             game_dir = os.path.abspath(game_path)
@@ -1194,279 +1522,571 @@ class BZModMaster:
 
             if not os.path.exists(content_dir):
                 self.log(f"SCAN FAILED: No cache at {content_dir}", "error")
-                self.root.after(0, lambda: self._populate_tree([]))
+                self.ui.post(lambda: self._populate_tree([]))
                 return
 
             try:
-                mod_ids = [d for d in os.listdir(content_dir) if os.path.isdir(os.path.join(content_dir, d))]
-                self.log(f"Found {len(mod_ids)} assets in Steam cache.", "success")
+                # One scandir pass per folder; an unchanged cache folder is served from the scan index
+                entries = self.scanner.scan(content_dir, game_mods_dir)
+                self.log(f"Found {len(entries)} assets in Steam cache.", "success")
             except:
-                self.root.after(0, lambda: self._populate_tree([]))
+                self.ui.post(lambda: self._populate_tree([]))
                 return
 
             # Collect data to pass back to UI thread
             scan_data = []
-            for mid in mod_ids:
-                if self.stop_event.is_set(): return
-                mod_path = os.path.join(content_dir, mid)
-                link_path = os.path.join(game_mods_dir, mid)
-                
-                # Use lexists to see if the link is present in your test folder
-                is_enabled = os.path.lexists(link_path)
+            for mid, is_enabled, m_time in entries:
                 status = "ENABLED" if is_enabled else "DISABLED"
-                
-                try:
-                    m_time = os.path.getmtime(mod_path)
-                    dt = datetime.fromtimestamp(m_time).strftime('%Y-%m-%d')
-                except:
-                    m_time = 0
-                    dt = "Unknown"
-                
+                try: dt = datetime.fromtimestamp(m_time).strftime('%Y-%m-%d')
+                except: dt = "Unknown"
                 scan_data.append((mid, status, is_enabled, m_time, dt))
 
-            self.root.after(0, lambda: self._populate_tree(scan_data))
+            # Installed manifests/timestamps from SteamCMD's own bookkeeping drive the update check
+            self.workshop_dir = os.path.dirname(os.path.dirname(content_dir))
+            self.reload_installed_items()
+            self.ui.post(lambda: self._populate_tree(scan_data, force))
+            self.ui.post(lambda: self.ensure_watcher(content_dir, game_mods_dir))
         finally:
             self.end_task()
 
-    def _populate_tree(self, scan_data):
-        self.tree.delete(*self.tree.get_children())
-        
+    # --- LIVE FOLDER WATCHING ---
+
+    def ensure_watcher(self, content_dir, game_mods_dir):
+        """(Re)starts the folder watcher when the watched cache/mods folders change."""
+        if not self.config.get("watch_folders", True): return
+        w = self.watcher
+        if w and w.content_dir == content_dir and w.mods_dir == game_mods_dir: return
+        if w: w.stop()
+        self.watcher = None
+        if not (os.path.isdir(content_dir) and os.path.isdir(game_mods_dir)): return
+        self.watcher = FolderWatcher(content_dir, game_mods_dir, self.on_fs_events).start()
+        self.log(f"Watching mod folders ({self.watcher.backend}).")
+
+    def stop_watcher(self):
+        """Stops watching; called when the game or cache path changes and at exit."""
+        if self.watcher: self.watcher.stop()
+        self.watcher = None
+
+    def on_fs_events(self, events):
+        # Called on the watcher thread
+        self.ui.post(lambda: self.apply_fs_events(events))
+
+    def apply_fs_events(self, events):
+        """Applies per-mod add/remove/link/unlink events to the tree without a full rescan."""
+        if not self.watcher: return
+        content_dir, mods_dir = self.watcher.content_dir, self.watcher.mods_dir
+        for kind, mid in events:
+            if kind == "rescan":
+                self.refresh_list()
+                return
+            if not mid.isdigit(): continue
+            row = self.mod_list.get(mid)
+            if kind == "added":
+                try: m_time = os.path.getmtime(os.path.join(content_dir, mid))
+                except OSError: m_time = 0
+                self.upsert_tree_row(mid, os.path.lexists(os.path.join(mods_dir, mid)), m_time)
+            elif kind == "removed" and row:
+                self.mod_list.remove(mid)
+                self.image_cache.discard(mid)
+                self.schedule_tree_render()
+            elif kind in ("linked", "unlinked") and row:
+                row.enabled = kind == "linked"
+                self.update_row_status(mid)
+
+    def reload_installed_items(self):
+        """Re-reads appworkshop_<appid>.acf (a stat() when it has not changed since the last call)."""
+        if not self.workshop_dir: return
+        appid = self.games[self.current_game_key]["appid"]
+        self.installed_items = self.workshop_manifest.load(self.workshop_dir, appid)
+
+    def refresh_rows(self, mod_ids):
+        """Re-reads the given mods from disk and refreshes only their rows."""
+        if not self.watcher:
+            self.refresh_list()
+            return
+        self.reload_installed_items()
+        content_dir, mods_dir = self.watcher.content_dir, self.watcher.mods_dir
+        for mid in mod_ids:
+            try: m_time = os.path.getmtime(os.path.join(content_dir, mid))
+            except OSError: continue
+            self.upsert_tree_row(mid, os.path.lexists(os.path.join(mods_dir, mid)), m_time)
+
+    def upsert_tree_row(self, mid, is_enabled, m_time):
+        row = self.mod_list.get(mid)
+        status = "ENABLED" if is_enabled else "DISABLED"
+        try: dt = datetime.fromtimestamp(m_time).strftime('%Y-%m-%d')
+        except: dt = "Unknown"
+        if row:
+            row.enabled, row.m_time = is_enabled, m_time
+            self.apply_row_update(mid, {"Date": dt})
+            self.update_row_status(mid)
+        else:
+            self.insert_tree_row(mid, is_enabled, m_time, dt)
+        self.fetch_pool.submit(mid, self.fetch_mod_info_for_tree, mid, mid, m_time, status, False, priority=0)
+        self.schedule_fetch_report()
+
+    def insert_tree_row(self, mid, is_enabled, m_time, dt):
+        """Adds a placeholder row for a mod and fills it from the metadata store when possible."""
+        status = "ENABLED" if is_enabled else "DISABLED"
+        row = self.mod_list.insert(mid, ("Fetching...", mid, f"{status} (Checking...)", "Checking...", dt),
+                                   ('active',) if is_enabled else ('inactive',), is_enabled, m_time)
+        cached = self.meta_store.get(mid)
+        if cached: self.show_cached_mod_info(mid, mid, cached, m_time, status)
+        self.schedule_tree_render()
+        return row
+
+    def update_row_status(self, mid):
+        """Recomputes Status/Version and the enabled/outdated tags of one row from the metadata store."""
+        row = self.mod_list.get(mid)
+        if not row: return
+        base = "ENABLED" if row.enabled else "DISABLED"
+        meta = self.meta_store.get(mid)
+        if meta:
+            status, version, outdated = self.describe_mod_status(meta, row.m_time, base, mid)
+            self.mod_list.set_cells(mid, {"Status": status, "Version": version})
+        else:
+            outdated = False
+            self.mod_list.set_cells(mid, {"Status": f"{base} (Checking...)"})
+        self.mod_list.set_tags(mid, ['active' if row.enabled else 'inactive'] + (['update_needed'] if outdated else []))
+        self.schedule_tree_render()
+
+    def after_fs_change(self, mod_ids=None):
+        """Callback for workers that changed mod folders: the watcher covers links, downloads need a row refresh."""
+        if not self.watcher:
+            return self.refresh_list
+        if mod_ids:
+            return lambda: self.refresh_rows(mod_ids)
+        return None
+
+    def _populate_tree(self, scan_data, force=False):
+        """Reconciles the tree with a scan result, keyed by mod ID.
+
+        Vanished rows are removed, new ones inserted and existing rows only get
+        the cells that changed, so selection, scroll position, sort order and
+        loaded thumbnails survive a refresh.
+        """
+        self.tree_generation += 1
+        seen = {entry[0] for entry in scan_data}
+        for mid in [m for m in self.mod_list.rows if m not in seen]:
+            self.mod_list.remove(mid)
+            self.image_cache.discard(mid)
+
+        rows = []
         for mid, status, is_enabled, m_time, dt in scan_data:
-            display_status = f"{status} (Checking...)"
-            
-            item = self.tree.insert("", "end", values=("Fetching...", mid, display_status, "Checking...", dt))
-            
-            if is_enabled:
-                self.tree.item(item, tags=('active',))
+            row = self.mod_list.get(mid)
+            if row:
+                changed = row.enabled != is_enabled or row.m_time != m_time
+                if changed:
+                    row.enabled, row.m_time = is_enabled, m_time
+                    self.mod_list.set_cells(mid, {"Date": dt})
+                    self.update_row_status(mid)
+                meta = self.meta_store.get(mid) or {}
+                missing_thumb = HAS_PIL and meta.get("thumb_url") and not self.has_cached_icon(mid, meta)
+                if not (changed or force or missing_thumb or not self.meta_store.is_fresh(mid)): continue
             else:
-                self.tree.item(item, tags=('inactive',))
-
-            threading.Thread(target=self.fetch_mod_info_for_tree, args=(item, mid, m_time, status), daemon=True).start()
+                self.insert_tree_row(mid, is_enabled, m_time, dt)
+            rows.append((mid, mid, m_time, status))
 
+        self.render_tree()
         self.root.after(0, self.update_tree_tags)
-
-    def safe_tree_set(self, item, col, value):
-        try:
-            if self.tree.exists(item):
-                self.tree.set(item, col, value)
-        except tk.TclError:
-            pass
-
-    def add_tag(self, item, tag):
-        if self.tree.exists(item):
-            tags = list(self.tree.item(item, "tags"))
-            if tag not in tags:
-                tags.append(tag)
-                self.tree.item(item, tags=tags)
-
-    def set_tree_image(self, item, raw_data, mid):
-        if not self.tree.exists(item): return
-        try:
-            img = Image.open(BytesIO(raw_data))
-            img.thumbnail((36, 36), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.image_cache[mid] = photo
-            self.tree.item(item, image=photo)
-        except Exception: pass
-
-    def fetch_mod_info_for_tree(self, item, mid, local_ts, base_status):
-        """Fetches mod name and checks for updates."""
+        
+        # Stale metadata is resolved in bulk through the Web API before the per-row jobs run
+        stale = [mid for _, mid, _, _ in rows if force or not self.meta_store.is_fresh(mid)]
+        if not rows:
+            self.log("Mod list is up to date.")
+        elif stale:
+            self.fetch_pool.submit("__api_batch__", self.fetch_metadata_batch, rows, stale, self.tree_generation, priority=0)
+        else:
+            self.queue_row_fetches(rows, set(), self.tree_generation)
+        self.schedule_fetch_report()
+
+    def fetch_metadata_batch(self, rows, stale, generation):
+        """Refreshes stale metadata with chunked GetPublishedFileDetails calls; misses fall back to page scraping."""
+        api_url = self.config.get("steam_api_url", steam_api.PUBLISHED_FILE_DETAILS_URL)
+        found = steam_api.get_published_file_details(
+            stale, url=api_url, on_error=lambda chunk, e: self.log(f"Workshop API request failed ({len(chunk)} items): {e}", "warning"))
+        for mid, meta in found.items():
+            self.meta_store.update(mid, **meta)
+        
+        requests_sent = (len(stale) + steam_api.BATCH_SIZE - 1) // steam_api.BATCH_SIZE
+        self.log(f"Workshop API: {len(found)}/{len(stale)} items resolved in {requests_sent} request(s).")
+        missing = set(stale) - set(found)
+        self.ui.post(lambda: self.queue_row_fetches(rows, missing, generation))
+
+    def queue_row_fetches(self, rows, scrape_ids, generation):
+        """Queues per-row jobs (thumbnail, status, and page scraping for scrape_ids) in row order."""
+        if generation != self.tree_generation: return
+        for index, (item, mid, m_time, status) in enumerate(rows):
+            self.fetch_pool.submit(mid, self.fetch_mod_info_for_tree, item, mid, m_time, status, mid in scrape_ids, priority=index + 1)
+        self.prioritize_visible_rows()
+
+    def on_tree_scroll(self, *args):
+        # Debounce: re-prioritize once scrolling settles rather than on every wheel tick
+        if self.visible_prio_job: self.root.after_cancel(self.visible_prio_job)
+        self.visible_prio_job = self.root.after(150, self.prioritize_visible_rows)
+
+    def prioritize_visible_rows(self):
+        """Moves pending metadata fetches for on-screen rows to the front of the pool queue."""
+        self.visible_prio_job = None
+        if not self.fetch_pool.is_busy(): return
+        view = self.mod_list.view()
+        start = max(0, self.tree_first - 2)
+        self.fetch_pool.promote(view[start:self.tree_first + self.tree_page_size() + 2])
+
+    def schedule_fetch_report(self):
+        if self.fetch_report_job is None:
+            self.fetch_report_job = self.root.after(2000, self.report_fetch_progress)
+
+    def report_fetch_progress(self):
+        """Logs metadata queue depth and throughput while the fetch pool is busy."""
+        self.fetch_report_job = None
+        if self.fetch_pool.is_busy():
+            st = self.fetch_pool.stats()
+            failed = f", {st['failed']} failed" if st['failed'] else ""
+            self.log(f"Metadata queue: {st['pending']} pending, {st['active']} active, {st['done']} done{failed} ({st['rate']:.1f}/s)")
+            self.schedule_fetch_report()
+            return
+        last = self.fetch_pool.pop_last_batch()
+        if last:
+            done, failed, secs = last
+            self.log(f"Metadata fetch finished: {done} items in {secs:.1f}s ({done / secs if secs else 0:.1f}/s)"
+                     + (f", {failed} failed" if failed else ""), "warning" if failed else None)
+
+    def apply_row_update(self, item, cells, tags=()):
+        """Applies every pending cell and tag change for one row to the model; the window re-renders once."""
+        changed = self.mod_list.set_cells(item, cells) if cells else False
+        if tags: changed = self.mod_list.add_tags(item, tags) or changed
+        if changed and (item in self.tree_rendered or self.mod_list.query or self.mod_list.sort or self.mod_list.category != "all"):
+            self.schedule_tree_render()
+
+    def set_tree_image(self, item, path, mid):
+        # A new thumbnail landed on disk; on-screen rows pick it up on the next render
+        self.image_cache.discard(mid)
+        if mid in self.tree_rendered: self.schedule_tree_render()
+
+    def row_image(self, mid):
+        """PhotoImage for a row from the LRU, loading the cached PNG on a miss ("" when there is none)."""
+        def load():
+            url = (self.meta_store.get(mid) or {}).get("thumb_url")
+            path = url and self.thumbs.lookup(mid, url, "icon")
+            if not path: return None
+            try: return tk.PhotoImage(file=path)
+            except tk.TclError: return None
+        return self.image_cache.get(mid, load) or ""
+
+    def describe_mod_status(self, meta, local_ts, base_status, mid=None):
+        """Returns (status, version, out_of_date) for a mod given its Workshop metadata.
+
+        Mods listed in SteamCMD's appworkshop ACF are compared exactly (manifest ID,
+        then update timestamp); only mods missing from it fall back to the folder date.
+        """
+        installed = self.installed_items.get(mid) if mid else None
+        if is_outdated(installed, meta, local_ts):
+            return f"{base_status} (OUT OF DATE)", f"Remote: {meta.get('remote_date', 'Unknown')}", True
+        return base_status, "UP TO DATE", False
+
+    def show_cached_mod_info(self, item, mid, meta, local_ts, base_status):
+        """Draws a tree row from stored metadata without touching the network."""
+        status, version, outdated = self.describe_mod_status(meta, local_ts, base_status, mid)
+        self.apply_row_update(item, {"Name": meta.get("title") or mid, "Version": version, "Status": status},
+                              ("update_needed",) if outdated else ())
+
+    def has_cached_icon(self, mid, meta):
+        url = meta.get("thumb_url")
+        return bool(url and self.thumbs.lookup(mid, url, "icon"))
+
+    def fetch_mod_info_for_tree(self, item, mid, local_ts, base_status, force=False):
+        """Fetches mod name and checks for updates, revalidating the metadata store."""
+        cached = self.meta_store.get(mid)
         try:
-            url = f"https://steamcommunity.com/sharedfiles/filedetails/?id={mid}&l=english"
-            req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0'})
-            with urllib.request.urlopen(req) as r:
-                html = r.read().decode('utf-8')
-                
-                name_match = re.search(r'<div class="workshopItemTitle">(.*?)</div>', html)
-                title = name_match.group(1).strip() if name_match else mid
-                
-                # Image Fetch
-                thumb_match = re.search(r'id="ActualImage"\s+src="([^"]+)"', html)
-                if not thumb_match: thumb_match = re.search(r'<link rel="image_src" href="([^"]+)">', html)
-                if HAS_PIL and thumb_match:
-                    try:
-                        with urllib.request.urlopen(thumb_match.group(1)) as i:
-                            raw = i.read()
-                        self.root.after(0, lambda: self.set_tree_image(item, raw, mid))
-                    except: pass
+            if cached and not force and self.meta_store.is_fresh(mid):
+                meta = cached
+            else:
+                meta = self.workshop.get(mid, refresh=force).to_meta()
 
-                # Check for "Updated" date on Steam
-                date_match = re.search(r'<(?:div|span) class="detailsStatRight">([^<]+)</(?:div|span)>', html)
-                remote_date_str = date_match.group(1).strip() if date_match else "Unknown"
-                
-                is_out_of_date = False
-                if remote_date_str != "Unknown":
-                    try:
-                        # Clean string: "23 Oct, 2016 @ 3:47pm" -> remove @
-                        clean_str = remote_date_str.replace("@", "").strip()
-                        r_dt = None
-                        
-                        # Manual English Month Map to bypass OS Locale issues
-                        months = {"Jan":1,"Feb":2,"Mar":3,"Apr":4,"May":5,"Jun":6,
-                                  "Jul":7,"Aug":8,"Sep":9,"Oct":10,"Nov":11,"Dec":12}
-                        
-                        try:
-                            # Parse: "23 Oct, 2016 3:47pm"
-                            parts = clean_str.replace(",", "").split()
-                            day = int(parts[0])
-                            month = months.get(parts[1], 1)
-                            
-                            # Handle missing year (current year)
-                            if ":" in parts[2]: # Format: 23 Oct 3:47pm
-                                year = datetime.now().year
-                                time_str = parts[2]
-                            else: # Format: 23 Oct 2016 3:47pm
-                                year = int(parts[2])
-                                time_str = parts[3]
-                                
-                            # Construct a locale-independent string for strptime
-                            dt_str = f"{year}-{month:02d}-{day:02d} {time_str}"
-                            r_dt = datetime.strptime(dt_str, "%Y-%m-%d %I:%M%p")
-                        except Exception: pass
-                        
-                        if r_dt:
-                            l_dt = datetime.fromtimestamp(local_ts)
-                            if r_dt.date() > l_dt.date():
-                                is_out_of_date = True
-                    except: pass
+            # Image Fetch
+            if meta.get("thumb_url") and not self.has_cached_icon(mid, meta):
+                path = self.thumbs.get(mid, meta["thumb_url"], "icon")
+                if path: self.ui.post(lambda: self.set_tree_image(item, path, mid))
 
-                final_status = base_status
-                if is_out_of_date:
-                    final_status = f"{base_status} (OUT OF DATE)"
-                    self.root.after(0, lambda: self.add_tag(item, "update_needed"))
-                    v_status = f"Remote: {remote_date_str}"
-                else:
-                    v_status = "UP TO DATE"
-                
-                self.root.after(0, lambda: self.safe_tree_set(item, "Name", title))
-                self.root.after(0, lambda: self.safe_tree_set(item, "Version", v_status))
-                self.root.after(0, lambda: self.safe_tree_set(item, "Status", final_status))
+            status, v_status, is_out_of_date = self.describe_mod_status(meta, local_ts, base_status, mid)
+            if is_out_of_date:
+                self.ui.add_tag(item, "update_needed")
+            self.ui.set_cells(item, Name=meta.get("title") or mid, Version=v_status, Status=status)
         except:
-            self.root.after(0, lambda: self.safe_tree_set(item, "Name", f"ID: {mid} (Fetch Error)"))
-            self.root.after(0, lambda: self.safe_tree_set(item, "Status", base_status))
+            # Keep showing the cached row if the revalidation failed; either way the pool counts a failure
+            if not cached: self.ui.set_cells(item, Name=f"ID: {mid} (Fetch Error)", Status=base_status)
+            return False
 
     def enable_mod(self):
-        """Creates a Junction link from the deep cache to the game folder for all selected mods."""
-        selected = self.tree.selection()
-        if not selected: return
-        
-        # Extract data on main thread
-        mods_to_enable = [str(self.tree.item(item)['values'][1]) for item in selected]
+        """Deploys the selected mods from the deep cache to the game folder (link, hardlinks, reflinks or copy)."""
+        mods_to_enable = self.selected_mods()
+        if not mods_to_enable: return
         cache_path = self.cache_var.get()
         game_path = self.path_var.get()
         
         self.start_task()
-        threading.Thread(target=self._enable_mod_worker, args=(mods_to_enable, cache_path, game_path), daemon=True).start()
+        threading.Thread(target=self._enable_mod_worker, args=(mods_to_enable, cache_path, game_path, self.deploy_mode()), daemon=True).start()
 
-    def _enable_mod_worker(self, mods, cache_path, game_path):
+    def _enable_mod_worker(self, mods, cache_path, game_path, deploy_mode="link"):
         try:
+            current_appid = self.games[self.current_game_key]["appid"]
+            kind = deploy_mode if deploy_mode != "link" else ("Junction" if IS_WINDOWS else "Symlink")
+            ops = []
             for mid in mods:
-                if self.stop_event.is_set(): break
-                current_appid = self.games[self.current_game_key]["appid"]
                 src = os.path.join(cache_path, "steamapps", "workshop", "content", current_appid, mid)
                 dst = os.path.join(game_path, "mods", mid)
-                
-                try:
-                    if not os.path.exists(os.path.dirname(dst)): os.makedirs(os.path.dirname(dst))
-                    if os.path.lexists(dst): continue
-                    
-                    if IS_WINDOWS:
-                        # Use Junction (/J) for best compatibility with game engines
-                        try:
-                            subprocess.run(f'mklink /J "{dst}" "{src}"', shell=True, check=True, capture_output=True, timeout=10)
-                            self.log(f"Mod {mid} enabled (Junction created).", "success")
-                        except subprocess.TimeoutExpired:
-                            self.log(f"Link creation timed out for {mid}", "error")
-                    else:
-                        # Linux: Use symbolic links
-                        os.symlink(src, dst, target_is_directory=True)
-                        self.log(f"Mod {mid} enabled (Symlink created).", "success")
-                except Exception as e:
-                    self.log(f"Link Error for {mid}: {e}", "error")
+                if os.path.lexists(dst): continue
+                if not os.path.isdir(src):
+                    self.log(f"Link Error for {mid}: not in the mod cache", "error")
+                    continue
+                ops.append(op_link(mid, src, dst, deploy_mode))
+
+            def on_item(mid, op, error):
+                if error: self.log(f"Link Error for {mid}: {error}", "error")
+                else: self.log(f"Mod {mid} enabled ({kind}).", "success")
+            self.run_journaled(ops, on_item)
+        except Exception as e:
+            self.log(f"Link Error: {e}", "error")
         finally:
-            self.end_task(self.refresh_list if not self.stop_event.is_set() else None)
+            self.end_task(self.after_fs_change() if not self.stop_event.is_set() else None)
 
     def disable_mod(self):
         """Disables all selected mods by removing their Junction links."""
-        selected = self.tree.selection()
-        if not selected: return
-        
-        mods_to_disable = [str(self.tree.item(item)['values'][1]) for item in selected]
+        mods_to_disable = self.selected_mods()
+        if not mods_to_disable: return
         game_path = self.path_var.get()
         self.start_task()
         threading.Thread(target=self._disable_mod_worker, args=(mods_to_disable, game_path), daemon=True).start()
 
     def _disable_mod_worker(self, mods, game_path):
         try:
-            for mid in mods:
-                if self.stop_event.is_set(): break
-                dst = os.path.join(game_path, "mods", mid)
-                
-                try:
-                    if os.path.lexists(dst):
-                        if IS_WINDOWS:
-                            # In Windows, 'os.rmdir' is the correct way to remove a Junction 
-                            # without deleting the contents of the source folder.
-                            if os.path.isdir(dst):
-                                os.rmdir(dst) 
-                            else:
-                                os.remove(dst) # Handle file symlinks
-                        else:
-                            # Linux: Remove symlink
-                            os.unlink(dst)
-                        self.log(f"Mod {mid} decoupled from game engine.", "info")
-                except Exception as e:
-                    self.log(f"DECOUPLE ERROR for {mid}: {e}", "error")
+            # Links are unlinked; hardlinked/reflinked/copied deployments are our own files
+            ops = [op_unlink(mid, os.path.join(game_path, "mods", mid)) for mid in mods
+                   if os.path.lexists(os.path.join(game_path, "mods", mid))]
+
+            def on_item(mid, op, error):
+                if error: self.log(f"DECOUPLE ERROR for {mid}: {error}", "error")
+                else: self.log(f"Mod {mid} decoupled from game engine.", "info")
+            self.run_journaled(ops, on_item)
+        except Exception as e:
+            self.log(f"DECOUPLE ERROR: {e}", "error")
         finally:
-            self.end_task(self.refresh_list if not self.stop_event.is_set() else None)
+            self.end_task(self.after_fs_change() if not self.stop_event.is_set() else None)
+
+    def run_journaled(self, ops, on_item=None):
+        """Runs link/unlink/delete ops as one journaled batch; a stopped batch is rolled back whole."""
+        result = self.journal.run(ops, on_item=on_item, **self.sync_options())
+        if result.cancelled: self.log("Batch stopped; the mod folders were restored to how they were.", "warning")
+        return result
+
+    def recover_journal(self):
+        """Offers to finish or undo batches a crash (or a closed window) interrupted."""
+        rollback = messagebox.askyesno(
+            "Interrupted Mod Batch",
+            "A batch of mod changes did not finish last time.\n\nUndo it and restore the mods folder?\n"
+            "(No finishes the batch instead.)")
+        self.start_task()
+        threading.Thread(target=self._recover_worker, args=(rollback,), daemon=True).start()
+
+    def _recover_worker(self, rollback):
+        try:
+            for txid, action in self.journal.recover(rollback=rollback):
+                self.log(f"Interrupted batch {txid} {action}.", "warning")
+        except Exception as e:
+            self.log(f"Journal recovery failed: {e}", "error")
+        finally:
+            self.end_task(self.after_fs_change())
+
+    def deploy_mode(self):
+        mode = self.deploy_mode_var.get().lower()
+        return mode if mode in DEPLOY_MODES else "link"
+
+    def sync_options(self, method=None):
+        options = {"verify_hash": bool(self.config.get("sync_verify_hash", False)),
+                   "max_workers": int(self.config.get("sync_workers", 4)), "stop_event": self.stop_event}
+        if method: options["method"] = method
+        return options
+
+    def resync_physical_mods(self):
+        """Brings every physically copied mod in the game folder back in line with the cache."""
+        cache_path = self.cache_var.get()
+        game_path = self.path_var.get()
+        appid = self.games[self.current_game_key]["appid"]
+        self.start_task()
+        method = self.deploy_mode() if self.deploy_mode() != "link" else "copy"
+        threading.Thread(target=self._resync_worker, args=(cache_path, game_path, appid, method), daemon=True).start()
+
+    def _resync_worker(self, cache_path, game_path, appid, method="copy"):
+        try:
+            content_dir = os.path.join(os.path.abspath(cache_path), "steamapps", "workshop", "content", appid)
+            mods_dir = os.path.join(os.path.abspath(game_path), "mods")
+            pairs = []
+            for mid in sorted(CacheScanner.scan_links(mods_dir)):
+                dst = os.path.join(mods_dir, mid)
+                src = os.path.join(content_dir, mid)
+                # Links already point at the cache; only real copies can drift
+                if mid.isdigit() and os.path.isdir(src) and os.path.isdir(dst) and not is_link(dst):
+                    pairs.append((mid, src, dst))
+            if not pairs:
+                self.log("No physical mod copies to resync.", "info")
+                return
+            self.log(f"Resyncing {len(pairs)} physical mod copies...", "info")
+            def on_item(mid, stats):
+                if stats.copied or stats.deleted or stats.errors: self.log(f"Synced {mid}: {stats.summary()}")
+                for err in stats.errors[:5]: self.log(f"Sync error in {mid}: {err}", "error")
+            total = resync_all(pairs, on_item=on_item, **self.sync_options(method))
+            self.log(f"Resync complete: {total.summary()}", "success" if not total.errors else "warning")
+        except Exception as e:
+            self.log(f"Resync failed: {e}", "error")
+        finally:
+            self.end_task()
+
+    def get_dedup_store(self, cache_path):
+        root = os.path.join(os.path.abspath(cache_path), "steamapps", "workshop", "content")
+        key = os.path.normcase(root)
+        if key not in self.dedup_stores:
+            self.dedup_stores[key] = DedupStore(root, max_workers=int(self.config.get("sync_workers", 4)))
+        return self.dedup_stores[key]
+
+    def run_dedup(self, cache_path, mod_dirs=None):
+        """Hardlinks identical files across cached mods; mod_dirs=None checks the whole cache."""
+        store = self.get_dedup_store(cache_path)
+        stats = store.run(mod_dirs, stop_event=self.stop_event)
+        for err in stats.errors[:5]: self.log(f"Dedup error: {err}", "error")
+        objects, size = store.store_usage()
+        msg = f"Dedup: {stats.files} files checked, {stats.hashed} hashed, {stats.linked} linked, {format_bytes(stats.reclaimed_bytes)} reclaimed"
+        if stats.gc_bytes: msg += f", {format_bytes(stats.gc_bytes)} of unused store objects freed"
+        self.log(f"{msg}. Store holds {objects} objects ({format_bytes(size)}).", "success" if stats.reclaimed_bytes else "info")
+        return stats
+
+    def dedup_cache(self):
+        """Runs a full deduplication pass over the Workshop cache and keeps it deduplicated after downloads."""
+        cache_path = self.cache_var.get()
+        if not os.path.isdir(os.path.join(cache_path, "steamapps", "workshop", "content")):
+            self.log("No Workshop cache to deduplicate.", "warning")
+            return
+        self.config["dedup_cache"] = True
+        self.save_config()
+        self.start_task()
+        threading.Thread(target=self._dedup_worker, args=(cache_path,), daemon=True).start()
+
+    def _dedup_worker(self, cache_path):
+        try:
+            self.log("--- DEDUPLICATING MOD CACHE ---", "info")
+            self.run_dedup(cache_path)
+        except Exception as e:
+            self.log(f"Dedup failed: {e}", "error")
+        finally:
+            self.end_task()
+
+    # --- PROFILES ---
+
+    def refresh_profile_choices(self):
+        self.profile_box.config(values=self.profiles.names(self.current_game_key))
+
+    def save_profile(self):
+        """Stores the mods currently deployed in the game folder under the typed profile name."""
+        name = self.profile_var.get().strip()
+        if not name:
+            self.log("Type a profile name first.", "warning")
+            return
+        mod_ids = deployed_mods(os.path.join(self.path_var.get(), "mods"))
+        self.profiles.save(self.current_game_key, name, mod_ids)
+        self.save_config()
+        self.refresh_profile_choices()
+        self.log(f"Profile {name} saved with {len(mod_ids)} enabled mod(s).", "success")
+
+    def delete_profile(self):
+        name = self.profile_var.get().strip()
+        if self.profiles.get(self.current_game_key, name) is None: return
+        if not messagebox.askyesno("Delete Profile", f"Delete profile {name}?"): return
+        self.profiles.delete(self.current_game_key, name)
+        self.save_config()
+        self.profile_var.set("")
+        self.refresh_profile_choices()
+        self.log(f"Profile {name} deleted.", "info")
+
+    def apply_profile(self):
+        """Makes the selected profile's mods the enabled set, touching only links that differ."""
+        name = self.profile_var.get().strip()
+        wanted = self.profiles.get(self.current_game_key, name)
+        if wanted is None:
+            self.log(f"No profile named {name!r}." if name else "Pick a profile first.", "warning")
+            return
+        self.start_task()
+        threading.Thread(target=self._apply_profile_worker, daemon=True,
+                         args=(name, wanted, self.cache_var.get(), self.path_var.get(),
+                               self.games[self.current_game_key]["appid"], self.deploy_mode())).start()
+
+    def _apply_profile_worker(self, name, wanted, cache_path, game_path, appid, mode):
+        changed = []
+        try:
+            content_dir = os.path.join(os.path.abspath(cache_path), "steamapps", "workshop", "content", appid)
+            mods_dir = os.path.join(os.path.abspath(game_path), "mods")
+            os.makedirs(mods_dir, exist_ok=True)
+            try: cached = set(self.scanner.scan_content(content_dir))
+            except OSError: cached = set()
+            plan = plan_profile(wanted, deployed_mods(mods_dir), cached)
+            for mid in plan.missing: self.log(f"Profile {name}: {mid} is not in the cache, download it first.", "warning")
+            if not (plan.enable or plan.disable):
+                self.log(f"Profile {name} is already active.", "success")
+                return
+            self.log(f"Applying profile {name}: {len(plan.enable)} to enable, {len(plan.disable)} to disable...", "info")
+            def on_item(mid, op, error):
+                if error: self.log(f"Profile {name}: could not {'enable' if op == 'link' else 'disable'} {mid}: {error}", "error")
+            result = apply_plan(plan, content_dir, mods_dir, mode, journal=self.journal, on_item=on_item, **self.sync_options())
+            if result.cancelled:
+                self.log(f"Profile {name} stopped; the mods folder was restored.", "warning")
+                return
+            changed = result.done
+            self.log(f"Profile {name} applied ({len(changed)} change(s)).", "success")
+        except Exception as e:
+            self.log(f"Profile apply failed: {e}", "error")
+        finally:
+            # One incremental update for the changed rows instead of a refresh per operation
+            self.end_task(self.after_fs_change(changed) if changed and not self.stop_event.is_set() else None)
 
-    def is_junction(self, path):
-        """Helper to detect if a directory is a Windows Junction or Linux symlink."""
-        if IS_WINDOWS and ctypes:
-            return bool(os.path.isdir(path) and (ctypes.windll.kernel32.GetFileAttributesW(path) & 0x400))
-        else:
-            return os.path.islink(path)
     def update_all_mods(self):
         """Batch triggers SteamCMD for every item currently in the list."""
-        items = self.tree.get_children()
-        if not items:
+        if not len(self.mod_list):
             self.log("No mods detected in cache for update.", "warning")
             return
         
-        to_update = []
-        for item in items:
-            if "update_needed" in self.tree.item(item, "tags"):
-                to_update.append(str(self.tree.item(item)['values'][1]))
+        outdated = self.mod_list.tagged("update_needed")
+        to_update = [mid for mid in self.mod_list.rows if mid in outdated]
         
         if not to_update:
             self.log("All mods are up to date.", "success")
             return
 
         self.log(f"Initializing batch update for {len(to_update)} mods...", "info")
-        
-        sc_path = self.steamcmd_var.get()
-        cache_path = self.cache_var.get()
-        game_path = self.path_var.get()
-        use_physical = self.use_physical_var.get()
-        
-        for mid in to_update:
-            self.start_task()
-            threading.Thread(target=self.download_logic, args=(mid, sc_path, cache_path, game_path, use_physical), daemon=True).start()
+        self.queue_download(to_update)
 
     def delete_mod_physically(self):
         """Wipes the selected mods from the SteamCMD cache and breaks any links."""
-        selected = self.tree.selection()
+        selected = self.selected_mods()
         if not selected: return
 
         count = len(selected)
         if count == 1:
-            mid = str(self.tree.item(selected[0])['values'][1])
+            mid = selected[0]
             prompt_message = f"Permanently delete Mod ID {mid} from disk?"
         else:
             prompt_message = f"Permanently delete {count} selected mods from disk?"
 
+        # Warn when other cached mods still require what is being deleted
+        selected_ids = set(selected)
+        cached_ids = set(self.mod_list.rows)
+        dependents = set()
+        for mid in selected_ids:
+            dependents |= self.dep_graph.dependents(mid)
+        dependents = (dependents & cached_ids) - selected_ids
+        if dependents:
+            prompt_message += f"\n\n{len(dependents)} other installed mod(s) depend on this: {', '.join(sorted(dependents)[:5])}"
+
         if messagebox.askyesno("TERMINATE ASSET(S)", prompt_message):
-            mods_to_delete = [str(self.tree.item(item)['values'][1]) for item in selected]
+            mods_to_delete = list(selected)
             cache_path = self.cache_var.get()
             game_path = self.path_var.get()
             self.start_task()
@@ -1474,52 +2094,42 @@ class BZModMaster:
 
     def _delete_mod_worker(self, mods, cache_path, game_path):
         try:
+            current_appid = self.games[self.current_game_key]["appid"]
+            ops = []
             for mid in mods:
-                    if self.stop_event.is_set(): break
-                    # 1. Break Link
-                    link_path = os.path.join(game_path, "mods", mid)
-                    if os.path.lexists(link_path):
-                        try:
-                            if os.path.isdir(link_path):
-                                os.rmdir(link_path)
-                            else:
-                                os.remove(link_path)
-                        except Exception as e:
-                            self.log(f"Note: Could not remove link for {mid} during purge: {e}", "warning")
-
-                    # 2. Delete Folder from cache
-                    current_appid = self.games[self.current_game_key]["appid"]
-                    mod_cache_path = os.path.join(cache_path, "steamapps/workshop/content", current_appid, mid)
-                    try:
-                        if os.path.exists(mod_cache_path):
-                            shutil.rmtree(mod_cache_path)
-                            self.log(f"Asset {mid} purged from local storage.", "warning")
-                    except Exception as e:
-                        self.log(f"Purge Error for {mid}: {e}", "error")
-                
+                # 1. Break Link, 2. Delete Folder from cache; both renamed away first, then deleted in parallel
+                link_path = os.path.join(game_path, "mods", mid)
+                mod_cache_path = os.path.join(cache_path, "steamapps/workshop/content", current_appid, mid)
+                if os.path.lexists(link_path): ops.append(op_unlink(mid, link_path))
+                if os.path.exists(mod_cache_path): ops.append(op_delete(mid, mod_cache_path))
+
+            def on_item(mid, op, error):
+                if op == "unlink":
+                    if error: self.log(f"Note: Could not remove link for {mid} during purge: {error}", "warning")
+                elif error: self.log(f"Purge Error for {mid}: {error}", "error")
+                else: self.log(f"Asset {mid} purged from local storage.", "warning")
+            self.run_journaled(ops, on_item)
+        except Exception as e:
+            self.log(f"Purge Error: {e}", "error")
         finally:
-            self.end_task(self.refresh_list if not self.stop_event.is_set() else None)
+            self.end_task(self.after_fs_change() if not self.stop_event.is_set() else None)
 
     def update_selected_mod(self, force=False):
         """Triggers a re-download via SteamCMD for the selected mods."""
-        selected = self.tree.selection()
+        selected = self.selected_mods()
         if not selected: return
-        for item in selected:
-            mid = str(self.tree.item(item)['values'][1])
+        to_update = []
+        for mid in selected:
+            row = self.mod_list.get(mid)
             
-            if not force and "update_needed" not in self.tree.item(item, "tags"):
+            if not force and (not row or "update_needed" not in row.tags):
                 self.log(f"Mod {mid} is up to date.", "info")
                 continue
 
             self.log(f"Updating mod {mid}...", "info")
-            
-            sc_path = self.steamcmd_var.get()
-            cache_path = self.cache_var.get()
-            game_path = self.path_var.get()
-            use_physical = self.use_physical_var.get()
-            
-            self.start_task()
-            threading.Thread(target=self.download_logic, args=(mid, sc_path, cache_path, game_path, use_physical), daemon=True).start()
+            to_update.append(mid)
+        
+        if to_update: self.queue_download(to_update)
 if __name__ == "__main__":
     root = TkinterDnD.Tk() if HAS_DND else tk.Tk()
     app = BZModMaster(root)
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# cmd.py shares its name with the stdlib module pdb imports, so the source tree goes
+# after the stdlib on sys.path (python -m pytest puts it first); bzengine still imports from it
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != ROOT] + [ROOT]
+sys.modules.pop("cmd", None)
@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bzengine import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTENT = os.path.join("cache", "steamapps", "workshop", "content", "301650")
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f: f.write(data)
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """A portable install: config with relative paths, a cache with two mods and an empty game folder.
+
+    The GUI and the CLI keep their state files in the working directory, so the test runs inside it.
+    """
+    monkeypatch.chdir(tmp_path)
+    for mid in ("1300485418", "2097458372"):
+        write(str(tmp_path / CONTENT / mid / "mod.ini"), f"[WORKSHOP] {mid}")
+        write(str(tmp_path / CONTENT / mid / "maps" / "a.bzn"), mid * 10)
+    (tmp_path / "game").mkdir()
+    with open(tmp_path / "bz_mod_config.json", 'w') as f:
+        json.dump({"cache_path": "cache", "path_BZ98R": "game", "deploy_mode": "copy", "last_game": "BZ98R"}, f)
+    return tmp_path
+
+
+def run(base, *argv):
+    return cli.main(list(argv), base_dir=str(base))
+
+
+def listing(base, capsys):
+    capsys.readouterr()
+    assert run(base, "list", "--json") == cli.EXIT_OK
+    return {row["id"]: row for row in json.loads(capsys.readouterr().out)}
+
+
+def test_list_shows_cached_mods_and_their_state(base, capsys):
+    rows = listing(base, capsys)
+    assert sorted(rows) == ["1300485418", "2097458372"]
+    assert not any(r["enabled"] for r in rows.values())
+    assert run(base, "list") == cli.EXIT_OK
+    out = capsys.readouterr().out
+    assert "1300485418  DISABLED" in out
+
+
+def test_enable_and_disable_go_through_the_journal(base, capsys):
+    mods = base / "game" / "mods"
+    assert run(base, "enable", "1300485418") == cli.EXIT_OK
+    assert (mods / "1300485418" / "mod.ini").read_text() == "[WORKSHOP] 1300485418"
+    assert not os.path.islink(str(mods / "1300485418"))  # copy mode from the config
+    assert run(base, "enable", "2097458372", "--mode", "link") == cli.EXIT_OK
+    assert os.path.islink(str(mods / "2097458372"))
+    rows = listing(base, capsys)
+    assert (rows["1300485418"]["deploy"], rows["2097458372"]["deploy"]) == ("copy", "link")
+
+    assert run(base, "disable", "1300485418") == cli.EXIT_OK
+    assert sorted(os.listdir(str(mods))) == ["2097458372"]
+    assert run(base, "disable", "--all") == cli.EXIT_OK
+    assert os.listdir(str(mods)) == []
+    assert sorted(os.listdir(str(base / CONTENT))) == ["1300485418", "2097458372"]  # cache untouched
+    assert not os.listdir(str(base / "bz_journal"))
+
+
+def test_enable_reports_mods_that_are_not_cached(base, capsys):
+    assert run(base, "enable", "1300485418", "1111") == cli.EXIT_FAILED
+    assert "1111 is not in the cache" in capsys.readouterr().err
+    assert os.listdir(str(base / "game" / "mods")) == ["1300485418"]
+
+
+def test_verify_finds_and_fixes_drifted_copies_and_broken_links(base, capsys):
+    mods = base / "game" / "mods"
+    run(base, "enable", "--all")
+    assert run(base, "verify") == cli.EXIT_OK
+    write(str(mods / "1300485418" / "extra.txt"), "added by hand")
+    os.symlink(str(base / "missing"), str(mods / "3333"), target_is_directory=True)
+    capsys.readouterr()
+    assert run(base, "verify") == cli.EXIT_FAILED
+    err = capsys.readouterr().err
+    assert "1300485418: copy differs from the cache (0 changed, 0 missing, 1 extra)" in err
+    assert "3333: broken link" in err
+    assert run(base, "verify", "--fix") == cli.EXIT_OK
+    assert not (mods / "1300485418" / "extra.txt").exists() and not os.path.lexists(str(mods / "3333"))
+    assert run(base, "verify", "--hash") == cli.EXIT_OK
+
+
+def test_profile_save_writes_the_config_and_keeps_paths_relative(base, capsys):
+    run(base, "enable", "2097458372")
+    assert run(base, "profile", "save", "Campaign") == cli.EXIT_OK
+    assert run(base, "profile", "save", "Everything", "1300485418", "2097458372") == cli.EXIT_OK
+    with open(base / "bz_mod_config.json") as f: config = json.load(f)
+    assert config["profiles"]["BZ98R"] == {"Campaign": ["2097458372"], "Everything": ["1300485418", "2097458372"]}
+    assert (config["cache_path"], config["path_BZ98R"]) == ("cache", "game")
+
+    assert run(base, "profile", "apply", "Everything") == cli.EXIT_OK
+    assert sorted(os.listdir(str(base / "game" / "mods"))) == ["1300485418", "2097458372"]
+    assert run(base, "profile", "delete", "Campaign") == cli.EXIT_OK
+    with open(base / "bz_mod_config.json") as f: assert list(json.load(f)["profiles"]["BZ98R"]) == ["Everything"]
+    assert run(base, "profile", "show", "Campaign") == cli.EXIT_FAILED
+
+
+def test_setup_and_usage_errors_have_their_exit_codes(base, capsys):
+    with open(base / "bz_mod_config.json", 'w') as f: json.dump({"cache_path": "cache"}, f)
+    assert run(base, "enable", "1300485418") == cli.EXIT_CONFIG
+    assert "no game folder configured" in capsys.readouterr().err
+    assert run(base, "enable", "not-an-id", "--game-path", "game") == cli.EXIT_USAGE
+    with pytest.raises(SystemExit) as e: run(base, "disable")
+    assert e.value.code == cli.EXIT_USAGE
+
+
+def test_subcommands_never_import_tkinter_or_pillow(base):
+    # Started the way users run it; -X importtime logs every module the interpreter loads
+    proc = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "cmd.py"), "list", "--json",
+                           "--cache", str(base / "cache"), "--game-path", str(base / "game")],
+                          cwd=str(base), capture_output=True, text=True, timeout=60)
+    assert proc.returncode == cli.EXIT_OK, proc.stderr[-500:]
+    assert len(json.loads(proc.stdout)) == 2
+    loaded = {line.rsplit("|", 1)[-1].strip() for line in proc.stderr.splitlines() if line.startswith("import time:")}
+    assert "bzengine.cli" in loaded
+    assert not {m for m in loaded if m.split(".")[0] in ("tkinter", "_tkinter", "PIL")}
@@ -0,0 +1,108 @@
+import errno
+import os
+
+import pytest
+
+from bzengine import dedup
+from bzengine.dedup import DedupStore
+
+SIZE = 8192
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f: f.write(data)
+    return path
+
+
+@pytest.fixture
+def content(tmp_path):
+    """steamapps/workshop/content with three mods sharing one texture and one mod with its own."""
+    root = tmp_path / "steamapps" / "workshop" / "content"
+    shared = b"t" * SIZE
+    for mid in ("1", "2", "3"): write(str(root / "301650" / mid / "textures" / "rock.dds"), shared)
+    write(str(root / "301650" / "4" / "textures" / "rock.dds"), b"u" * SIZE)  # same size, other bytes
+    write(str(root / "301650" / "4" / "readme.txt"), b"small")  # under min_size
+    return str(root)
+
+
+def path(content, mid, name="textures/rock.dds"):
+    return os.path.join(content, "301650", mid, *name.split("/"))
+
+
+def inode(p):
+    return os.stat(p).st_ino
+
+
+def test_identical_files_collapse_to_one_inode(content):
+    stats = DedupStore(content).run()
+    assert stats.files == 4 and stats.hashed == 4 and not stats.errors
+    assert len({inode(path(content, mid)) for mid in ("1", "2", "3")}) == 1
+    assert os.stat(path(content, "1")).st_nlink == 4  # three mods and the store object
+    with open(path(content, "3"), 'rb') as f: assert f.read() == b"t" * SIZE
+
+
+def test_different_content_is_not_linked(content):
+    DedupStore(content).run()
+    assert os.stat(path(content, "4")).st_nlink == 1
+    assert inode(path(content, "4")) != inode(path(content, "1"))
+
+
+def test_reclaimed_bytes_count_only_freed_copies(content):
+    stats = DedupStore(content).run()
+    # Three copies become one; the copy that seeded the store object frees nothing
+    assert stats.linked == 2
+    assert stats.reclaimed_bytes == 2 * SIZE
+    assert DedupStore(content).store_usage() == (1, SIZE)
+
+
+def test_rerun_is_a_noop(content):
+    DedupStore(content).run()
+    before = {mid: inode(path(content, mid)) for mid in ("1", "2", "3", "4")}
+    stats = DedupStore(content).run()
+    assert (stats.hashed, stats.linked, stats.reclaimed_bytes, stats.gc_bytes, stats.errors) == (0, 0, 0, 0, [])
+    assert {mid: inode(path(content, mid)) for mid in before} == before
+
+
+def test_file_replaced_since_it_was_hashed_is_not_linked(content):
+    store = DedupStore(content)
+    write(path(content, "5", "maps/a.bzn"), b"m" * SIZE)
+    write(path(content, "6", "maps/b.bzn"), b"n" * SIZE)
+    store.run()
+    # An update replaces mod 5's file; then mod 7 arrives with the old bytes and only mod 7 is deduplicated
+    os.remove(path(content, "5", "maps/a.bzn"))
+    new = write(path(content, "5", "maps/a.bzn"), b"x" * SIZE)
+    os.utime(new, (os.stat(new).st_atime, os.stat(new).st_mtime + 60))
+    write(path(content, "7", "maps/a.bzn"), b"m" * SIZE)
+    stats = store.run([os.path.join(content, "301650", "7")])
+    assert stats.linked == 0 and not stats.errors
+    with open(path(content, "7", "maps/a.bzn"), 'rb') as f: assert f.read() == b"m" * SIZE
+    with open(path(content, "5", "maps/a.bzn"), 'rb') as f: assert f.read() == b"x" * SIZE
+    # The next full pass sees the new bytes and links nothing wrongly
+    store.run()
+    assert inode(path(content, "5", "maps/a.bzn")) != inode(path(content, "7", "maps/a.bzn"))
+
+
+@pytest.mark.parametrize("code", [errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP])
+@pytest.mark.parametrize("fail_on", ["store", "mods"])
+def test_filesystems_without_hardlinks_leave_files_intact(content, monkeypatch, code, fail_on):
+    """Cross-volume stores (EXDEV) and FAT/exFAT or SMB shares (EPERM, EOPNOTSUPP) just record errors."""
+    real_link = os.link
+
+    def link(src, dst, *args, **kwargs):
+        if fail_on == "store" or dst.endswith(dedup.TMP_SUFFIX): raise OSError(code, os.strerror(code))
+        return real_link(src, dst, *args, **kwargs)
+    monkeypatch.setattr(dedup.os, "link", link)
+
+    stats = DedupStore(content).run()
+    assert stats.errors and stats.linked == 0 and stats.reclaimed_bytes == 0
+    for mid in ("1", "2", "3"):
+        with open(path(content, mid), 'rb') as f: assert f.read() == b"t" * SIZE
+    leftovers = [n for _, _, files in os.walk(content) for n in files if n.endswith(dedup.TMP_SUFFIX)]
+    assert leftovers == []
+
+    # Once links work again the same store finishes the job
+    monkeypatch.setattr(dedup.os, "link", real_link)
+    stats = DedupStore(content).run()
+    assert not stats.errors
+    assert len({inode(path(content, mid)) for mid in ("1", "2", "3")}) == 1
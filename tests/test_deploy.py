@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from bzengine import deploy, sync
+from bzengine.deploy import deploy_mod, deployed_kind, is_junction, remove_mod
+from bzengine.sync import is_link
+
+MODES = ("link", "hardlink", "reflink", "copy")
+
+
+def write(root, rel, data):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f: f.write(data)
+
+
+def read(root, rel="mod.ini"):
+    with open(os.path.join(root, *rel.split("/")), 'r') as f: return f.read()
+
+
+@pytest.fixture
+def mod(tmp_path):
+    src = str(tmp_path / "cache" / "1300485418")
+    write(src, "mod.ini", "[WORKSHOP]")
+    write(src, "maps/a.bzn", "a" * 100)
+    return src, str(tmp_path / "game" / "mods" / "1300485418")
+
+
+def shares_inode(src, dst, rel="mod.ini"):
+    return os.path.samefile(os.path.join(src, rel), os.path.join(dst, rel))
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_every_mode_deploys_and_removes_without_touching_the_cache(mod, mode):
+    src, dst = mod
+    stats = deploy_mod(src, dst, mode)
+    assert read(dst) == "[WORKSHOP]" and read(dst, "maps/a.bzn") == "a" * 100
+    assert deployed_kind(dst) == ("link" if mode == "link" else "copy")
+    if mode == "link": assert stats is None
+    else: assert stats.ok and stats.copied == 2
+    assert shares_inode(src, dst) == (mode in ("link", "hardlink"))
+    assert remove_mod(dst) and not os.path.lexists(dst)
+    assert not remove_mod(dst)
+    assert read(src) == "[WORKSHOP]"
+
+
+def test_hardlink_counts_linked_bytes(mod):
+    src, dst = mod
+    stats = deploy_mod(src, dst, "hardlink")
+    assert stats.linked_bytes == 110 and stats.copied_bytes == 0 and stats.fallbacks == 0
+
+
+@pytest.mark.parametrize("order", [MODES, tuple(reversed(MODES)), ("hardlink", "copy", "hardlink", "link", "hardlink")])
+def test_switching_modes_leaves_exactly_the_new_mode(mod, order):
+    src, dst = mod
+    for mode in order:
+        if mode == "link": remove_mod(dst)  # link mode keeps an existing folder; the app removes it first
+        deploy_mod(src, dst, mode)
+        assert read(dst) == "[WORKSHOP]"
+        assert is_link(dst) == (mode == "link")
+        # Copies and reflinks never share the cache's inodes, so editing them cannot change the cache
+        assert shares_inode(src, dst) == (mode in ("link", "hardlink"))
+        assert shares_inode(src, dst, "maps/a.bzn") == (mode in ("link", "hardlink"))
+    assert read(src) == "[WORKSHOP]"
+
+
+def test_reflink_falls_back_to_copy_where_unsupported(mod, monkeypatch):
+    src, dst = mod
+
+    def no_clone(s, d): raise OSError(95, "Operation not supported")
+    monkeypatch.setattr(sync, "_reflink", no_clone)
+    stats = deploy_mod(src, dst, "reflink")
+    assert stats.ok and stats.fallbacks == 2 and stats.copied_bytes == 110
+    assert read(dst) == "[WORKSHOP]" and not shares_inode(src, dst)
+
+
+def test_hardlink_falls_back_to_copy_where_refused(mod, monkeypatch):
+    src, dst = mod
+
+    def no_link(s, d): raise PermissionError(1, "Operation not permitted")  # FAT/exFAT
+    monkeypatch.setattr(sync.os, "link", no_link)
+    stats = deploy_mod(src, dst, "hardlink")
+    assert stats.ok and stats.fallbacks == 2 and stats.copied_bytes == 110 and not stats.cross_device
+    assert not shares_inode(src, dst)
+
+
+@pytest.mark.parametrize("mode", ["hardlink", "reflink"])
+def test_other_drive_copies_up_front(mod, monkeypatch, mode):
+    src, dst = mod
+    monkeypatch.setattr(sync, "same_device", lambda a, b: False)
+    stats = deploy_mod(src, dst, mode)
+    assert stats.ok and stats.cross_device and stats.fallbacks == 0
+    assert "another drive" in stats.summary()
+    assert not shares_inode(src, dst)
+
+
+def test_is_link_and_is_junction_agree(mod, tmp_path):
+    src, dst = mod
+    deploy_mod(src, dst, "link")
+    copy = str(tmp_path / "game" / "mods" / "copy")
+    deploy_mod(src, copy, "copy")
+    dangling = str(tmp_path / "game" / "mods" / "dangling")
+    os.symlink(str(tmp_path / "missing"), dangling, target_is_directory=True)
+    for path in (dst, copy, dangling, src, os.path.join(copy, "mod.ini"), str(tmp_path / "missing")):
+        assert is_link(path) == is_junction(path), path
+    assert [is_link(p) for p in (dst, copy, dangling)] == [True, False, True]
+
+
+@pytest.mark.skipif(not deploy.IS_WINDOWS, reason="junctions are Windows only")
+def test_junctions_are_links(mod):
+    src, dst = mod
+    assert deploy.link_mod(src, dst) == "junction"
+    assert is_junction(dst) and is_link(dst) and deployed_kind(dst) == "link"
+    assert remove_mod(dst) and read(src) == "[WORKSHOP]"
@@ -0,0 +1,97 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from bzengine.downloads import DownloadScheduler
+
+SETTINGS = ("steamcmd.exe", "cache", "game", "link", "301650")
+OTHER = ("steamcmd.exe", "cache", "other game", "copy", "301650")
+
+
+class Recorder:
+    """run_batch / on_cancelled pair; batches can be held open to keep a slot busy."""
+
+    def __init__(self):
+        self.batches = queue.Queue()
+        self.cancelled = queue.Queue()
+        self.release = threading.Event()
+        self.release.set()
+
+    def run_batch(self, ids, settings):
+        self.batches.put((ids, settings))
+        self.release.wait(5)
+
+    def on_cancelled(self, ids, settings):
+        self.cancelled.put((ids, settings))
+
+
+@pytest.fixture
+def rec():
+    return Recorder()
+
+
+def scheduler(rec, window=0.1, max_processes=1):
+    return DownloadScheduler(rec.run_batch, window=window, max_processes=max_processes, on_cancelled=rec.on_cancelled)
+
+
+def test_requests_within_the_window_become_one_batch(rec):
+    s = scheduler(rec)
+    assert s.request(["1"], SETTINGS) == ["1"]
+    assert s.request([2, "3"], SETTINGS) == ["2", "3"]
+    assert s.request(["4"], OTHER) == ["4"]
+    batches = [rec.batches.get(timeout=2), rec.batches.get(timeout=2)]
+    assert sorted(batches) == sorted([(["1", "2", "3"], SETTINGS), (["4"], OTHER)])
+    with pytest.raises(queue.Empty): rec.batches.get(timeout=0.3)
+
+
+def test_ids_queued_or_running_are_dropped_whatever_the_settings(rec):
+    s = scheduler(rec)
+    rec.release.clear()
+    assert s.request(["1", "1", "2"], SETTINGS) == ["1", "2"]
+    assert s.request(["2"], OTHER) == []  # queued
+    assert rec.batches.get(timeout=2) == (["1", "2"], SETTINGS)
+    assert s.is_pending("1")
+    assert s.request(["1", "5"], OTHER) == ["5"]  # running
+    rec.release.set()
+    assert rec.batches.get(timeout=2) == (["5"], OTHER)
+    for _ in range(50):
+        if not s.is_pending("1"): break
+        time.sleep(0.05)
+    assert not s.is_pending("1")
+    assert s.request(["1"], OTHER) == ["1"]  # finished; may be downloaded again
+
+
+def test_cancel_before_the_window_reports_the_batch(rec):
+    s = scheduler(rec, window=0.5)
+    s.request(["1", "2"], SETTINGS)
+    assert s.cancel_pending() == 2
+    assert rec.cancelled.get(timeout=1) == (["1", "2"], SETTINGS)
+    with pytest.raises(queue.Empty): rec.batches.get(timeout=0.8)
+    assert not s.is_pending("1")
+
+
+def test_cancel_while_waiting_for_a_slot_reports_the_batch_and_frees_its_ids(rec):
+    s = scheduler(rec, max_processes=1)
+    rec.release.clear()
+    s.request(["1"], SETTINGS)
+    assert rec.batches.get(timeout=2) == (["1"], SETTINGS)  # holds the only slot
+    s.request(["2"], OTHER)
+    for _ in range(50):
+        if not s._queued: break
+        time.sleep(0.05)
+    assert s.cancel_pending() == 1
+    assert rec.cancelled.get(timeout=1) == (["2"], OTHER)
+    assert not s.is_pending("2") and s.is_pending("1")
+    rec.release.set()
+    with pytest.raises(queue.Empty): rec.batches.get(timeout=0.5)  # the dropped batch never runs
+    assert rec.cancelled.empty()
+
+
+def test_requests_after_a_cancel_run_normally(rec):
+    s = scheduler(rec)
+    s.request(["1"], SETTINGS)
+    s.cancel_pending()
+    assert s.request(["1"], SETTINGS) == ["1"]
+    assert rec.batches.get(timeout=2) == (["1"], SETTINGS)
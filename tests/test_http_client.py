@@ -0,0 +1,61 @@
+import gzip
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bzengine.http_client import HttpClient, HttpError
+
+TEXT = b"<div class=\"workshopItemTitle\">Some Map Pack</div>" * 20
+BODIES = {
+    "/gzip": ("gzip", gzip.compress(TEXT)),
+    "/deflate": ("deflate", zlib.compress(TEXT)),
+    "/raw-deflate": ("deflate", zlib.compress(TEXT)[2:-4]),  # no zlib header or checksum
+    "/truncated": ("gzip", gzip.compress(TEXT)[:40]),
+    "/corrupt": ("deflate", b"not deflate at all"),
+}
+
+
+class EncodedPages(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits.append(self.path)
+        encoding, body = BODIES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    s = ThreadingHTTPServer(("127.0.0.1", 0), EncodedPages)
+    s.hits = []
+    s.url = f"http://127.0.0.1:{s.server_address[1]}"
+    threading.Thread(target=s.serve_forever, daemon=True).start()
+    yield s
+    s.shutdown()
+    s.server_close()
+
+
+@pytest.fixture
+def client():
+    c = HttpClient(timeout=5, retries=1, backoff=0)
+    yield c
+    c.close()
+
+
+@pytest.mark.parametrize("path", ["/gzip", "/deflate", "/raw-deflate"])
+def test_encoded_bodies_are_decoded(server, client, path):
+    assert client.get(server.url + path).body == TEXT
+
+
+@pytest.mark.parametrize("path", ["/truncated", "/corrupt"])
+def test_bad_bodies_are_retried_then_raise_http_error(server, client, path):
+    with pytest.raises(HttpError) as e: client.get(server.url + path)
+    assert e.value.status == 200 and "bad response body" in str(e.value)
+    assert server.hits == [path, path]
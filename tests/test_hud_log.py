@@ -0,0 +1,41 @@
+import os
+
+from bzengine.hud_log import HudLog
+from bzengine.steamcmd import replay
+
+FIXTURE_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "steamcmd_download.log")
+
+
+def entries():
+    """HUD entries for the recorded SteamCMD session, tagged the way download_logic tags them."""
+    tags = {"item_success": "success", "item_failure": "error", "error": "error"}
+    return [(f"[12:00:{n % 60:02d}] ", ev.text, tags.get(ev.kind)) for n, ev in enumerate(replay(FIXTURE_LOG))]
+
+
+def write(tmp_path, name, batches, **kwargs):
+    log = HudLog(path=str(tmp_path / name), **kwargs)
+    for batch in batches: log.append(batch)
+    dest = tmp_path / f"{name}.export"
+    count = log.export(str(dest))
+    log.close()
+    return log, dest.read_text(encoding='utf-8'), count
+
+
+def test_batched_appends_match_one_at_a_time(tmp_path):
+    items = entries()
+    single, single_text, single_count = write(tmp_path, "single.log", [[e] for e in items])
+    batched, batched_text, batched_count = write(tmp_path, "batched.log", [items[i:i + 16] for i in range(0, len(items), 16)])
+    assert batched_text == single_text
+    assert batched_count == single_count == len(items)
+    assert list(batched.lines) == list(single.lines) == items
+    assert "[SUCCESS] Success. Downloaded item 1300485418" in batched_text
+
+
+def test_ring_buffer_keeps_the_newest_lines_and_export_keeps_all(tmp_path):
+    items = entries() * 20
+    log, text, count = write(tmp_path, "ring.log", [items[i:i + 50] for i in range(0, len(items), 50)],
+                             max_lines=100, max_bytes=4096, backups=50)
+    assert list(log.lines) == items[-100:]
+    assert os.path.exists(str(tmp_path / "ring.log.1"))  # rotated
+    assert count == len(items)
+    assert text.splitlines()[-1].endswith(items[-1][1])
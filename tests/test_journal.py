@@ -0,0 +1,137 @@
+import os
+import threading
+
+import pytest
+
+from bzengine import journal as journal_mod
+from bzengine.journal import WORK_DIRNAME, Journal, _Transaction, op_delete, op_link, op_unlink
+
+
+def make_mod(root, mid, text="data"):
+    path = os.path.join(root, mid)
+    os.makedirs(os.path.join(path, "sub"))
+    with open(os.path.join(path, "mod.ini"), 'w') as f: f.write(text)
+    with open(os.path.join(path, "sub", "map.bzn"), 'w') as f: f.write(text * 100)
+    return path
+
+
+def read(path):
+    with open(os.path.join(path, "mod.ini"), 'r') as f: return f.read()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Workshop cache with mods 1-3, a game mods folder with mod 1 deployed as a copy, and a Journal."""
+    cache, mods = str(tmp_path / "cache" / "301650"), str(tmp_path / "game" / "mods")
+    for mid in ("1", "2", "3"): make_mod(cache, mid, f"mod {mid}")
+    make_mod(mods, "1", "mod 1")
+    return cache, mods, Journal(root=str(tmp_path / "bz_journal"))
+
+
+def leftovers(tmp_path, journal):
+    """Journal files and work folders still on disk."""
+    work = [str(p) for p in tmp_path.rglob(WORK_DIRNAME)]
+    return journal.pending() + work
+
+
+@pytest.mark.parametrize("mode", ["link", "hardlink", "reflink", "copy"])
+def test_link_modes_deploy_the_cache_folder(tmp_path, tree, mode):
+    cache, mods, journal = tree
+    dst = os.path.join(mods, "2")
+    result = journal.run([op_link("2", os.path.join(cache, "2"), dst, mode)])
+    assert result.done == ["2"] and not result.failed and not result.cancelled
+    assert read(dst) == "mod 2"
+    assert os.path.islink(dst) == (mode == "link")
+    if mode == "hardlink": assert os.path.samefile(os.path.join(dst, "mod.ini"), os.path.join(cache, "2", "mod.ini"))
+    assert leftovers(tmp_path, journal) == []
+
+
+def test_unlink_and_delete_leave_everything_else_alone(tmp_path, tree):
+    cache, mods, journal = tree
+    os.symlink(os.path.join(cache, "2"), os.path.join(mods, "2"))
+    result = journal.run([op_unlink("1", os.path.join(mods, "1")), op_unlink("2", os.path.join(mods, "2")),
+                          op_delete("3", os.path.join(cache, "3"))])
+    assert sorted(result.done) == ["1", "2", "3"]
+    assert os.listdir(mods) == []
+    assert sorted(os.listdir(cache)) == ["1", "2"]
+    assert read(os.path.join(cache, "2")) == "mod 2"  # the link's target survives
+    assert leftovers(tmp_path, journal) == []
+
+
+def test_ops_already_in_place_are_skipped(tmp_path, tree):
+    cache, mods, journal = tree
+    calls = []
+    result = journal.run([op_link("1", os.path.join(cache, "1"), os.path.join(mods, "1"), "copy"),
+                          op_unlink("2", os.path.join(mods, "2"))], on_item=lambda *a: calls.append(a))
+    assert result.done == [] and calls == []
+    assert leftovers(tmp_path, journal) == []
+
+
+def test_stop_partway_through_a_batch_rolls_back(tmp_path, tree, monkeypatch):
+    cache, mods, journal = tree
+    stop = threading.Event()
+    real_sync = journal_mod.sync_tree
+
+    def sync_then_stop(*args, **kwargs):
+        stats = real_sync(*args, **kwargs)
+        stop.set()  # user pressed STOP while the copy was being built
+        return stats
+    monkeypatch.setattr(journal_mod, "sync_tree", sync_then_stop)
+
+    result = journal.run([op_unlink("1", os.path.join(mods, "1")), op_delete("3", os.path.join(cache, "3")),
+                          op_link("2", os.path.join(cache, "2"), os.path.join(mods, "2"), "copy")], stop_event=stop)
+    assert result.cancelled and result.done == []
+    assert os.listdir(mods) == ["1"] and read(os.path.join(mods, "1")) == "mod 1"
+    assert sorted(os.listdir(cache)) == ["1", "2", "3"] and read(os.path.join(cache, "3")) == "mod 3"
+    assert leftovers(tmp_path, journal) == []
+
+
+def crash_after_prepare(journal, ops):
+    """Runs the prepare phase of a batch and stops there, as if the process died before the commit record."""
+    tx = _Transaction.create(journal.root, ops)
+    for i in range(len(tx.ops)): journal._prepare(tx, i, {}, lambda i, error=None: None)
+    return tx
+
+
+def test_crash_before_commit_leaves_the_originals_in_place(tmp_path, tree):
+    cache, mods, journal = tree
+    tx = crash_after_prepare(journal, [op_unlink("1", os.path.join(mods, "1")),
+                                       op_link("2", os.path.join(cache, "2"), os.path.join(mods, "2"), "copy")])
+    assert tx.states == ["moved", "staged"]
+    # Nothing staged is live before the commit
+    assert not os.path.exists(os.path.join(mods, "2"))
+    with open(tx.path, 'a') as f: f.write('{"i": 1, "sta')  # torn write as the process died
+
+    assert journal.recover(rollback=True) == [(tx.txid, "rolled back")]
+    assert os.listdir(mods) == ["1"] and read(os.path.join(mods, "1")) == "mod 1"
+    assert leftovers(tmp_path, journal) == []
+
+
+def test_uncommitted_batch_is_replayed_by_default(tmp_path, tree):
+    cache, mods, journal = tree
+    tx = _Transaction.create(journal.root, [op_unlink("1", os.path.join(mods, "1")),
+                                            op_link("2", os.path.join(cache, "2"), os.path.join(mods, "2"), "copy")])
+    # The removal was prepared; the build never started
+    journal._prepare(tx, 0, {}, lambda i, error=None: None)
+
+    assert journal.recover() == [(tx.txid, "replayed")]
+    assert os.listdir(mods) == ["2"] and read(os.path.join(mods, "2")) == "mod 2"
+    assert leftovers(tmp_path, journal) == []
+
+
+def test_crash_after_a_partial_commit_is_replayed(tmp_path, tree):
+    cache, mods, journal = tree
+    tx = crash_after_prepare(journal, [op_unlink("1", os.path.join(mods, "1")),
+                                       op_link("2", os.path.join(cache, "2"), os.path.join(mods, "2"), "copy"),
+                                       op_link("3", os.path.join(cache, "3"), os.path.join(mods, "3"), "hardlink")])
+    tx.commit()
+    # The process died after renaming mod 2 into place but before journalling it
+    os.rename(tx.ops[1]["work"], tx.ops[1]["dst"])
+
+    # Committed batches are finished even when a rollback is asked for
+    assert journal.recover(rollback=True) == [(tx.txid, "replayed")]
+    assert sorted(os.listdir(mods)) == ["2", "3"]
+    assert read(os.path.join(mods, "2")) == "mod 2" and read(os.path.join(mods, "3")) == "mod 3"
+    assert sorted(os.listdir(cache)) == ["1", "2", "3"]
+    assert leftovers(tmp_path, journal) == []
+    assert journal.recover() == []
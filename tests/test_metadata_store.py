@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from bzengine.metadata_store import MetadataStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_flush_writes_debounced_updates_immediately(tmp_path):
+    path = str(tmp_path / "meta.json")
+    store = MetadataStore(path=path)
+    store.update("111", title="Map Pack", time_updated=1700000000)
+    assert not os.path.exists(path)  # still waiting for the debounce timer
+    store.flush()
+    assert MetadataStore(path=path).get("111")["title"] == "Map Pack"
+
+
+def test_flush_without_changes_does_not_write(tmp_path):
+    path = str(tmp_path / "meta.json")
+    MetadataStore(path=path).flush()
+    assert not os.path.exists(path)
+
+
+def test_touch_and_remove_are_flushed(tmp_path):
+    path = str(tmp_path / "meta.json")
+    store = MetadataStore(path=path)
+    store.update("111", title="a")
+    store.update("222", title="b")
+    store.flush()
+    store.remove("111")
+    store.flush()
+    assert MetadataStore(path=path).get("111") is None
+    assert MetadataStore(path=path).get("222")["title"] == "b"
+
+
+def test_updates_made_just_before_exit_survive_with_atexit(tmp_path):
+    path = str(tmp_path / "meta.json")
+    code = textwrap.dedent(f"""
+        import atexit, sys
+        sys.path.append({ROOT!r})
+        from bzengine.metadata_store import MetadataStore
+        store = MetadataStore(path={path!r})
+        atexit.register(store.flush)
+        store.update("111", title="Map Pack")
+    """)
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=30)
+    assert MetadataStore(path=path).get("111")["title"] == "Map Pack"
+
+
+def test_touch_revalidates_without_bumping_generation(tmp_path):
+    path = str(tmp_path / "meta.json")
+    store = MetadataStore(path=path)
+    store.update("111", title="a", deps=["222"], deps_at=1.0)
+    store.flush()
+    generation, fetched = store.generation, store.get("111")["fetched_at"]
+    store.touch("111", deps_at=2.0)
+    store.touch("999")  # not cached: nothing to revalidate
+    assert store.generation == generation
+    assert store.get("999") is None
+    store.flush()
+    entry = MetadataStore(path=path).get("111")
+    assert entry["deps_at"] == 2.0 and entry["fetched_at"] >= fetched
+    assert entry["title"] == "a" and entry["deps"] == ["222"]
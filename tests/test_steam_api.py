@@ -0,0 +1,100 @@
+import json
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bzengine import steam_api
+from bzengine.http_client import HttpClient
+
+HIDDEN = {"1005", "1150"}  # answered with result 9 (file not found / private)
+
+
+class FakeSteamApi(BaseHTTPRequestHandler):
+    """Stand-in for ISteamRemoteStorage/GetPublishedFileDetails."""
+
+    def do_POST(self):
+        form = urllib.parse.parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        count = int(form["itemcount"][0])
+        ids = [form[f"publishedfileids[{n}]"][0] for n in range(count)]
+        self.server.requests.append(ids)
+        if self.server.fail_with in ids:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        details = []
+        for mid in ids:
+            if mid in HIDDEN:
+                details.append({"publishedfileid": mid, "result": 9})
+            else:
+                details.append({"publishedfileid": mid, "result": 1, "title": f"Mod {mid}", "time_updated": 1700000000,
+                                "preview_url": f"http://img/{mid}.jpg", "consumer_app_id": 301650,
+                                "file_size": "2048", "hcontent_file": "123456789"})
+        body = json.dumps({"response": {"result": 1, "resultcount": count, "publishedfiledetails": details}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeSteamApi)
+    server.requests = []
+    server.fail_with = None
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/ISteamRemoteStorage/GetPublishedFileDetails/v1/"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    c = HttpClient(timeout=5, retries=0, backoff=0)
+    yield c
+    c.close()
+
+
+def test_ids_are_sent_in_batches_of_100(api, client):
+    ids = [str(1000 + n) for n in range(250)]
+    found = steam_api.get_published_file_details(ids, url=api.url, client=client)
+    assert [len(chunk) for chunk in api.requests] == [100, 100, 50]
+    assert [mid for chunk in api.requests for mid in chunk] == ids
+    assert len(found) == 250 - len(HIDDEN)
+
+
+def test_duplicate_ids_are_requested_once(api, client):
+    steam_api.get_published_file_details(["1001", "1002", "1001"], url=api.url, client=client)
+    assert api.requests == [["1001", "1002"]]
+
+
+def test_entries_without_result_1_are_dropped(api, client):
+    found = steam_api.get_published_file_details(["1001", "1005", "1150"], url=api.url, client=client)
+    assert set(found) == {"1001"}
+    meta = found["1001"]
+    assert meta["title"] == "Mod 1001"
+    assert meta["time_updated"] == 1700000000
+    assert meta["appid"] == "301650"
+    assert meta["file_size"] == 2048
+    assert meta["manifest"] == "123456789"
+
+
+def test_failed_chunk_goes_to_on_error_and_the_rest_still_resolve(api, client):
+    api.fail_with = "1120"
+    ids = [str(1000 + n) for n in range(250)]
+    errors = []
+    found = steam_api.get_published_file_details(ids, url=api.url, client=client,
+                                                 on_error=lambda chunk, e: errors.append((chunk, e)))
+    assert len(errors) == 1
+    chunk, error = errors[0]
+    assert chunk == ids[100:200]
+    assert "500" in str(error)
+    # The caller scrapes whatever is missing: exactly the failed chunk and the hidden items
+    assert set(ids) - set(found) == set(ids[100:200]) | {"1005"}
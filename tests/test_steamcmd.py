@@ -0,0 +1,148 @@
+import os
+import stat
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from bzengine.steamcmd import LineReader, SteamCmdError, SteamCmdSession
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="the fake SteamCMD is a shebang script")
+
+# Scripted stand-in for steamcmd: logs in, prints Steam> without a newline and
+# answers workshop_download_item. Behaviour is set through the environment:
+#   FAKE_FAIL   IDs that report "ERROR! Download item ... failed"
+#   FAKE_CRASH  IDs that kill the process mid-download on their first attempt
+#   FAKE_CRASH_ALWAYS  IDs that kill it on every attempt
+#   FAKE_LOGIN  "fail" to reject the anonymous login
+#   FAKE_LAUNCHES  file that gets one line per process start
+FAKE_STEAMCMD = textwrap.dedent('''\
+    import os, sys
+    def out(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    with open(os.environ["FAKE_LAUNCHES"], "a") as f: f.write(" ".join(sys.argv[1:]) + "\\n")
+    out("Redirecting stderr to 'logs/stderr.txt'\\n[  0%] Checking for available updates...\\n")
+    if os.environ.get("FAKE_LOGIN") == "fail":
+        out("Logging in user 'anonymous' to Steam Public...FAILED login with result code Timeout\\n")
+        sys.exit(5)
+    out("Logging in user 'anonymous' to Steam Public...OK\\nWaiting for user info...OK\\n")
+    fail = os.environ.get("FAKE_FAIL", "").split()
+    crash = os.environ.get("FAKE_CRASH", "").split()
+    crash_always = os.environ.get("FAKE_CRASH_ALWAYS", "").split()
+    while True:
+        out("Steam>")
+        line = sys.stdin.readline()
+        if not line or line.strip() == "quit": sys.exit(0)
+        args = line.split()
+        if args[:1] != ["workshop_download_item"]:
+            out("Unknown command\\n")
+            continue
+        mid = args[2]
+        out(f"Downloading item {mid} ...\\n")
+        marker = os.environ["FAKE_LAUNCHES"] + "." + mid
+        if mid in crash_always or (mid in crash and not os.path.exists(marker)):
+            open(marker, "w").close()
+            out(" Update state (0x61) downloading, progress: 12.50 (1 / 8)\\n")
+            os._exit(139)
+        if mid in fail: out(f"ERROR! Download item {mid} failed (Timeout).\\n")
+        else: out(f"Success. Downloaded item {mid} to \\"/tmp/content/{mid}\\" (1024 bytes)\\n")
+''')
+
+
+@pytest.fixture
+def steamcmd(tmp_path, monkeypatch):
+    exe = tmp_path / "steamcmd"
+    exe.write_text(f"#!{sys.executable}\n" + FAKE_STEAMCMD)
+    exe.chmod(exe.stat().st_mode | stat.S_IXUSR)
+    launches = tmp_path / "launches.txt"
+    monkeypatch.setenv("FAKE_LAUNCHES", str(launches))
+    sessions = []
+
+    def make(**kwargs):
+        session = SteamCmdSession(str(exe), str(tmp_path / "cache"), **kwargs)
+        sessions.append(session)
+        return session
+    make.launches = lambda: len(launches.read_text().splitlines()) if launches.exists() else 0
+    yield make
+    for session in sessions: session.kill()
+
+
+def test_prompt_without_newline_is_reported():
+    r, w = os.pipe()
+    reader = LineReader(os.fdopen(r, 'rb'))
+    os.write(w, b"Loading Steam API...OK\r\nSteam>")
+    assert reader.get(timeout=5) == "Loading Steam API...OK"
+    assert reader.get(timeout=5) is LineReader.PROMPT
+    os.close(w)
+    assert reader.get(timeout=5) is LineReader.EOF
+
+
+def test_start_logs_in_once_and_waits_at_prompt(steamcmd):
+    session = steamcmd()
+    events = []
+    session.start(on_event=events.append)
+    assert session.is_alive()
+    assert [ev.value for ev in events if ev.kind == "login"] == [True, True]
+    session.run("workshop_status")
+    assert steamcmd.launches() == 1
+
+
+def test_failed_login_raises(steamcmd, monkeypatch):
+    monkeypatch.setenv("FAKE_LOGIN", "fail")
+    with pytest.raises(SteamCmdError):
+        steamcmd().start()
+
+
+def test_download_reports_success_and_error_per_item(steamcmd, monkeypatch):
+    monkeypatch.setenv("FAKE_FAIL", "222")
+    session = steamcmd()
+    results = session.download_items("301650", ["111", "222", "333"])
+    assert results == {"111": None, "222": "Timeout", "333": None}
+    # Every item ran in the one logged-in process
+    assert steamcmd.launches() == 1
+
+
+def test_item_is_retried_in_a_new_process_after_a_crash(steamcmd, monkeypatch):
+    monkeypatch.setenv("FAKE_CRASH", "222")
+    session = steamcmd()
+    results = session.download_items("301650", ["111", "222", "333"])
+    assert results == {"111": None, "222": None, "333": None}
+    assert steamcmd.launches() == 2
+
+
+def test_item_fails_after_crashing_twice(steamcmd, monkeypatch):
+    monkeypatch.setenv("FAKE_CRASH_ALWAYS", "222")
+    session = steamcmd()
+    results = session.download_items("301650", ["222", "333"])
+    assert "exited" in results["222"]
+    # One retry for 222, then 333 gets a fresh process of its own
+    assert results["333"] is None
+    assert steamcmd.launches() == 3
+
+
+def test_idle_session_shuts_down_and_relaunches(steamcmd):
+    session = steamcmd(idle_timeout=0.3)
+    assert session.download_items("301650", ["111"]) == {"111": None}
+    proc = session.proc
+    deadline = time.monotonic() + 10
+    while session.is_alive() and time.monotonic() < deadline: time.sleep(0.05)
+    assert not session.is_alive()
+    assert proc.returncode == 0  # quit, not killed
+
+    assert session.download_items("301650", ["222"]) == {"222": None}
+    assert session.is_alive()
+    assert steamcmd.launches() == 2
+
+
+def test_cancel_while_waiting_kills_the_process(steamcmd):
+    session = steamcmd()
+    session.start()
+    stop = threading.Event()
+    stop.set()
+    with pytest.raises(SteamCmdError, match="Cancelled"):
+        session.run("workshop_status", stop_event=stop)
+    session.proc.wait(timeout=5)
+    assert not session.is_alive()
@@ -0,0 +1,94 @@
+import json
+import os
+import random
+import re
+import time
+
+from bzengine.steamcmd import LineReader, SteamCmdEvent, SteamCmdParser, benchmark_replay, replay
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Recorded from a piped SteamCMD session (CRLF endings, Steam> prompts without newlines)
+LOG = os.path.join(FIXTURES, "steamcmd_download.log")
+BASELINE = os.path.join(FIXTURES, "steamcmd_parser_baseline.json")
+
+
+def ungated_feed(line):
+    """Reference parser: every pattern runs on every line, with no substring gates.
+
+    SteamCmdParser must give exactly these events; it is only allowed to be faster.
+    """
+    clean = line.strip()
+    if not clean: return None
+    m = re.search(r'progress:\s*(\d+\.\d+)', clean)
+    if m: return SteamCmdEvent("progress", clean, None, float(m.group(1)))
+    m = re.search(r'Success\. Downloaded item (\d+)', clean)
+    if m: return SteamCmdEvent("item_success", clean, m.group(1), None)
+    m = re.search(r'ERROR! Download item (\d+) failed \((.*)\)', clean)
+    if m: return SteamCmdEvent("item_failure", clean, m.group(1), m.group(2))
+    if re.search(r"Logging in user '([^']*)'.*?(OK|FAILED)|Waiting for user info\.\.\.(OK|FAILED)|FAILED (?:login|to log ?in)", clean):
+        return SteamCmdEvent("login", clean, None, "FAILED" not in clean)
+    for kind, words in (("verify", ("Verifying",)), ("error", ("Error", "Failed")), ("state", ("Update state",)),
+                        ("activity", ("Downloading", "Extracting"))):
+        if any(w in clean for w in words): return SteamCmdEvent(kind, clean, None, None)
+    return SteamCmdEvent("line", clean, None, None)
+
+
+def read_lines():
+    with open(LOG, 'r', encoding='utf-8', newline='') as f:
+        return re.split(r'\r\n|\r|\n', f.read())
+
+
+def reader_lines(chunks):
+    """Lines (prompts dropped) that LineReader produces when the log arrives in the given chunks."""
+    r, w = os.pipe()
+    reader = LineReader(os.fdopen(r, 'rb'))
+    for chunk in chunks: os.write(w, chunk)
+    os.close(w)
+    lines = []
+    while True:
+        line = reader.get(timeout=5)
+        if line is LineReader.EOF: return lines
+        if line is not LineReader.PROMPT: lines.append(line)
+
+
+def test_replay_finds_every_item_result():
+    events = list(replay(LOG))
+    results = {ev.mod_id: ev.value for ev in events if ev.kind in ("item_success", "item_failure")}
+    assert results == {"1300485418": None, "1582366316": "Timeout", "2097458372": None, "1111": "File Not Found"}
+    assert [ev.value for ev in events if ev.kind == "login"] == [True]
+    progress = [ev.value for ev in events if ev.kind == "progress"]
+    assert len(progress) == 40
+    assert max(progress) == 100.0
+
+
+def test_gated_parser_matches_ungated_reference():
+    parser = SteamCmdParser()
+    lines = read_lines()
+    assert [parser.feed(line) for line in lines] == [ungated_feed(line) for line in lines]
+
+
+def test_chunked_reads_give_the_same_events_as_whole_lines():
+    with open(LOG, 'rb') as f: data = f.read()
+    expected = [(ev.kind, ev.mod_id, ev.value) for ev in replay(LOG)]
+    rng = random.Random(1234)
+    for _ in range(5):
+        chunks, pos = [], 0
+        while pos < len(data):
+            size = rng.randint(1, 64)
+            chunks.append(data[pos:pos + size])
+            pos += size
+        events = list(SteamCmdParser().parse(reader_lines(chunks)))
+        assert [(ev.kind, ev.mod_id, ev.value) for ev in events] == expected
+    events = list(SteamCmdParser().parse(reader_lines([data])))
+    assert [(ev.kind, ev.mod_id, ev.value) for ev in events] == expected
+
+
+def test_throughput_against_recorded_baseline():
+    """The gated parser must stay faster than the ungated reference by the recorded margin (within 50%)."""
+    with open(BASELINE, 'r') as f: baseline = json.load(f)
+    lines = read_lines() * 50
+    start = time.perf_counter()
+    for line in lines: ungated_feed(line)
+    ungated = time.perf_counter() - start
+    _, gated, _ = benchmark_replay(LOG, repeat=50)
+    assert ungated / gated >= baseline["speedup"] * 0.5
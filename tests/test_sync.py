@@ -0,0 +1,132 @@
+import os
+import threading
+
+import pytest
+
+from bzengine import sync
+from bzengine.sync import TMP_SUFFIX, diff_tree, is_link, resync_all, sync_tree
+
+
+def write(root, rel, data):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f: f.write(data)
+    return path
+
+
+def files(root):
+    out = {}
+    for dirpath, _, names in os.walk(root):
+        for n in names:
+            with open(os.path.join(dirpath, n), 'r') as f:
+                out[os.path.relpath(os.path.join(dirpath, n), root).replace(os.sep, "/")] = f.read()
+    return out
+
+
+@pytest.fixture
+def src(tmp_path):
+    root = str(tmp_path / "cache" / "1300485418")
+    write(root, "mod.ini", "[WORKSHOP]")
+    write(root, "maps/a.bzn", "a" * 100)
+    write(root, "maps/b.bzn", "b" * 200)
+    write(root, "textures/rock.dds", "r" * 300)
+    return root
+
+
+def test_new_folder_is_built_and_renamed_into_place(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    stats = sync_tree(src, dst)
+    assert stats.ok and stats.copied == 4 and stats.copied_bytes == 610
+    assert files(dst) == files(src)
+    assert not os.path.exists(dst + TMP_SUFFIX)
+
+
+def test_second_sync_only_copies_what_changed(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    sync_tree(src, dst)
+    write(src, "maps/a.bzn", "A" * 150)
+    write(src, "maps/new.bzn", "n")
+    os.remove(os.path.join(src, "maps", "b.bzn"))
+    stats = sync_tree(src, dst)
+    assert (stats.copied, stats.skipped, stats.deleted) == (2, 2, 1)
+    assert files(dst) == files(src)
+    assert diff_tree(src, dst) == ([], [], [])
+
+
+def test_extra_files_and_folders_are_removed(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    sync_tree(src, dst)
+    write(dst, "stale/old.bzn", "x")
+    write(dst, "notes.txt", "x")
+    assert diff_tree(src, dst) == ([], [], ["notes.txt", "stale/old.bzn"])
+    stats = sync_tree(src, dst)
+    assert stats.deleted == 3  # two files and the stale folder
+    assert files(dst) == files(src)
+
+
+def test_file_and_folder_swapping_places(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    sync_tree(src, dst)
+    os.remove(os.path.join(src, "mod.ini"))
+    write(src, "mod.ini/inner.txt", "now a folder")
+    write(dst, "textures/rock.dds.old", "x")
+    sync_tree(src, dst)
+    assert files(dst) == files(src)
+
+
+def test_verify_hash_catches_same_size_and_mtime(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    sync_tree(src, dst)
+    target = os.path.join(dst, "maps", "a.bzn")
+    st = os.stat(target)
+    with open(target, 'w') as f: f.write("z" * 100)
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert diff_tree(src, dst) == ([], [], [])
+    assert diff_tree(src, dst, verify_hash=True) == (["maps/a.bzn"], [], [])
+    assert sync_tree(src, dst).copied == 0
+    assert sync_tree(src, dst, verify_hash=True).copied == 1
+    assert files(dst) == files(src)
+
+
+def test_link_in_place_is_replaced_without_touching_its_target(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    os.makedirs(os.path.dirname(dst))
+    os.symlink(src, dst, target_is_directory=True)
+    assert is_link(dst) and not is_link(src)
+    before = files(src)
+    stats = sync_tree(src, dst)
+    assert stats.ok and not is_link(dst)
+    assert files(dst) == files(src) == before
+
+
+def test_stop_before_the_first_file_leaves_no_staging_folder(tmp_path, src):
+    dst = str(tmp_path / "mods" / "1300485418")
+    stop = threading.Event()
+    stop.set()
+    stats = sync_tree(src, dst, stop_event=stop)
+    assert stats.stopped and not stats.ok
+    assert not os.path.exists(dst) and not os.path.exists(dst + TMP_SUFFIX)
+
+
+def test_failed_file_keeps_the_old_folder_and_reports_it(tmp_path, src, monkeypatch):
+    dst = str(tmp_path / "mods" / "1300485418")
+    real_place = sync._place_file
+
+    def place(s, d, method="copy"):
+        if s.endswith("b.bzn"): raise OSError("disk full")
+        return real_place(s, d, method)
+    monkeypatch.setattr(sync, "_place_file", place)
+    stats = sync_tree(src, dst)
+    assert len(stats.errors) == 1 and "b.bzn" in stats.errors[0]
+    # A folder that did not exist yet is not left half built
+    assert not os.path.exists(dst) and not os.path.exists(dst + TMP_SUFFIX)
+
+
+def test_resync_all_adds_up_every_pair(tmp_path, src):
+    other = str(tmp_path / "cache" / "2")
+    write(other, "mod.ini", "x")
+    pairs = [("1300485418", src, str(tmp_path / "mods" / "1300485418")), ("2", other, str(tmp_path / "mods" / "2"))]
+    seen = []
+    total = resync_all(pairs, on_item=lambda mid, stats: seen.append((mid, stats.copied)))
+    assert seen == [("1300485418", 4), ("2", 1)]
+    assert total.copied == 5 and total.ok
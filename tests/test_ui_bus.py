@@ -0,0 +1,76 @@
+import importlib.util
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def app_module():
+    # Loaded by path: "import cmd" finds the stdlib module (see conftest.py)
+    spec = importlib.util.spec_from_file_location("bz_app", os.path.join(ROOT, "cmd.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeRoot:
+    """Stands in for Tk: records after() calls and callback errors instead of running a main loop."""
+
+    def __init__(self):
+        self.scheduled = []
+        self.errors = []
+
+    def after(self, ms, fn):
+        self.scheduled.append((ms, fn))
+
+    def report_callback_exception(self, exc, value, tb):
+        self.errors.append(value)
+
+
+def make_bus(app_module):
+    root, logs, rows = FakeRoot(), [], []
+    bus = app_module.UiEventBus(root, logs.extend, lambda item, cells, tags: rows.append((item, cells, tags)))
+    root.scheduled.clear()
+    return bus, root, logs, rows
+
+
+def test_a_failing_callback_does_not_drop_the_rest_of_the_tick(app_module):
+    bus, root, logs, rows = make_bus(app_module)
+    done = []
+
+    def boom(): raise RuntimeError("row was deleted")
+    bus.post(boom)
+    bus.post(lambda: done.append("call"))
+    bus.set_cells("row1", status="ok")
+    bus.post_latest("progress", boom)
+    bus.post_latest("dl_btn", lambda: done.append("latest"))
+    bus.post_log("hello")
+    bus._tick()
+    assert done == ["call", "latest"]
+    assert rows == [("row1", {"status": "ok"}, set())]
+    assert [m for _, m, _ in logs] == ["hello"]
+    assert [str(e) for e in root.errors] == ["row was deleted"] * 2
+    assert root.scheduled[-1] == (bus.interval_ms, bus._tick)  # the bus keeps ticking
+
+
+def test_delayed_posts_are_scheduled_from_the_ui_thread(app_module):
+    bus, root, _, _ = make_bus(app_module)
+    done = []
+    bus.post(lambda: done.append("later"), 3000)
+    assert root.scheduled == []  # nothing touches Tk until the tick
+    bus._tick()
+    assert done == []
+    ms, fn = root.scheduled[0]
+    assert ms == 3000
+    fn()
+    assert done == ["later"]
+
+
+def test_latest_keeps_only_the_newest_update(app_module):
+    bus, _, _, _ = make_bus(app_module)
+    seen = []
+    for n in range(5): bus.post_latest("progress", lambda n=n: seen.append(n))
+    bus._tick()
+    assert seen == [4]
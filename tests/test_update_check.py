@@ -0,0 +1,95 @@
+import calendar
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from bzengine.acf import is_outdated, needs_update
+from bzengine.http_client import Response
+from bzengine.metadata_store import MetadataStore
+from bzengine.workshop import WorkshopItem, WorkshopPages
+
+PAGE = """<div class="workshopItemTitle">Some Map Pack</div>
+<div class="detailsStatsContainerRight">
+<div class="detailsStatRight">48.211 MB</div>
+<div class="detailsStatRight">2 Jun, 2021 @ 8:05am</div>
+<div class="detailsStatRight">14 Nov, 2023 @ 10:13pm</div>
+</div>"""
+UPDATED_UTC = calendar.timegm((2023, 11, 14, 22, 13, 0))
+
+
+@pytest.fixture(params=["UTC", "America/Los_Angeles", "Asia/Tokyo", "Australia/Adelaide"])
+def local_zone(request, monkeypatch):
+    if not hasattr(time, "tzset"): pytest.skip("time.tzset is Unix only")
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_page_date_is_read_as_utc_in_every_zone(local_zone):
+    item = WorkshopItem.from_html("1300485418", PAGE)
+    assert item.remote_date == "14 Nov, 2023 @ 10:13pm"
+    assert item.time_updated == UPDATED_UTC
+    assert item.to_meta()["time_source"] == "page"
+
+
+def test_scraped_date_matches_acf_timeupdated_in_every_zone(local_zone):
+    meta = WorkshopItem.from_html("1300485418", PAGE).to_meta()
+    # SteamCMD records the same update (UTC epoch; the page only shows minutes)
+    assert not needs_update({"manifest": "1", "timeupdated": UPDATED_UTC + 41}, meta)
+    assert needs_update({"manifest": "1", "timeupdated": UPDATED_UTC - 3600}, meta)
+    assert not is_outdated({"manifest": "1", "timeupdated": UPDATED_UTC}, meta, 0)
+
+
+class RecordingClient:
+    def __init__(self, status=200):
+        self.status = status
+        self.headers = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.headers.append(dict(headers or {}))
+        return Response(self.status, {"ETag": '"v2"'}, PAGE.encode(), url)
+
+
+def test_pages_are_requested_in_utc_and_legacy_entries_are_reparsed(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "meta.json"))
+    # Scraped before dates were read as UTC: no time_source, local-time timestamp
+    store.update("1300485418", title="Some Map Pack", time_updated=UPDATED_UTC + 8 * 3600, etag='"v1"')
+    client = RecordingClient()
+    item = WorkshopPages(store, client).get("1300485418")
+    assert client.headers[0]["Cookie"] == "timezoneOffset=0,0"
+    assert "If-None-Match" not in client.headers[0]
+    assert item.time_updated == UPDATED_UTC
+    assert store.get("1300485418")["time_source"] == "page"
+
+    # From now on the stored validators are used again
+    WorkshopPages(store, client).get("1300485418")
+    assert client.headers[1]["If-None-Match"] == '"v2"'
+
+
+class VanishingEntryClient(RecordingClient):
+    """Answers 304 to a conditional request after the entry was removed from the store meanwhile."""
+
+    def __init__(self, store):
+        super().__init__()
+        self.store = store
+
+    def get(self, url, headers=None, timeout=None):
+        self.headers.append(dict(headers or {}))
+        if "If-None-Match" in (headers or {}):
+            self.store.remove("1300485418")
+            return Response(304, {}, b"", url)
+        return Response(200, {"ETag": '"v3"'}, PAGE.encode(), url)
+
+
+def test_not_modified_without_a_stored_entry_refetches_the_page(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "meta.json"))
+    store.update("1300485418", title="Some Map Pack", time_updated=UPDATED_UTC, time_source="page", etag='"v2"')
+    client = VanishingEntryClient(store)
+    item = WorkshopPages(store, client).get("1300485418")
+    assert [h.get("If-None-Match") for h in client.headers] == ['"v2"', None]
+    assert item.title == "Some Map Pack" and item.time_updated == UPDATED_UTC
+    assert store.get("1300485418")["etag"] == '"v3"'
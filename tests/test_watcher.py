@@ -0,0 +1,82 @@
+import os
+import queue
+import sys
+
+import pytest
+
+from bzengine import watcher
+from bzengine.watcher import FolderWatcher
+
+
+@pytest.fixture
+def folders(tmp_path):
+    content, mods = tmp_path / "content" / "301650", tmp_path / "game" / "mods"
+    content.mkdir(parents=True)
+    mods.mkdir(parents=True)
+    (content / "1300485418").mkdir()
+    return str(content), str(mods)
+
+
+def collect(events_queue, want, timeout=5):
+    """Events delivered until every one in want has arrived (order between batches is not fixed)."""
+    seen = []
+    while not set(want) <= set(seen):
+        try: seen.extend(events_queue.get(timeout=timeout))
+        except queue.Empty: break
+    return seen
+
+
+def change_folders(content, mods):
+    os.mkdir(os.path.join(content, "2097458372"))
+    os.rmdir(os.path.join(content, "1300485418"))
+    os.symlink(os.path.join(content, "2097458372"), os.path.join(mods, "2097458372"))
+    return [("added", "2097458372"), ("removed", "1300485418"), ("linked", "2097458372")]
+
+
+def test_polling_fallback_reports_added_removed_and_linked(folders, monkeypatch):
+    monkeypatch.setattr(watcher.platform, "system", lambda: "Windows")
+    got = queue.Queue()
+    w = FolderWatcher(*folders, got.put, poll_interval=0.05).start()
+    try:
+        assert w.backend == "polling"
+        want = change_folders(*folders)
+        assert set(want) <= set(collect(got, want))
+        os.unlink(os.path.join(folders[1], "2097458372"))
+        assert ("unlinked", "2097458372") in collect(got, [("unlinked", "2097458372")])
+    finally:
+        w.stop()
+
+
+def test_polling_ignores_files_in_the_content_folder(folders, monkeypatch):
+    monkeypatch.setattr(watcher.platform, "system", lambda: "Darwin")
+    got = queue.Queue()
+    w = FolderWatcher(*folders, got.put, poll_interval=0.05).start()
+    try:
+        open(os.path.join(folders[0], "stray.txt"), 'w').close()
+        os.mkdir(os.path.join(folders[0], "1111"))
+        assert collect(got, [("added", "1111")]) == [("added", "1111")]
+    finally:
+        w.stop()
+
+
+def test_stopped_watcher_stays_quiet(folders, monkeypatch):
+    monkeypatch.setattr(watcher.platform, "system", lambda: "Windows")
+    got = queue.Queue()
+    w = FolderWatcher(*folders, got.put, poll_interval=0.05).start()
+    w.stop()
+    w._thread.join(2)
+    assert not w._thread.is_alive()
+    os.mkdir(os.path.join(folders[0], "1111"))
+    with pytest.raises(queue.Empty): got.get(timeout=0.3)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+def test_inotify_backend_reports_the_same_events(folders):
+    got = queue.Queue()
+    w = FolderWatcher(*folders, got.put).start()
+    try:
+        if w.backend != "inotify": pytest.skip("inotify unavailable here")
+        want = change_folders(*folders)
+        assert set(want) <= set(collect(got, want))
+    finally:
+        w.stop()